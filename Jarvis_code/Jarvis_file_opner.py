@@ -1,14 +1,12 @@
 import os
-import subprocess
 import sys
 import logging
-from fuzzywuzzy import process
-from livekit.agents import function_tool
-import asyncio
-try:
-    import pygetwindow as gw
-except ImportError:
-    gw = None
+from tool_metrics import metered_tool
+from lazy_imports import lazy_import
+from window_focus import focus_window, FILE_WINDOW_WAIT_TIMEOUT
+from app_launcher import launch
+
+process = lazy_import("fuzzywuzzy.process")
 
 sys.stdout.reconfigure(encoding='utf-8')
 
@@ -16,24 +14,6 @@ sys.stdout.reconfigure(encoding='utf-8')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def focus_window(title_keyword: str) -> bool:
-    if not gw:
-        logger.warning("⚠ pygetwindow")
-        return False
-
-    await asyncio.sleep(1.5)
-    title_keyword = title_keyword.lower().strip()
-
-    for window in gw.getAllWindows():
-        if title_keyword in window.title.lower():
-            if window.isMinimized:
-                window.restore()
-            window.activate()
-            logger.info(f"🪟 window focus में है: {window.title}")
-            return True
-    logger.warning("⚠ Focus करने के लिए window नहीं मिली।")
-    return False
-
 async def index_files(base_dirs):
     file_index = []
     for base_dir in base_dirs:
@@ -64,11 +44,8 @@ async def search_file(query, index):
 async def open_file(item):
     try:
         logger.info(f"📂 File खोल रहे हैं: {item['path']}")
-        if os.name == 'nt':
-            os.startfile(item["path"])
-        else:
-            subprocess.call(['open' if sys.platform == 'darwin' else 'xdg-open', item["path"]])
-        await focus_window(item["name"])  # 👈 Focus window after opening
+        await launch(item["path"])  # ShellExecute / xdg-open without a shell or a blocking wait
+        await focus_window(item["name"], FILE_WINDOW_WAIT_TIMEOUT)  # 👈 Focus window after opening
         return f"✅ File open हो गई।: {item['name']}"
     except Exception as e:
         logger.error(f"❌ File open करने में error आया।: {e}")
@@ -82,7 +59,7 @@ async def handle_command(command, index):
         logger.warning("❌ File नहीं मिली।")
         return "❌ File नहीं मिली।"
 
-@function_tool()
+@metered_tool()
 async def Play_file(name: str) -> str:
 
     """
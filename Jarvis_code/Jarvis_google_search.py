@@ -1,10 +1,13 @@
 import os
-import requests
 import logging
 from dotenv import load_dotenv
 from datetime import datetime
-from livekit.agents import function_tool
+from tool_metrics import metered_tool
 from livekit import agents
+from lazy_imports import lazy_import
+import resilience
+
+requests = lazy_import("requests")
 
 # Load environment variables
 load_dotenv()
@@ -13,7 +16,13 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@function_tool()
+# Overridable so the tool can be pointed at a local mock server
+GOOGLE_SEARCH_URL = os.getenv("GOOGLE_SEARCH_URL", "https://www.googleapis.com/customsearch/v1")
+
+# Bounded time budget; a hedged retry is sent once a call is slower than p95
+search_endpoint = resilience.endpoint("google_search", timeout=8.0, hedge=True)
+
+@metered_tool()
 async def google_search(query: str) -> str:
     """
     Searches Google and returns the top 3 results with heading and summary only.
@@ -33,7 +42,7 @@ async def google_search(query: str) -> str:
             missing.append("SEARCH_ENGINE_ID")
         return f"Missing environment variables: {', '.join(missing)}"
 
-    url = "https://www.googleapis.com/customsearch/v1"
+    url = GOOGLE_SEARCH_URL
     params = {
         "key": api_key,
         "cx": search_engine_id,
@@ -43,7 +52,13 @@ async def google_search(query: str) -> str:
 
     try:
         logger.info("Google Custom Search API को request भेजी जा रही है...")
-        response = requests.get(url, params=params, timeout=10)
+        response = await search_endpoint.call(requests.get, url, params=params, timeout=search_endpoint.timeout)
+    except resilience.CircuitOpenError:
+        logger.warning("Google Search circuit open, request skip की गई।")
+        return "Google Search अभी respond नहीं कर रहा है, थोड़ी देर बाद फिर से try करें।"
+    except resilience.EndpointTimeout as e:
+        logger.error(f"Request timed out: {e}")
+        return "Google Search API ने समय पर जवाब नहीं दिया।"
     except requests.exceptions.RequestException as e:
         logger.error(f"Request failed: {e}")
         return f"Google Search API request failed: {e}"
@@ -68,7 +83,7 @@ async def google_search(query: str) -> str:
 
     return formatted.strip()
 
-@function_tool()
+@metered_tool()
 async def get_current_datetime() -> str:
     """
     Returns the current date and time in a human-readable format.
@@ -1,57 +1,86 @@
 import os
-import base64
-import requests
-import webbrowser
+from typing import List, Optional
 from dotenv import load_dotenv
-from livekit.agents import function_tool  # ✅ LiveKit compatible decorator
+from tool_metrics import metered_tool
+from image_jobs import ImageJobQueue, QueueFullError
+from image_generator import (
+    MODEL_ID, find_cached, render_image, render_variants,
+    make_contact_sheet, variant_specs, show_in_browser
+)
 
 # Load API keys from .env
 load_dotenv()
-HF_TOKEN = os.getenv("HF_TOKEN")
-IMGBB_KEY = os.getenv("IMGBB_KEY")
 
-MODEL_ID = "black-forest-labs/FLUX.1-dev"
+# Generation runs in the background so the voice turn is never blocked
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
 
 
-@function_tool()
-async def generate_image_tool(prompt: str) -> str:
+def _run_image_job(job, progress) -> str:
+    """Blocking pipeline for one job: generate (or reuse) → local gallery → browser."""
+    specs = variant_specs(job.prompt, job.params.get("variants", 1), job.params.get("prompts"))
+
+    if len(specs) == 1:
+        progress("generating", 0.1)
+        image = render_image(specs[0]["prompt"], MODEL_ID, specs[0]["params"])
+    else:
+        progress(f"generating {len(specs)} variants", 0.1)
+        variants = render_variants(specs, MODEL_ID, progress=progress)
+        progress("building contact sheet", 0.9)
+        image = make_contact_sheet(variants, MODEL_ID)
+
+    progress("opening", 0.95)
+    show_in_browser(image.url)
+
+    return f"Generated image is now visible in browser: {image.url}"
+
+
+image_jobs = ImageJobQueue(_run_image_job, workers=IMAGE_WORKERS)
+
+
+@metered_tool()
+async def generate_image_tool(prompt: str, variants: int = 1, prompts: Optional[List[str]] = None) -> str:
     """
-    Generates an AI image using Hugging Face FLUX.1-dev model 
-    and displays it directly in the browser via imgbb (no download).
+    Starts generating an AI image using Hugging Face FLUX.1-dev model in the background.
+    Returns a job id right away; the image opens in the browser when it is ready
+    and you will get a follow-up message, so keep talking to the user meanwhile.
+    Images made before for the exact same prompt open instantly.
+
+    For several versions call this ONCE: set `variants` (e.g. 4) for different takes
+    on the same prompt, or pass a list of different `prompts`. They are generated in
+    parallel and shown together as one numbered contact sheet.
 
     Example prompts:
     - "एक सुंदर sunset की image दिखाओ"
     - "Show me a cyberpunk city at night"
+    - "Show me 4 versions of a cyberpunk city" → variants=4
     """
 
-    # --- Step 1: Generate image from Hugging Face ---
-    print(f"🎨 Generating image from prompt: {prompt}")
-    url = f"https://api-inference.huggingface.co/models/{MODEL_ID}"
-    headers = {"Authorization": f"Bearer {HF_TOKEN}"}
-    payload = {"inputs": prompt}
-
-    response = requests.post(url, headers=headers, json=payload)
-    if response.status_code != 200:
-        return f"❌ Hugging Face error: {response.status_code} - {response.text}"
-
-    image_bytes = response.content
-    print("✅ Image generated successfully.")
+    # Same single prompt as before: no need to queue anything
+    if variants <= 1 and not prompts:
+        cached = find_cached(prompt, MODEL_ID)
+        if cached:
+            show_in_browser(cached.url)
+            return f"⚡ यह image पहले से बनी हुई थी, browser में खोल दी है: {cached.url}"
 
-    # --- Step 2: Upload to imgbb ---
-    print("☁️ Uploading to imgbb...")
-    encoded = base64.b64encode(image_bytes)
-    upload_url = "https://api.imgbb.com/1/upload"
-    payload = {"key": IMGBB_KEY, "image": encoded}
+    try:
+        job = await image_jobs.submit(prompt, variants=variants, prompts=prompts)
+    except QueueFullError:
+        return "⏳ अभी बहुत सारी images बन रही हैं, थोड़ी देर बाद फिर से try करें।"
+    return f"🎨 Image job {job.id} शुरू हो गया — working on it, image तैयार होते ही बता दूँगा।"
 
-    res = requests.post(upload_url, data=payload)
-    if res.status_code != 200:
-        return f"❌ imgbb upload failed: {res.text}"
 
-    image_url = res.json()["data"]["url"]
-    print("🌐 Image hosted at:", image_url)
+@metered_tool()
+async def image_job_status_tool(job_id: str = "") -> str:
+    """
+    Tells the status of a background image job started by generate_image_tool.
+    If no job id is given, reports the most recent job.
 
-    # --- Step 3: Open in browser ---
-    webbrowser.open_new_tab(image_url)
-    print("🖥️ Image opened in browser.")
+    Example prompts:
+    - "मेरी image बनी या नहीं?"
+    - "What's the status of img-2?"
+    """
 
-    return f"✅ Generated image is now visible in browser: {image_url}"
+    job = image_jobs.get(job_id) if job_id else image_jobs.latest()
+    if job is None:
+        return "❌ ऐसा कोई image job नहीं मिला।"
+    return job.describe()
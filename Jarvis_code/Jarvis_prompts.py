@@ -1,17 +1,11 @@
 import asyncio
-import requests
 from Jarvis_google_search import get_current_datetime
-from jarvis_get_weather import get_weather
+from jarvis_get_weather import get_weather, detect_city_by_ip
 
 
-# ✅ Get current city (sync for easier use)
+# ✅ Get current city (sync for easier use; shares the ipinfo time budget/breaker)
 def get_current_city():
-    try:
-        response = requests.get("https://ipinfo.io", timeout=5)
-        data = response.json()
-        return data.get("city", "Unknown")
-    except Exception:
-        return "Unknown"
+    return detect_city_by_ip()
 
 
 # ✅ Async version to handle async coroutines properly
@@ -19,7 +13,7 @@ async def load_prompts_async():
     # Await both async functions safely
     current_datetime = await get_current_datetime()
 
-    city = get_current_city()
+    city = await asyncio.to_thread(get_current_city)
 
     if city != "Unknown":
         weather = await get_weather(city)
@@ -71,5 +65,22 @@ def load_prompts():
     return asyncio.run(load_prompts_async())
 
 
-# ✅ Call once when module loads
-instructions_prompt, Reply_prompts = load_prompts()
+_prompts = None
+
+
+# ✅ Build once on first use (the city/weather lookups are network calls)
+async def get_prompts():
+    global _prompts
+    if _prompts is None:
+        _prompts = await load_prompts_async()
+    return _prompts
+
+
+# ✅ `Jarvis_prompts.instructions_prompt` still works, but no longer runs at import time
+def __getattr__(name):
+    global _prompts
+    if name in ("instructions_prompt", "Reply_prompts"):
+        if _prompts is None:
+            _prompts = load_prompts()
+        return _prompts[0] if name == "instructions_prompt" else _prompts[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import os
+import time
+from tool_metrics import metered_tool
+import system_metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A local reading older than this is refreshed before answering
+SYSTEM_STATUS_MAX_AGE = float(os.getenv("SYSTEM_STATUS_MAX_AGE", "5"))
+
+
+async def read_system() -> dict:
+    """
+    Latest values from the system_metrics.py --serve service (shared with the HUD).
+
+    Without the service, one on-demand reading here: no sampler thread is
+    ever started in the agent worker.
+    """
+    report = await asyncio.to_thread(system_metrics.fetch, agent_pid=os.getpid())
+    if report and report["values"]:
+        return report["values"]
+    sampler = system_metrics.sampler
+    sampler.processes.agent_pid = os.getpid()
+    if sampler.ages().get("cpu", float("inf")) > SYSTEM_STATUS_MAX_AGE:
+        # cpu/net/process figures are deltas: two quick readings
+        await asyncio.to_thread(sampler.sample, True)
+        await asyncio.sleep(0.5)
+        await asyncio.to_thread(sampler.sample, True)
+    return sampler.snapshot()
+
+
+def describe(values: dict, detail: bool = False) -> str:
+    parts = []
+    if "cpu" in values:
+        cpu = f"CPU {values['cpu']:.0f}%"
+        cores = values.get("cores")
+        if cores and len(cores) > 1:
+            cpu += f" (सबसे busy core {max(cores):.0f}%)"
+        parts.append(cpu)
+    if "mem" in values:
+        parts.append(f"RAM {values['mem']:.0f}%")
+    if "disk" in values:
+        parts.append(f"Disk {values['disk']:.0f}% भरी")
+    if "net" in values:
+        up, down = values["net"]
+        parts.append(f"Network ↑{up:.1f} ↓{down:.1f} MB/s")
+    if detail and "temp" in values:
+        parts.append(f"CPU temp {values['temp']:.0f}°C")
+    if detail and "battery" in values:
+        parts.append(f"Battery {values['battery']:.0f}%")
+    if not parts:
+        return "❌ System metrics अभी उपलब्ध नहीं हैं (psutil install है?)"
+
+    text = "🖥️ " + ", ".join(parts) + "।"
+    procs = values.get("procs")
+    if procs:
+        top = [p for p in procs["top"] if p["cpu"] >= 1.0][:3 if detail else 2]
+        if top:
+            text += " सबसे ज़्यादा CPU: " + ", ".join(f"{p['name']} {p['cpu']:.0f}%" for p in top) + "।"
+        agent = procs.get("agent")
+        if detail and agent:
+            text += (f" Assistant खुद: CPU {agent['cpu'] + agent['children_cpu']:.0f}%, "
+                     f"RAM {agent['rss_mb'] + agent['children_rss_mb']:.0f} MB।")
+    return text
+
+
+@metered_tool()
+async def system_status(detail: bool = False) -> str:
+    """
+    Tells how busy the PC is right now: CPU, RAM, disk, network and the heaviest processes.
+
+    Answers from the shared metrics service's cached snapshot when it runs (instant),
+    else takes a quick reading itself.
+    Set detail=True for temperature, battery and the assistant's own usage.
+
+    Example prompts:
+    - "मेरा PC कितना busy है?"
+    - "CPU usage कितना है?"
+    - "कौन सा app सबसे ज़्यादा CPU ले रहा है?"
+    - "System slow क्यों है, details बताओ"
+    """
+
+
+    values = await read_system()
+    start = time.perf_counter()
+    text = describe(values, detail)
+    logger.info(f"🖥️ System status ({(time.perf_counter() - start) * 1e6:.0f} µs): {text}")
+    return text
@@ -3,25 +3,19 @@ import subprocess
 import logging
 import sys
 import asyncio
-from fuzzywuzzy import process
-
-try:
-    from livekit.agents import function_tool
-except ImportError:
-    def function_tool(func): 
-        return func
-
-try:
-    import win32gui
-    import win32con
-except ImportError:
-    win32gui = None
-    win32con = None
-
-try:
-    import pygetwindow as gw
-except ImportError:
-    gw = None
+from urllib.parse import quote_plus
+from lazy_imports import lazy_import
+
+# metered_tool falls back to a plain wrapper when livekit is not installed
+from tool_metrics import metered_tool
+# shared wait-for-window + focus (adaptive polling instead of a fixed sleep)
+from window_focus import focus_window, FILE_WINDOW_WAIT_TIMEOUT
+from window_registry import registry as window_registry
+from app_catalog import get_catalog
+from app_launcher import launch, open_or_focus
+
+# Loaded on first use so that importing this module stays cheap
+process = lazy_import("fuzzywuzzy.process")
 
 # Setup encoding and logger
 sys.stdout.reconfigure(encoding='utf-8')
@@ -29,65 +23,70 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # --- APP MAPPINGS ---
+# Built-in commands and web shortcuts only; installed apps come from app_catalog
 APP_MAPPINGS = {
     "notepad": "notepad",
     "calculator": "calc",
-    "chrome": "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
-    "vlc": "C:\\Program Files\\VideoLAN\\VLC\\vlc.exe",
     "command prompt": "cmd",
     "control panel": "control",
-    "settings": "start ms-settings:",
+    "settings": "ms-settings:",
     "paint": "mspaint",
-    "vs code": "C:\\Users\\gaura\\AppData\\Local\\Programs\\Microsoft VS Code\\Code.exe",
-    "postman": "C:\\Users\\gaura\\AppData\\Local\\Postman\\Postman.exe",
     "youtube": "https://www.youtube.com",
     "play youtube": "https://www.youtube.com/results?search_query="
 }
 
-# --- Global focus utility ---
-async def focus_window(title_keyword: str) -> bool:
-    if not gw:
-        logger.warning("⚠ pygetwindow")
-        return False
+# --- App control - open_app function ---
+@metered_tool()
+async def open_app(app_title: str, new_window: bool = False) -> str:
 
-    await asyncio.sleep(1.5)
-    title_keyword = title_keyword.lower().strip()
+    """
+    Opens an installed app, a website shortcut or YouTube (with an optional search).
+
+    If the app is already open, its window is brought to the front instead of starting
+    a second copy — for example: "VS Code kholo", "chrome open karo", "youtube pe lofi chalao".
+
+    Args:
+        app_title (str): App name as the user said it.
+        new_window (bool, optional): Start a fresh instance even if one is already open.
+
+    Returns:
+        str: What happened.
+    """
 
-    for window in gw.getAllWindows():
-        if title_keyword in window.title.lower():
-            if window.isMinimized:
-                window.restore()
-            window.activate()
-            return True
-    return False
 
-# --- App control - open_app function ---
-@function_tool()
-async def open_app(app_title: str) -> str:
     app_title_lower = app_title.lower().strip()
 
-    # Handle YouTube
+    # Handle YouTube: a new tab in the browser that is already running
     if "youtube" in app_title_lower:
         search_query = app_title_lower.replace("youtube", "").replace("play", "").strip()
-        url = APP_MAPPINGS["youtube"] if not search_query else f"https://www.youtube.com/results?search_query={search_query.replace(' ', '+')}&sp=EgIQAQ%3D%3D&autoplay=1"
+        url = APP_MAPPINGS["youtube"] if not search_query else f"https://www.youtube.com/results?search_query={quote_plus(search_query)}&sp=EgIQAQ%3D%3D&autoplay=1"
         try:
-            await asyncio.create_subprocess_shell(f'start "" "{url}"', shell=True)
+            await launch(url)
             await focus_window("youtube")
             return f"🎵 YouTube open: {search_query or 'Home'}"
         except Exception as e:
             return f"❌ YouTube open failed: {e}"
 
-    # Regular apps
-    app_command = APP_MAPPINGS.get(app_title_lower, app_title_lower)
+    # Regular apps: explicit mapping, then the installed-app catalog, then the raw name
+    app_command, window_hint = APP_MAPPINGS.get(app_title_lower), app_title_lower
+    if app_command is None:
+        entry = await asyncio.to_thread(get_catalog().resolve, app_title_lower)
+        if entry:
+            logger.info(f"🔎 '{app_title}' → {entry.name} ({entry.target})")
+            app_command, window_hint = entry.target, entry.name
+        else:
+            app_command = app_title_lower
     try:
-        await asyncio.create_subprocess_shell(f'start "" "{app_command}"', shell=True)
-        focused = await focus_window(app_title_lower)
+        how = await open_or_focus(app_command, new_instance=new_window)
+        if how == "focused":
+            return f"🪟 {app_title} पहले से खुला था — focus कर दिया।"
+        focused = await focus_window(window_hint)
         return f"🚀 App launched: {app_title}" if focused else f"🚀 {app_title} launched, but not focused."
     except Exception as e:
         return f"❌ {app_title} launch failed: {e}"
 
 # --- System Control: Shutdown / Restart / Logoff / Sleep ---
-@function_tool()
+@metered_tool()
 async def vyaas_system_control(command: str) -> str:
     """
     System control by Vyaas assistant.
@@ -137,14 +136,14 @@ async def search_item(query, index, item_type):
 async def open_folder(path):
     try:
         os.startfile(path)
-        await focus_window(os.path.basename(path))
+        await focus_window(os.path.basename(path), FILE_WINDOW_WAIT_TIMEOUT)
     except Exception as e:
         logger.error(f"❌ Error opening folder: {e}")
 
 async def play_file(path):
     try:
         os.startfile(path)
-        await focus_window(os.path.basename(path))
+        await focus_window(os.path.basename(path), FILE_WINDOW_WAIT_TIMEOUT)
     except Exception as e:
         logger.error(f"❌ Error opening file: {e}")
 
@@ -173,19 +172,24 @@ async def delete_item(path):
         return f"❌ Delete failed: {e}"
 
 # --- Close App ---
-@function_tool()
+@metered_tool()
 async def close_app(window_title: str) -> str:
-    if not win32gui:
+    if not window_registry.available:
         return "❌ win32gui missing."
-    def enumHandler(hwnd, _):
-        if win32gui.IsWindowVisible(hwnd):
-            if window_title.lower() in win32gui.GetWindowText(hwnd).lower():
-                win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-    win32gui.EnumWindows(enumHandler, None)
-    return f"✅ Window closed: {window_title}"
+    # closing is destructive: exact title / process / whole-word matches only, and only if unambiguous
+    candidates = await asyncio.to_thread(window_registry.exact, window_title)
+    if not candidates:
+        return f"❌ Window not found: {window_title}"
+    if len(candidates) > 1:
+        names = "; ".join(f"{w.title} ({w.process or '?'})" for w in candidates[:5])
+        return f"❓ '{window_title}' से {len(candidates)} windows मिलीं, कौन सी बंद करूँ? {names}"
+    window = candidates[0]
+    await asyncio.to_thread(window_registry.close, window)
+    logger.info(f"🪟 Closed '{window.title}' ({window.process or 'unknown'}) for '{window_title}'")
+    return f"✅ Window closed: {window.title}"
 
 # --- Folder/File command logic ---
-@function_tool()
+@metered_tool()
 async def folder_file(command: str) -> str:
     folders_to_index = ["D:/"]
     index = await index_items(folders_to_index)
@@ -0,0 +1,149 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import date, datetime
+from typing import List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ACTION_LOG_PATH = os.getenv("ACTION_LOG_PATH", "control_log.jsonl")
+ACTION_LOG_FLUSH_SECONDS = float(os.getenv("ACTION_LOG_FLUSH_SECONDS", "1.0"))
+ACTION_LOG_MAX_BYTES = int(os.getenv("ACTION_LOG_MAX_BYTES", str(2 * 1024 * 1024)))
+ACTION_LOG_BACKUPS = int(os.getenv("ACTION_LOG_BACKUPS", "5"))
+ACTION_LOG_BATCH = 256       # records written per wake-up at most
+ACTION_LOG_QUEUE = 10000     # records buffered before new ones are dropped
+
+_STOP = object()
+
+
+class ActionLog:
+    """
+    Queue-based JSON-lines logger for controller actions.
+
+    write() only puts a dict on a queue, so callers on the event loop never
+    touch the disk. A daemon thread batches records, flushes every
+    `flush_interval` seconds, and rotates the file when it grows past
+    `max_bytes` or the date changes (control_log.jsonl -> control_log.jsonl.1 ...).
+    """
+
+    def __init__(self, path: str = ACTION_LOG_PATH, flush_interval: float = ACTION_LOG_FLUSH_SECONDS,
+                 max_bytes: int = ACTION_LOG_MAX_BYTES, backups: int = ACTION_LOG_BACKUPS):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=ACTION_LOG_QUEUE)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._file = None
+        self._day: Optional[date] = None
+
+    # --- producer side ---
+    def write(self, event: str, **fields) -> None:
+        record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "event": event}
+        record.update({k: v for k, v in fields.items() if v is not None})
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1  # never block an input action on logging
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="action-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Block until everything queued so far is on disk."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout=2.0)
+
+    # --- writer thread ---
+    def _run(self) -> None:
+        while True:
+            batch: List = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval))
+                while len(batch) < ACTION_LOG_BATCH:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            records = [item for item in batch if isinstance(item, dict)]
+            if records:
+                try:
+                    self._write_batch(records)
+                except OSError as e:
+                    logger.warning(f"⚠️ Action log write failed: {e}")
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is _STOP for item in batch):
+                if self._file:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write_batch(self, records: List[dict]) -> None:
+        today = date.today()
+        if self._file is None:
+            self._open(today)
+        elif today != self._day or self._file.tell() >= self.max_bytes:
+            self._rotate(today)
+        self._file.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records))
+        self._file.flush()
+
+    def _open(self, today: date) -> None:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        if os.path.exists(self.path):
+            # a log left over from an earlier day or run that is already full
+            mtime_day = date.fromtimestamp(os.path.getmtime(self.path))
+            if mtime_day != today or os.path.getsize(self.path) >= self.max_bytes:
+                self._shift_backups()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._day = today
+
+    def _rotate(self, today: date) -> None:
+        self._file.close()
+        self._file = None
+        self._shift_backups()
+        self._open(today)
+
+    def _shift_backups(self) -> None:
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+action_log = ActionLog()
+
+
+def timed(start: float) -> float:
+    """Milliseconds since a time.perf_counter() start, rounded for the log."""
+    return round((time.perf_counter() - start) * 1000.0, 2)
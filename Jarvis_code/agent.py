@@ -4,45 +4,68 @@ from livekit.agents import AgentSession, Agent, RoomInputOptions, ChatContext, C
 from livekit.plugins import google, noise_cancellation
 
 # Import your custom modules
-from Jarvis_prompts import instructions_prompt, Reply_prompts
+import Jarvis_prompts
 from Jarvis_google_search import google_search, get_current_datetime
 from jarvis_get_weather import get_weather
 from Jarvis_window_CTRL import open_app, close_app, folder_file
 from Jarvis_file_opner import Play_file
 from keyboard_mouse_CTRL import (
-    move_cursor_tool, mouse_click_tool, scroll_cursor_tool, 
+    move_cursor_tool, move_mouse_to_tool, mouse_click_tool, scroll_cursor_tool, 
     type_text_tool, press_key_tool, swipe_gesture_tool, 
-    press_hotkey_tool, control_volume_tool
+    press_hotkey_tool, control_volume_tool, run_input_sequence
+)
+from input_macros import (
+    start_macro_recording, stop_macro_recording, play_macro,
+    list_macros, delete_macro, macro_tools, store as macro_store
 )
 from memory_loop import MemoryExtractor
-from Jarvis_image_gen import generate_image_tool
+from Jarvis_image_gen import generate_image_tool, image_job_status_tool, image_jobs
+from image_jobs import DONE, FAILED
+import tool_metrics
+import hud_telemetry
+from app_catalog import warm_catalog
+from Jarvis_system_status import system_status
 
 
 load_dotenv()
 
 
+# Saved input macros are added on top of these as one macro_<name> tool each
+BASE_TOOLS = [
+    google_search,
+    get_current_datetime,
+    get_weather,
+    system_status,
+    open_app,
+    generate_image_tool,
+    image_job_status_tool,
+    close_app,
+    folder_file,
+    Play_file,
+    move_cursor_tool,
+    move_mouse_to_tool,
+    mouse_click_tool,
+    scroll_cursor_tool,
+    type_text_tool,
+    press_key_tool,
+    press_hotkey_tool,
+    control_volume_tool,
+    swipe_gesture_tool,
+    run_input_sequence,
+    start_macro_recording,
+    stop_macro_recording,
+    play_macro,
+    list_macros,
+    delete_macro,
+]
+
+
 class Assistant(Agent):
-    def __init__(self, chat_ctx) -> None:
+    def __init__(self, chat_ctx, instructions: str) -> None:
         super().__init__(chat_ctx = chat_ctx,
-                        instructions=instructions_prompt,
+                        instructions=instructions,
                         llm=google.beta.realtime.RealtimeModel(voice="Charon"),
-                        tools=[
-                                google_search,
-                                get_current_datetime,
-                                get_weather,
-                                open_app,
-                                generate_image_tool,
-                                close_app,
-                                folder_file,
-                                Play_file,
-                                move_cursor_tool,
-                                mouse_click_tool,
-                                scroll_cursor_tool,
-                                type_text_tool,
-                                press_key_tool,
-                                press_hotkey_tool,
-                                control_volume_tool,
-                                swipe_gesture_tool]
+                        tools=BASE_TOOLS + macro_tools()
                                 )
 
 async def entrypoint(ctx: agents.JobContext):
@@ -52,11 +75,17 @@ async def entrypoint(ctx: agents.JobContext):
     
     #getting the current memory chat
     current_ctx = session.history.items
-    
 
+    # prompts need city + weather lookups, so they are built here instead of at import
+    instructions_prompt, Reply_prompts = await Jarvis_prompts.get_prompts()
+
+    tool_metrics.start_metrics_server()
+    detach_telemetry = hud_telemetry.attach(session)  # live state/tool feed for the HUD (nova_safe.py)
+    warm_catalog()  # scan installed apps in the background so open_app resolves instantly
+    assistant = Assistant(chat_ctx=current_ctx, instructions=instructions_prompt)
     await session.start(
         room=ctx.room,
-        agent=Assistant(chat_ctx=current_ctx), #sending currenet chat to llm in realtime
+        agent=assistant, #sending currenet chat to llm in realtime
         room_input_options=RoomInputOptions(
             noise_cancellation=noise_cancellation.BVC()
         ),
@@ -64,6 +93,32 @@ async def entrypoint(ctx: agents.JobContext):
     await session.generate_reply(
         instructions=Reply_prompts
     )
+
+    # finished background image jobs are announced as a follow-up message
+    async def announce_image_job(job):
+        if job.status == DONE:
+            await session.generate_reply(
+                instructions=f"User को बताइए कि उनकी image ('{job.prompt}') तैयार है और browser में खुल गई है।"
+            )
+        elif job.status == FAILED:
+            await session.generate_reply(
+                instructions=f"User को politely बताइए कि image ('{job.prompt}') नहीं बन पाई: {job.error}"
+            )
+
+    # a newly saved (or deleted) macro becomes (or stops being) its own tool right away
+    async def refresh_macro_tools(_store):
+        await assistant.update_tools(BASE_TOOLS + macro_tools())
+
+    async def stop_announcing():
+        image_jobs.remove_listener(announce_image_job)
+        macro_store.remove_listener(refresh_macro_tools)
+        tool_metrics.registry.dump()
+        detach_telemetry()
+
+    image_jobs.add_listener(announce_image_job)
+    macro_store.add_listener(refresh_macro_tools)
+    ctx.add_shutdown_callback(stop_announcing)
+
     conv_ctx = MemoryExtractor()
     await conv_ctx.run(current_ctx)
     
@@ -0,0 +1,345 @@
+"""
+Catalog of installed applications for open_app.
+
+Windows: Start-menu shortcuts (.lnk) for all users and the current user.
+Linux:   .desktop files in the XDG application dirs (plus flatpak/snap exports)
+         and executables on $PATH.
+
+The catalog is cached on disk (APP_CATALOG_FILE). refresh() only re-reads
+directories whose mtime changed since the last scan, so keeping it current
+costs a handful of stat() calls. A resolve() miss triggers such a refresh
+(at most every APP_RESCAN_INTERVAL seconds), so apps installed while the
+agent runs are found without a restart.
+
+Usage:
+    python app_catalog.py --list
+    python app_catalog.py "vs code" --top 5
+"""
+import argparse
+import json
+import logging
+import os
+import shlex
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+from lazy_imports import lazy_import
+
+# rapidfuzz is a much faster drop-in for the fuzzywuzzy scorers when installed
+rapidfuzz_fuzz = lazy_import("rapidfuzz.fuzz", optional=True)
+fuzzywuzzy_fuzz = lazy_import("fuzzywuzzy.fuzz")
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+APP_CATALOG_FILE = os.getenv("APP_CATALOG_FILE", "app_catalog.json")
+APP_MATCH_MIN = int(os.getenv("APP_MATCH_MIN", "75"))
+APP_RESCAN_INTERVAL = float(os.getenv("APP_RESCAN_INTERVAL", "30"))  # min seconds between miss-driven refreshes
+CATALOG_VERSION = 1
+
+# Shortcuts that are not apps a user would ask to open
+_SKIP_WORDS = ("uninstall", "readme", "release notes", "documentation", "help", "license", "website")
+# When names tie, prefer real app entries over bare $PATH executables
+_KIND_RANK = {"lnk": 0, "desktop": 0, "path": 1}
+
+
+@dataclass
+class AppEntry:
+    name: str          # display name, e.g. "Visual Studio Code"
+    target: str        # .lnk path, .desktop Exec command line, or executable path
+    kind: str          # "lnk" | "desktop" | "path"
+    source: str        # file the entry came from
+    keywords: str = ""
+
+    @property
+    def key(self) -> str:
+        return self.name.lower()
+
+    def aliases(self) -> List[str]:
+        """Spoken short forms: "Visual Studio Code" -> "vs code", "vsc"."""
+        words = [w for w in self.key.replace("-", " ").split() if w.isalnum()]
+        if len(words) < 2:
+            return []
+        initials = "".join(w[0] for w in words)
+        return ["".join(w[0] for w in words[:-1]) + " " + words[-1], initials]
+
+
+# --- Scanners (one directory, non-recursive) ---
+def _wanted(name: str) -> bool:
+    lowered = name.lower()
+    return not any(word in lowered for word in _SKIP_WORDS)
+
+
+def scan_lnk_dir(folder: str) -> List[AppEntry]:
+    entries = []
+    for entry in os.scandir(folder):
+        if entry.is_file() and entry.name.lower().endswith((".lnk", ".url", ".appref-ms")):
+            name = os.path.splitext(entry.name)[0]
+            if _wanted(name):
+                entries.append(AppEntry(name, entry.path, "lnk", entry.path))
+    return entries
+
+
+def _strip_field_codes(command: str) -> str:
+    # %f %F %u %U %i %c %k ... are placeholders filled in by the desktop; %% is a literal %
+    parts = [p for p in shlex.split(command) if not (len(p) == 2 and p[0] == "%" and p[1] != "%")]
+    return " ".join(shlex.quote(p.replace("%%", "%")) for p in parts)
+
+
+def parse_desktop_file(path: str) -> Optional[AppEntry]:
+    """Application entry from a freedesktop .desktop file (None if hidden or not an app)."""
+    fields: Dict[str, str] = {}
+    in_entry = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                    continue
+                if in_entry and "=" in line and not line.startswith("#"):
+                    key, _, value = line.partition("=")
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if fields.get("Type", "Application") != "Application":
+        return None
+    if fields.get("NoDisplay", "").lower() == "true" or fields.get("Hidden", "").lower() == "true":
+        return None
+    name, command = fields.get("Name"), fields.get("Exec")
+    if not name or not command:
+        return None
+    try:
+        command = _strip_field_codes(command)
+    except ValueError:
+        return None
+    keywords = " ".join(filter(None, [fields.get("GenericName", ""), fields.get("Keywords", "").replace(";", " ")]))
+    return AppEntry(name, command, "desktop", path, keywords.strip())
+
+
+def scan_desktop_dir(folder: str) -> List[AppEntry]:
+    entries = []
+    for entry in os.scandir(folder):
+        if entry.is_file() and entry.name.endswith(".desktop"):
+            app = parse_desktop_file(entry.path)
+            if app and _wanted(app.name):
+                entries.append(app)
+    return entries
+
+
+def scan_path_dir(folder: str) -> List[AppEntry]:
+    entries = []
+    for entry in os.scandir(folder):
+        try:
+            if entry.is_file() and os.access(entry.path, os.X_OK):
+                entries.append(AppEntry(entry.name, entry.path, "path", entry.path))
+        except OSError:
+            continue
+    return entries
+
+
+SCANNERS = {"lnk": scan_lnk_dir, "desktop": scan_desktop_dir, "path": scan_path_dir}
+
+
+# --- Default locations ---
+def default_dirs() -> Dict[str, List[str]]:
+    """{"lnk"|"desktop"|"path": [dirs]} for this platform; .lnk/.desktop dirs are walked recursively."""
+    if os.name == "nt":
+        roots = [os.path.join(os.getenv("ProgramData", r"C:\ProgramData"), r"Microsoft\Windows\Start Menu\Programs"),
+                 os.path.join(os.getenv("APPDATA", ""), r"Microsoft\Windows\Start Menu\Programs")]
+        return {"lnk": [r for r in roots if r], "desktop": [], "path": []}
+    data_home = os.getenv("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+    data_dirs = os.getenv("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+    desktop = [os.path.join(d, "applications") for d in [data_home] + data_dirs if d]
+    desktop += ["/var/lib/flatpak/exports/share/applications", "/var/lib/snapd/desktop/applications"]
+    path = [d for d in os.getenv("PATH", "").split(os.pathsep) if d]
+    return {"lnk": [], "desktop": desktop, "path": path}
+
+
+class AppCatalog:
+    """
+    Installed applications, cached per directory and refreshed incrementally.
+
+    `dirs` maps a scanner kind to its directories (see default_dirs()); pass
+    your own dirs and cache_path to build a catalog for tests or another
+    machine layout.
+    """
+
+    def __init__(self, dirs: Dict[str, List[str]] = None, cache_path: str = APP_CATALOG_FILE,
+                 rescan_interval: float = APP_RESCAN_INTERVAL):
+        self.dirs = dirs if dirs is not None else default_dirs()
+        self.cache_path = cache_path
+        self.rescan_interval = rescan_interval
+        self.refreshed_at = 0.0
+        # directory -> (kind, mtime, entries)
+        self._scanned: Dict[str, Tuple[str, float, List[AppEntry]]] = {}
+        self._entries: List[AppEntry] = []
+        self._by_key: Dict[str, AppEntry] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    # --- cache ---
+    def _load_cache(self) -> None:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("v") == CATALOG_VERSION:
+                self._scanned = {
+                    folder: (item["kind"], item["mtime"], [AppEntry(**e) for e in item["entries"]])
+                    for folder, item in data["dirs"].items()
+                }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"⚠ App catalog cache ignored: {e}")
+
+    def _save_cache(self) -> None:
+        data = {"v": CATALOG_VERSION, "saved": time.time(), "dirs": {
+            folder: {"kind": kind, "mtime": mtime, "entries": [asdict(e) for e in entries]}
+            for folder, (kind, mtime, entries) in self._scanned.items()
+        }}
+        try:
+            tmp = f"{self.cache_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            logger.warning(f"⚠ App catalog cache not saved: {e}")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load_cache()
+                    self.refresh()
+                    self._loaded = True
+
+    # --- scanning ---
+    def _walk(self) -> List[Tuple[str, str]]:
+        """(kind, directory) for every directory to scan; lnk/desktop trees include subfolders."""
+        found = []
+        for kind, roots in self.dirs.items():
+            for root in roots:
+                if not os.path.isdir(root):
+                    continue
+                if kind == "path":
+                    found.append((kind, root))
+                    continue
+                for folder, _, _ in os.walk(root):
+                    found.append((kind, folder))
+        return found
+
+    def refresh(self) -> int:
+        """Re-scan directories whose mtime changed; returns how many were re-read."""
+        with self._lock:
+            rescanned, current = 0, {}
+            for kind, folder in self._walk():
+                try:
+                    mtime = os.stat(folder).st_mtime
+                except OSError:
+                    continue
+                cached = self._scanned.get(folder)
+                if cached and cached[0] == kind and cached[1] == mtime:
+                    current[folder] = cached
+                    continue
+                try:
+                    current[folder] = (kind, mtime, SCANNERS[kind](folder))
+                    rescanned += 1
+                except OSError:
+                    continue
+            changed = rescanned or set(current) != set(self._scanned)
+            self._scanned = current
+            self.refreshed_at = time.monotonic()
+            self._rebuild()
+            if changed:
+                self._save_cache()
+                logger.info(f"✅ App catalog: {len(self._entries)} apps ({rescanned} folders re-scanned)")
+            return rescanned
+
+    def _rebuild(self) -> None:
+        by_key: Dict[str, AppEntry] = {}
+        # earlier dirs win (user dirs before system dirs, PATH order like the shell)
+        for kind, _, entries in self._scanned.values():
+            for entry in entries:
+                existing = by_key.get(entry.key)
+                if existing is None or _KIND_RANK[entry.kind] < _KIND_RANK[existing.kind]:
+                    by_key[entry.key] = entry
+        self._by_key = by_key
+        self._entries = list(by_key.values())
+
+    # --- lookup ---
+    def entries(self) -> List[AppEntry]:
+        self._ensure_loaded()
+        return list(self._entries)
+
+    @staticmethod
+    def score(query: str, entry: AppEntry) -> int:
+        fuzz = rapidfuzz_fuzz or fuzzywuzzy_fuzz
+        name = entry.key
+        # plain ratio + token-set ("code" inside "visual studio code"); no partial_ratio,
+        # which lets two-letter PATH binaries like "od" match anything
+        best = max(fuzz.ratio(query, name), fuzz.token_set_ratio(query, name) - 3)
+        for alias in entry.aliases():
+            best = max(best, fuzz.ratio(query, alias) - 2)
+        if entry.keywords:
+            best = max(best, fuzz.token_set_ratio(query, entry.keywords.lower()) - 8)
+        return int(round(best))
+
+    def ranked(self, query: str, limit: int = 5) -> List[Tuple[AppEntry, int]]:
+        self._ensure_loaded()
+        query = query.lower().strip()
+        if not query:
+            return []
+        exact = self._by_key.get(query)
+        if exact:
+            return [(exact, 101)][:limit]
+        scored = [(entry, self.score(query, entry)) for entry in self._entries]
+        scored.sort(key=lambda es: (-es[1], _KIND_RANK[es[0].kind], len(es[0].name)))
+        return scored[:limit]
+
+    def resolve(self, query: str, min_score: int = APP_MATCH_MIN) -> Optional[AppEntry]:
+        ranked = self.ranked(query, limit=1)
+        if not (ranked and ranked[0][1] >= min_score) and self._refresh_due():
+            # maybe installed since the last scan: the incremental refresh is a few stat() calls
+            self.refresh()
+            ranked = self.ranked(query, limit=1)
+        if ranked and ranked[0][1] >= min_score:
+            return ranked[0][0]
+        return None
+
+    def _refresh_due(self) -> bool:
+        return time.monotonic() - self.refreshed_at >= self.rescan_interval
+
+
+_catalog: Optional[AppCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> AppCatalog:
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = AppCatalog()
+        return _catalog
+
+
+def warm_catalog() -> None:
+    """Load/refresh the catalog in a background thread so the first open_app is instant."""
+    threading.Thread(target=get_catalog().entries, name="app-catalog", daemon=True).start()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the installed-app catalog.")
+    parser.add_argument("query", nargs="?", help="app name to resolve")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--list", action="store_true", help="list every catalogued app")
+    args = parser.parse_args()
+    catalog = get_catalog()
+    if args.list or not args.query:
+        for entry in sorted(catalog.entries(), key=lambda e: e.key):
+            print(f"{entry.kind:<8} {entry.name:<40} {entry.target}")
+        sys.exit(0)
+    for entry, score in catalog.ranked(args.query, args.top):
+        print(f"{score:>4} {entry.kind:<8} {entry.name:<40} {entry.target}")
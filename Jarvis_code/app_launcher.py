@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import webbrowser
+from typing import List, Optional
+from lazy_imports import lazy_import
+from window_registry import registry as window_registry, WindowInfo
+
+win32com_client = lazy_import("win32com.client", optional=True)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_URI = re.compile(r"^[a-z][a-z0-9+.-]*:", re.IGNORECASE)
+
+
+def is_url(target: str) -> bool:
+    return target.lower().startswith(("http://", "https://"))
+
+
+def _is_uri(target: str) -> bool:
+    # "ms-settings:", "mailto:" ... but not a Windows drive path like "C:\\..."
+    return bool(_URI.match(target)) and not re.match(r"^[a-z]:[\\/]", target, re.IGNORECASE)
+
+
+def shortcut_target(path: str) -> Optional[str]:
+    """Executable behind a Windows .lnk (needs pywin32), else None."""
+    if not (win32com_client and path.lower().endswith(".lnk")):
+        return None
+    try:
+        return win32com_client.Dispatch("WScript.Shell").CreateShortCut(path).Targetpath or None
+    except Exception:
+        return None
+
+
+def command_argv(command: str) -> List[str]:
+    """argv for a command line, an executable path, or a bare program name."""
+    if os.path.isfile(command):
+        return [command]
+    argv = shlex.split(command, posix=os.name != "nt")
+    resolved = shutil.which(argv[0]) if argv else None
+    if resolved:
+        argv[0] = resolved
+    return argv
+
+
+def process_stem(target: str) -> str:
+    """Lower-case executable name without extension, used to spot a running instance."""
+    exe = shortcut_target(target) or target
+    if not os.path.isfile(exe):
+        try:
+            exe = command_argv(exe)[0]
+        except (ValueError, IndexError):
+            return ""
+    return os.path.splitext(os.path.basename(exe))[0].lower()
+
+
+def find_running(target: str) -> Optional[WindowInfo]:
+    """
+    An open window whose process is this target's executable.
+
+    Titles are never enough: "paint" or "settings" show up in plenty of
+    unrelated window titles.
+    """
+    if not window_registry.available or not target or is_url(target):
+        return None
+    stem = process_stem(target)
+    if not stem:
+        return None
+    for window in window_registry.windows():
+        if window.process == stem:
+            return window
+    return None
+
+
+def _spawn(argv: List[str]) -> None:
+    # detached: the app must outlive the agent worker and never hold its pipes
+    kwargs = dict(stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True)
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(argv, **kwargs)
+
+
+def launch_sync(target: str) -> str:
+    """
+    Start `target` without a shell. Returns how it was launched.
+
+    URLs go to the already running default browser as a new tab; shortcuts,
+    URIs and documents use the OS handler (ShellExecute / xdg-open / open);
+    everything else is exec'd directly from its argv.
+    """
+    if is_url(target):
+        webbrowser.open(target, new=2)
+        return "browser-tab"
+    if os.name == "nt" and (_is_uri(target) or os.path.splitext(target)[1].lower() in (".lnk", ".url", ".appref-ms")
+                            or (os.path.exists(target) and not target.lower().endswith(".exe"))):
+        os.startfile(target)
+        return "shell-execute"
+    if os.name != "nt" and (_is_uri(target) or (os.path.exists(target) and not os.access(target, os.X_OK))
+                            or os.path.isdir(target)):
+        _spawn(["open" if sys.platform == "darwin" else "xdg-open", target])
+        return "opener"
+    argv = command_argv(target)
+    if not argv:
+        raise ValueError("empty command")
+    if os.name == "nt" and not os.path.isfile(argv[0]):
+        # not on PATH: let ShellExecute try "App Paths" registrations, like `start` did
+        os.startfile(target)
+        return "shell-execute"
+    _spawn(argv)
+    return "exec"
+
+
+async def launch(target: str) -> str:
+    return await asyncio.to_thread(launch_sync, target)
+
+
+async def open_or_focus(target: str, new_instance: bool = False) -> str:
+    """
+    Focus an open instance of the app (same executable) if there is one, else launch it.
+
+    Returns "focused" or the launch mode from launch_sync().
+    """
+    if not new_instance and not is_url(target):
+        window = await asyncio.to_thread(find_running, target)
+        if window is not None:
+            try:
+                await asyncio.to_thread(window_registry.activate, window)
+                logger.info(f"♻️ Reusing open window: {window.title}")
+                return "focused"
+            except Exception as e:
+                # cached snapshot may list a window that has since closed
+                logger.warning(f"⚠ Could not focus {window.title}: {e}; launching instead")
+    return await launch(target)
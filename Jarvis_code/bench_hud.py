@@ -0,0 +1,173 @@
+"""
+Headless render benchmark for the HUD (nova_safe.py).
+
+Renders AnimatedRings, a NeonBar (with sparkline history) and the full
+NovaHUD into an offscreen QImage for N frames at several window sizes and
+prints per-frame paint time percentiles. A second, shorter pass runs under
+tracemalloc and reports Python memory retained per frame (net growth,
+which exposes per-frame leaks and caches that never stop growing) and the
+peak traced during the pass.
+
+Every 60th frame feeds a synthetic stats sample, like the 1 s sampler
+would at 60 FPS, so sparkline rebuilds are part of the numbers.
+
+Runs without a display: QT_QPA_PLATFORM defaults to "offscreen".
+
+Usage:
+    python bench_hud.py
+    python bench_hud.py --frames 600 --sizes 1280x720,1920x1080 --targets rings,hud
+    python bench_hud.py --json hud_bench.json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bench_stats import format_row, header, summarize
+
+TARGETS = ("rings", "bar", "hud")
+FRAME_SECONDS = 1 / 60.0     # simulated time per frame (60 FPS)
+SAMPLE_EVERY = 60            # frames between synthetic stats samples
+
+
+def parse_size(text: str):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def fake_sample(i: int) -> dict:
+    return {
+        "cpu": 50 + 40 * math.sin(i / 7.0),
+        "mem": 55 + 10 * math.sin(i / 13.0),
+        "disk": 70.0,
+        "temp": 55 + 5 * math.sin(i / 5.0),
+        "net": (abs(math.sin(i / 3.0)) * 2.0, abs(math.cos(i / 4.0)) * 12.0),
+    }
+
+
+class Scene:
+    """One widget plus the per-frame state change the real HUD would make."""
+
+    def __init__(self, target: str, width: int, height: int):
+        import nova_safe as hud
+
+        self.target = target
+        self.frame = 0
+        self.cycle = hud.RING_CYCLE_SECONDS
+        if target == "rings":
+            self.widget = hud.AnimatedRings()
+        elif target == "bar":
+            # as wide as the HUD's right-hand column
+            self.history = hud.RingBuffer(hud.HISTORY_SECONDS / hud.system_metrics.sampler.rates["cpu"])
+            self.widget = hud.NeonBar("CPU CORE UTILIZATION", history=self.history)
+            width, height = max(width // 5, 120), self.widget.minimumHeight()
+        else:
+            self.widget = hud.NovaHUD()
+            # no background sampling / sockets while measuring paint cost
+            self.widget.sampler.unsubscribe(self.widget.onSample)
+            self.widget.sampler.stop()
+            self.widget.telemetry.sock.close()
+        self.widget.resize(width, height)
+        self.size = (width, height)
+
+    def step(self) -> None:
+        i, self.frame = self.frame, self.frame + 1
+        if self.target == "rings":
+            self.widget.phase = (i * FRAME_SECONDS / self.cycle) % 1.0
+        elif self.target == "bar":
+            self.widget.setValue(50 + 40 * math.sin(i / 30.0))
+            if i % SAMPLE_EVERY == 0:
+                self.history.append(fake_sample(i // SAMPLE_EVERY)["cpu"])
+        else:
+            self.widget.rings.phase = (i * FRAME_SECONDS / self.cycle) % 1.0
+            if i % SAMPLE_EVERY == 0:
+                self.widget.applyStats(fake_sample(i // SAMPLE_EVERY))
+
+
+def run_scene(target: str, size, args) -> dict:
+    from PySide6.QtGui import QImage
+
+    scene = Scene(target, *size)
+    image = QImage(scene.size[0], scene.size[1], QImage.Format_ARGB32_Premultiplied)
+
+    def frame():
+        scene.step()
+        image.fill(0)
+        start = time.perf_counter()
+        scene.widget.render(image)
+        return (time.perf_counter() - start) * 1000.0
+
+    for _ in range(args.warmup):
+        frame()
+    times = [frame() for _ in range(args.frames)]
+
+    # allocations: separate pass, tracemalloc slows rendering down
+    alloc_frames = min(args.frames, args.alloc_frames)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot()
+    for _ in range(alloc_frames):
+        frame()
+    after = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    retained = sum(d.size_diff for d in diff if d.size_diff > 0)
+    blocks = sum(d.count_diff for d in diff if d.count_diff > 0)
+
+    scene.widget.close()
+    scene.widget.deleteLater()
+    return {
+        "target": target,
+        "size": f"{scene.size[0]}x{scene.size[1]}",
+        "frame_ms": summarize(times),
+        "alloc_frames": alloc_frames,
+        "retained_bytes_per_frame": retained / alloc_frames if alloc_frames else 0.0,
+        "retained_blocks_per_frame": blocks / alloc_frames if alloc_frames else 0.0,
+        "py_growth_kb": (current - base) / 1024.0,
+        "py_peak_kb": (peak - base) / 1024.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HUD rendering into an offscreen QImage.")
+    parser.add_argument("--targets", default=",".join(TARGETS), help="comma list of: " + ", ".join(TARGETS))
+    parser.add_argument("--sizes", default="800x600,1200x800,1920x1080")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--alloc-frames", type=int, default=120, help="frames in the tracemalloc pass")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args()
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = [t for t in targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    results = []
+    print(header("target") + "   retained/frame    peak")
+    for target in targets:
+        for size in sizes:
+            r = run_scene(target, size, args)
+            app.processEvents()
+            results.append(r)
+            extra = f"{r['retained_bytes_per_frame'] / 1024.0:>8.1f} KB {r['py_peak_kb']:>7.0f} KB"
+            print(format_row(f"{target} {r['size']}", r["frame_ms"], extra=extra))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"frames": args.frames, "platform": os.environ.get("QT_QPA_PLATFORM"),
+                       "results": results}, f, indent=2)
+        print(f"📊 Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import math
+from typing import Dict, Iterable, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100.0 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def summarize(samples: Iterable[float]) -> Dict[str, float]:
+    """count / mean / p50 / p95 / p99 / max of a list of latencies."""
+    values = sorted(samples)
+    if not values:
+        return {"count": 0, "mean": float("nan"), "p50": float("nan"),
+                "p95": float("nan"), "p99": float("nan"), "max": float("nan")}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+
+def format_row(name: str, stats: Dict[str, float], unit: str = "ms", extra: str = "") -> str:
+    return (f"{name:<24} {stats['count']:>6} {stats['mean']:>9.1f} {stats['p50']:>9.1f} "
+            f"{stats['p95']:>9.1f} {stats['p99']:>9.1f} {stats['max']:>9.1f} {unit} {extra}")
+
+
+def header(first: str = "tool") -> str:
+    return f"{first:<24} {'n':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
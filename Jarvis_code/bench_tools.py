@@ -0,0 +1,143 @@
+"""
+Offline latency benchmark for the network tools.
+
+Starts the local mock services (see mock_services.py), points the tools at
+them and drives google_search, get_weather and generate_image_tool with
+concurrent calls. Prints p50/p95/p99 latency per tool; for images the
+latency is until the background job has finished, not just until the
+job id came back.
+
+Usage:
+    python bench_tools.py --requests 40 --concurrency 8
+    python bench_tools.py --tools image --latency hf=1500 --error-rate hf=0.2
+    python bench_tools.py --tools search,weather --json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from bench_stats import format_row, header, summarize
+from mock_services import MockServices, add_profile_arguments, profiles_from_args
+
+CITIES = ["Delhi", "Mumbai", "Bengaluru", "Pune", "Jaipur", "Kolkata", "Chennai", ""]
+JOB_ID = re.compile(r"img-\d+")
+
+
+def _failed(result: str) -> bool:
+    lowered = result.lower()
+    return result.startswith("❌") or "error" in lowered or "failed" in lowered
+
+
+async def _call_search(i: int, args) -> bool:
+    import Jarvis_google_search
+    result = await Jarvis_google_search.google_search(f"benchmark query {i}")
+    return not _failed(result)
+
+
+async def _call_weather(i: int, args) -> bool:
+    import jarvis_get_weather
+    result = await jarvis_get_weather.get_weather(CITIES[i % len(CITIES)])
+    return not _failed(result)
+
+
+async def _call_image(i: int, args) -> bool:
+    import Jarvis_image_gen
+    prompt = f"benchmark prompt {i % args.distinct_prompts if args.distinct_prompts else i}"
+    result = await Jarvis_image_gen.generate_image_tool(prompt, variants=args.variants)
+    match = JOB_ID.search(result)
+    if not match:
+        return result.startswith("⚡")  # served from the local cache
+    job = await Jarvis_image_gen.image_jobs.wait(match.group(0))
+    return job is not None and job.status == "done"
+
+
+TOOLS = {
+    "search": _call_search,
+    "weather": _call_weather,
+    "image": _call_image,
+}
+
+
+async def run_tool(name: str, args) -> dict:
+    call = TOOLS[name]
+    latencies, errors = [], 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                ok = await call(i, args)
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            if not ok:
+                errors += 1
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - wall
+    stats = summarize(latencies)
+    stats.update({"errors": errors, "wall_s": wall, "throughput_rps": args.requests / wall if wall else 0.0})
+    return stats
+
+
+async def run_all(args) -> dict:
+    results = {}
+    for name in args.tools:
+        results[name] = await run_tool(name, args)
+        stats = results[name]
+        print(format_row(name, stats, extra=f"errors={stats['errors']} rps={stats['throughput_rps']:.1f}"))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the network tools against local mock services.")
+    parser.add_argument("--tools", default="search,weather,image", help="comma separated: search,weather,image")
+    parser.add_argument("--requests", type=int, default=30, help="calls per tool")
+    parser.add_argument("--concurrency", type=int, default=6, help="calls in flight at once")
+    parser.add_argument("--variants", type=int, default=1, help="image variants per generate_image_tool call")
+    parser.add_argument("--distinct-prompts", type=int, default=0,
+                        help="reuse this many image prompts (exercises the local cache); 0 = all unique")
+    parser.add_argument("--seed", type=int, default=None, help="seed for mock latency/error draws")
+    parser.add_argument("--json", help="also write results to this file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    args.tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = [t for t in args.tools if t not in TOOLS]
+    if unknown:
+        parser.error(f"unknown tool(s): {', '.join(unknown)}")
+
+    mock = MockServices(profiles=profiles_from_args(args), seed=args.seed).start()
+    # the tool modules read their endpoints at import time, so set env first
+    os.environ.update(mock.env())
+    os.environ["IMAGE_STORE_DIR"] = tempfile.mkdtemp(prefix="vyaas-bench-")
+    os.environ["IMAGE_AUTO_OPEN"] = "0"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    print(f"🧪 Mock services on {mock.base_url} — {args.requests} calls/tool, concurrency {args.concurrency}\n")
+    print(header())
+    try:
+        results = asyncio.run(run_all(args))
+    finally:
+        mock.stop()
+
+    print(f"\nupstream requests: {mock.counts}")
+    import resilience
+    print(f"\n{resilience.format_metrics()}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != "json"},
+                       "results": results, "upstream_requests": mock.counts,
+                       "endpoints": resilience.metrics()}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Typing throughput benchmark for SafeController.type_text.
+
+Types sample text with each strategy (keys / bulk / paste) and reports
+chars/sec and total time per text length. By default it starts a private
+Xvfb virtual display so nothing is typed into your real windows.
+
+Usage:
+    python bench_typing.py                       # needs Xvfb on Linux
+    python bench_typing.py --lengths 50,500 --strategies bulk,paste --repeat 5
+    python bench_typing.py --real-display        # type into the current display (careful!)
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from bench_stats import summarize
+
+SAMPLE = ("The quick brown fox jumps over the lazy dog, while Vyaas keeps typing "
+          "notes about performance, latency and throughput. 0123456789 ")
+
+
+def start_virtual_display(display: str = ":99"):
+    """Start Xvfb and point DISPLAY at it; returns the process (or None)."""
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        raise SystemExit("❌ Xvfb not found. Install it (e.g. apt install xvfb) or pass --real-display.")
+    proc = subprocess.Popen([xvfb, display, "-screen", "0", "1280x720x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    # wait for the X socket to appear
+    socket_path = f"/tmp/.X11-unix/X{display.lstrip(':')}"
+    for _ in range(50):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.1)
+    return proc
+
+
+async def run(args):
+    import keyboard_mouse_CTRL as kmc
+
+    if args.rate is not None:
+        kmc.TYPE_RATE = args.rate
+    controller = kmc.controller
+    # keep the action log (JSONL writes) out of the timings
+    kmc.action_log.write = lambda event, **fields: None
+
+    print(f"{'strategy':<8} {'chars':>6} {'runs':>5} {'p50 ms':>9} {'max ms':>9} {'chars/s':>9}")
+    for strategy in args.strategies:
+        for length in args.lengths:
+            if strategy == "keys" and length > args.keys_limit:
+                print(f"{strategy:<8} {length:>6}   (skipped, > --keys-limit)")
+                continue
+            text = (SAMPLE * (length // len(SAMPLE) + 1))[:length]
+            times = []
+            for _ in range(args.repeat):
+                controller.activate("my_secret_token")
+                start = time.perf_counter()
+                result = await controller.type_text(text, strategy)
+                times.append((time.perf_counter() - start) * 1000.0)
+                if not result.startswith("⌨️"):
+                    print(f"❌ {strategy}: {result}")
+                    break
+            stats = summarize(times)
+            cps = length / (stats["p50"] / 1000.0) if stats["p50"] else float("inf")
+            print(f"{strategy:<8} {length:>6} {stats['count']:>5} {stats['p50']:>9.1f} {stats['max']:>9.1f} {cps:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark typing strategies on a virtual display.")
+    parser.add_argument("--strategies", default="keys,bulk,paste")
+    parser.add_argument("--lengths", default="20,100,500")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rate", type=float, default=None, help="override TYPE_RATE (chars/sec, 0 = unthrottled)")
+    parser.add_argument("--keys-limit", type=int, default=200, help="skip per-key typing above this length")
+    parser.add_argument("--real-display", action="store_true", help="use the current display instead of Xvfb")
+    args = parser.parse_args()
+    args.strategies = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    args.lengths = [int(n) for n in args.lengths.split(",") if n.strip()]
+
+    xvfb = None
+    if not args.real_display and sys.platform.startswith("linux"):
+        xvfb = start_virtual_display()
+    try:
+        asyncio.run(run(args))
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+
+if __name__ == "__main__":
+    main()
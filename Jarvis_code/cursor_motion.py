@@ -0,0 +1,142 @@
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+
+win32api = lazy_import("win32api", optional=True)
+
+Point = Tuple[int, int]
+
+# Motion tuning (seconds / pixels per second)
+MOTION_MIN_SECONDS = float(os.getenv("MOTION_MIN_SECONDS", "0.08"))
+MOTION_MAX_SECONDS = float(os.getenv("MOTION_MAX_SECONDS", "0.6"))
+MOTION_SPEED = float(os.getenv("MOTION_SPEED", "3000"))
+DEFAULT_REFRESH_HZ = 60.0
+
+# 8-way directions for relative moves: (dx, dy) unit vectors, screen y grows down
+DIRECTION_VECTORS: Dict[str, Tuple[float, float]] = {
+    "up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0),
+    "up-left": (-1, -1), "up-right": (1, -1), "down-left": (-1, 1), "down-right": (1, 1),
+}
+
+# Named screen anchors as fractions of width/height
+ANCHORS: Dict[str, Tuple[float, float]] = {
+    "center": (0.5, 0.5), "top": (0.5, 0.0), "bottom": (0.5, 1.0),
+    "left": (0.0, 0.5), "right": (1.0, 0.5),
+    "top-left": (0.0, 0.0), "top-right": (1.0, 0.0),
+    "bottom-left": (0.0, 1.0), "bottom-right": (1.0, 1.0),
+}
+
+
+# --- Easing ---
+def linear(t: float) -> float:
+    return t
+
+
+def ease_out(t: float) -> float:
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out(t: float) -> float:
+    return 4 * t ** 3 if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": linear, "ease_out": ease_out, "ease_in_out": ease_in_out,
+}
+
+
+# --- Geometry ---
+_refresh_hz: Optional[float] = None
+
+
+def refresh_rate() -> float:
+    """Display refresh rate in Hz (DISPLAY_REFRESH_HZ env, Windows query, else 60)."""
+    global _refresh_hz
+    if _refresh_hz is None:
+        hz = float(os.getenv("DISPLAY_REFRESH_HZ", "0"))
+        if not hz and win32api:
+            try:
+                hz = float(win32api.EnumDisplaySettings(None, -1).DisplayFrequency)  # ENUM_CURRENT_SETTINGS
+            except Exception:
+                hz = 0.0
+        # 0/1 Hz means "hardware default" on some drivers
+        _refresh_hz = hz if 24 <= hz <= 500 else DEFAULT_REFRESH_HZ
+    return _refresh_hz
+
+
+def relative_target(start: Point, direction: str, distance: int) -> Point:
+    """Point `distance` pixels from `start` in one of DIRECTION_VECTORS (diagonals keep the length)."""
+    dx, dy = DIRECTION_VECTORS[direction]
+    norm = math.hypot(dx, dy)
+    return (round(start[0] + dx / norm * distance), round(start[1] + dy / norm * distance))
+
+
+def anchor_point(name: str, screen: Point, margin: int = 2) -> Point:
+    fx, fy = ANCHORS[name]
+    return clamp((round(fx * (screen[0] - 1)), round(fy * (screen[1] - 1))), screen, margin)
+
+
+def clamp(point: Point, screen: Point, margin: int = 0) -> Point:
+    x = min(max(point[0], margin), screen[0] - 1 - margin)
+    y = min(max(point[1], margin), screen[1] - 1 - margin)
+    return (x, y)
+
+
+def motion_duration(start: Point, end: Point) -> float:
+    """Longer moves take longer, but always within [MOTION_MIN_SECONDS, MOTION_MAX_SECONDS]."""
+    distance = math.hypot(end[0] - start[0], end[1] - start[1])
+    if distance == 0:
+        return 0.0
+    return min(MOTION_MAX_SECONDS, max(MOTION_MIN_SECONDS, distance / MOTION_SPEED))
+
+
+def plan_path(start: Point, end: Point, duration: float, hz: float,
+              easing: str = "ease_in_out") -> List[Point]:
+    """One point per display frame along an eased straight line; the last point is exactly `end`."""
+    ease = EASINGS[easing]
+    frames = max(1, round(duration * hz))
+    return [(round(start[0] + (end[0] - start[0]) * ease(i / frames)),
+             round(start[1] + (end[1] - start[1]) * ease(i / frames)))
+            for i in range(1, frames + 1)]
+
+
+# --- Playback ---
+class MotionPlayer:
+    """
+    Plays a planned path by calling `set_position` once per frame.
+
+    Meant to run on the input thread (see input_executor). Frames are paced
+    against absolute deadlines so a slow frame does not stretch the motion:
+    late frames are skipped, and the last point is always applied, so a move
+    never takes much longer than its planned duration. cancel() stops a
+    motion that is in progress (e.g. when the controller lease ends).
+    """
+
+    def __init__(self):
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def play(self, set_position: Callable[[Point], None], points: List[Point], hz: float) -> Optional[Point]:
+        self._cancel.clear()
+        interval = 1.0 / hz
+        start = time.perf_counter()
+        last = len(points) - 1
+        applied = None
+        for i, point in enumerate(points):
+            if self._cancel.is_set():
+                break
+            due = start + (i + 1) * interval
+            now = time.perf_counter()
+            if i < last and now > due + interval:
+                continue  # behind schedule: drop this frame rather than run long
+            set_position(point)
+            applied = point
+            if i < last and due > now:
+                time.sleep(due - now)
+        return applied
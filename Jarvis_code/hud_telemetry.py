@@ -0,0 +1,114 @@
+"""
+Agent -> HUD telemetry over a local UDP socket.
+
+The agent fires small JSON datagrams at HUD_TELEMETRY_HOST:HUD_TELEMETRY_PORT
+and never waits for an answer: with no HUD running a publish is one
+non-blocking sendto() that goes nowhere, so the audio loop is never held up.
+The HUD (nova_safe.py) binds the port and is woken by the socket, no polling.
+
+Datagrams (one JSON object each):
+    {"t": 1718000000.123, "event": "state", "agent": "thinking", "user": "listening"}
+    {"t": ..., "event": "tool_start", "tool": "open_app"}
+    {"t": ..., "event": "tool_end", "tool": "open_app", "latency_ms": 182.4, "ok": true}
+    {"t": ..., "event": "heartbeat", "agent": "listening", "pid": 1234}
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import Callable, Optional
+
+import tool_metrics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HUD_TELEMETRY_HOST = os.getenv("HUD_TELEMETRY_HOST", "127.0.0.1")
+HUD_TELEMETRY_PORT = int(os.getenv("HUD_TELEMETRY_PORT", "9465"))
+HUD_HEARTBEAT_SECONDS = float(os.getenv("HUD_HEARTBEAT_SECONDS", "2"))
+
+
+class TelemetryPublisher:
+    """Fire-and-forget sender; a dropped datagram is counted, never raised."""
+
+    def __init__(self, host: str = HUD_TELEMETRY_HOST, port: int = HUD_TELEMETRY_PORT):
+        self.address = (host, port)
+        self.sent = 0
+        self.dropped = 0
+        self.agent_state = "initializing"
+        self.user_state = "listening"
+        self._sock: Optional[socket.socket] = None
+
+    def publish(self, event: str, **fields) -> None:
+        payload = {"t": round(time.time(), 3), "event": event}
+        payload.update(fields)
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        try:
+            if self._sock is None:
+                self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._sock.setblocking(False)
+            self._sock.sendto(data, self.address)
+            self.sent += 1
+        except OSError:
+            self.dropped += 1
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+publisher = TelemetryPublisher()
+
+
+def publish(event: str, **fields) -> None:
+    publisher.publish(event, **fields)
+
+
+def attach(session) -> Callable:
+    """
+    Publish an AgentSession's state changes, tool calls and a heartbeat.
+
+    Must be called from the running event loop. Returns a detach() callable
+    for the shutdown callback.
+    """
+    def publish_state():
+        publisher.publish("state", agent=publisher.agent_state, user=publisher.user_state)
+
+    def on_agent_state(ev):
+        publisher.agent_state = ev.new_state
+        publish_state()
+
+    def on_user_state(ev):
+        publisher.user_state = ev.new_state
+        publish_state()
+
+    def on_error(ev):
+        publisher.publish("error", source=type(ev.source).__name__, message=str(ev.error)[:200])
+
+    def on_tool(event, fields):
+        publisher.publish(event, **fields)
+
+    async def heartbeat():
+        # lets the HUD tell "agent idle" apart from "agent gone"
+        while True:
+            publisher.publish("heartbeat", agent=publisher.agent_state, pid=os.getpid())
+            await asyncio.sleep(HUD_HEARTBEAT_SECONDS)
+
+    session.on("agent_state_changed", on_agent_state)
+    session.on("user_state_changed", on_user_state)
+    session.on("error", on_error)
+    tool_metrics.registry.add_listener(on_tool)
+    task = asyncio.get_running_loop().create_task(heartbeat())
+    logger.info(f"📡 HUD telemetry -> udp://{publisher.address[0]}:{publisher.address[1]}")
+
+    def detach():
+        task.cancel()
+        session.off("agent_state_changed", on_agent_state)
+        session.off("user_state_changed", on_user_state)
+        session.off("error", on_error)
+        tool_metrics.registry.remove_listener(on_tool)
+        publisher.publish("state", agent="offline", user=publisher.user_state)
+    return detach
@@ -0,0 +1,116 @@
+import html
+import logging
+import mimetypes
+import os
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Optional
+from image_store import ImageStore, get_store
+from local_http import LocalServer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+GALLERY_HOST = os.getenv("GALLERY_HOST", "127.0.0.1")
+GALLERY_PORT = int(os.getenv("GALLERY_PORT", "8765"))
+
+_PAGE_STYLE = """
+body { background:#0A1423; color:#E0FFFF; font-family:Segoe UI, sans-serif; margin:24px; }
+h1 { color:#00FFFF; letter-spacing:2px; font-size:20px; }
+.grid { display:flex; flex-wrap:wrap; gap:14px; }
+.card { width:256px; background:rgba(10,25,45,.8); border:1px solid rgba(0,255,255,.4); border-radius:8px; padding:8px; }
+.card img { width:256px; border-radius:4px; }
+.card p { font-size:12px; margin:6px 0 0; }
+a { color:#00FFFF; }
+"""
+
+
+class _GalleryHandler(BaseHTTPRequestHandler):
+    store: ImageStore = None
+
+    def log_message(self, fmt, *args):
+        logger.debug("gallery: " + fmt, *args)
+
+    def _send(self, status: int, body: bytes, content_type: str, cache: bool = False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        # keys are content hashes, so images never change once served
+        self.send_header("Cache-Control", "public, max-age=31536000, immutable" if cache else "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path: Optional[str]):
+        if not path:
+            return self._send(404, b"not found", "text/plain")
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        with open(path, "rb") as f:
+            self._send(200, f.read(), content_type, cache=True)
+
+    def _page(self, title: str, body: str):
+        doc = (f"<!doctype html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+               f"<style>{_PAGE_STYLE}</style></head><body>{body}</body></html>")
+        self._send(200, doc.encode("utf-8"), "text/html; charset=utf-8")
+
+    def do_GET(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        try:
+            if not parts:
+                return self._index()
+            if len(parts) == 2 and parts[0] == "image":
+                return self._send_file(self.store.get(parts[1]))
+            if len(parts) == 2 and parts[0] == "thumb":
+                return self._send_file(self.store.thumbnail(parts[1]))
+            if len(parts) == 2 and parts[0] == "view":
+                return self._view(parts[1])
+            self._send(404, b"not found", "text/plain")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _index(self):
+        cards = []
+        for meta in self.store.entries():
+            key = meta["key"]
+            cards.append(
+                f"<div class='card'><a href='/view/{key}'><img loading='lazy' src='/thumb/{key}'></a>"
+                f"<p>{html.escape(meta.get('prompt', ''))}</p></div>"
+            )
+        body = f"<h1>VYAAS IMAGE GALLERY</h1><div class='grid'>{''.join(cards) or 'No images yet.'}</div>"
+        self._page("Vyaas Gallery", body)
+
+    def _view(self, key: str):
+        meta = self.store.meta(key)
+        if not meta:
+            return self._send(404, b"not found", "text/plain")
+        body = (f"<h1>{html.escape(meta.get('prompt', ''))}</h1>"
+                f"<p><a href='/'>&larr; gallery</a> &middot; {html.escape(meta.get('model', ''))}</p>"
+                f"<img style='max-width:100%' src='/image/{key}'>")
+        self._page(meta.get("prompt", "image"), body)
+
+
+_server = LocalServer("image-gallery", "🖼️ Image gallery running at {url}")
+
+
+def start_gallery(store: ImageStore = None, host: str = GALLERY_HOST, port: int = GALLERY_PORT) -> str:
+    """Start the gallery in a daemon thread (once) and return its base URL."""
+    if _server.running:
+        return _server.url()
+    handler = type("GalleryHandler", (_GalleryHandler,), {"store": store or get_store()})
+    return _server.start(handler, host, port)
+
+
+def gallery_base_url() -> Optional[str]:
+    return _server.url()
+
+
+def stop_gallery() -> None:
+    _server.stop()
+
+
+if __name__ == "__main__":
+    url = start_gallery()
+    print(f"🖼️ Gallery: {url}  (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stop_gallery()
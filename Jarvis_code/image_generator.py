@@ -1,9 +1,23 @@
+import io
 import os
+import sys
+import math
+import time
 import base64
-import requests
+import random
 import webbrowser
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
 from dotenv import load_dotenv
+from lazy_imports import lazy_import
+from image_store import ImageStore, get_store
+from image_gallery import start_gallery
+import resilience
+
+requests = lazy_import("requests")
+PIL_Image = lazy_import("PIL.Image", optional=True)
+PIL_ImageDraw = lazy_import("PIL.ImageDraw", optional=True)
 
 # --- Load API keys ---
 load_dotenv()
@@ -12,28 +26,183 @@ IMGBB_KEY = os.getenv("IMGBB_KEY")
 
 MODEL_ID = "black-forest-labs/FLUX.1-dev"
 
-def generate_image(prompt: str) -> bytes:
+# Overridable so the pipeline can be pointed at a local mock server
+HF_API_URL = os.getenv("HF_API_URL", "https://api-inference.huggingface.co/models")
+IMGBB_URL = os.getenv("IMGBB_URL", "https://api.imgbb.com/1/upload")
+# Set IMAGE_AUTO_OPEN=0 on headless boxes / benchmarks
+IMAGE_AUTO_OPEN = os.getenv("IMAGE_AUTO_OPEN", "1") != "0"
+HF_TIMEOUT = float(os.getenv("HF_TIMEOUT", "120"))
+IMGBB_TIMEOUT = float(os.getenv("IMGBB_TIMEOUT", "30"))
+
+# No hedging here: a duplicate generation/upload costs real quota
+hf_endpoint = resilience.endpoint("huggingface", timeout=HF_TIMEOUT, failure_threshold=3, reset_after=60.0)
+imgbb_endpoint = resilience.endpoint("imgbb", timeout=IMGBB_TIMEOUT, failure_threshold=3)
+
+# Multi-variant requests ("show me 4 versions of ...")
+MAX_VARIANTS = int(os.getenv("IMAGE_MAX_VARIANTS", "8"))
+VARIANT_CONCURRENCY = int(os.getenv("IMAGE_VARIANT_CONCURRENCY", "4"))
+VARIANT_TIMEOUT = float(os.getenv("IMAGE_VARIANT_TIMEOUT", "90"))
+SHEET_TILE = 512
+
+
+@dataclass
+class RenderedImage:
+    key: str
+    path: str
+    prompt: str
+    cached: bool
+
+    @property
+    def url(self) -> str:
+        """Gallery page for this image (starts the local gallery if needed)."""
+        return f"{start_gallery()}/view/{self.key}"
+
+
+def generate_image(prompt: str, model: str = MODEL_ID, params: Optional[Dict] = None,
+                   timeout: float = HF_TIMEOUT) -> bytes:
     """Generate raw image bytes using Hugging Face model."""
     print(f"🎨 Generating image from prompt: {prompt}")
-    url = f"https://api-inference.huggingface.co/models/{MODEL_ID}"
+    url = f"{HF_API_URL}/{model}"
     headers = {"Authorization": f"Bearer {HF_TOKEN}"}
     payload = {"inputs": prompt}
+    if params:
+        payload["parameters"] = params
 
-    response = requests.post(url, headers=headers, json=payload)
+    budget = min(timeout, hf_endpoint.timeout)
+    response = hf_endpoint.call_sync(requests.post, url, headers=headers, json=payload,
+                                     timeout=budget, budget=budget)
     if response.status_code != 200:
         raise Exception(f"HF error {response.status_code}: {response.text}")
 
     print("✅ Image generated successfully.")
     return response.content  # raw bytes
 
+
+def find_cached(prompt: str, model: str = MODEL_ID, params: Optional[Dict] = None,
+                store: ImageStore = None) -> Optional[RenderedImage]:
+    """Return the stored image for this exact prompt/model/params, if any."""
+    store = store or get_store()
+    key = store.key_for(prompt, model, params)
+    path = store.get(key)
+    if path:
+        return RenderedImage(key=key, path=path, prompt=prompt, cached=True)
+    return None
+
+
+def render_image(prompt: str, model: str = MODEL_ID, params: Optional[Dict] = None,
+                 store: ImageStore = None, timeout: float = HF_TIMEOUT) -> RenderedImage:
+    """Cache-aware pipeline: reuse the stored image or generate and store a new one."""
+    store = store or get_store()
+    cached = find_cached(prompt, model, params, store)
+    if cached:
+        print(f"⚡ Cache hit for prompt: {prompt}")
+        return cached
+
+    image_bytes = generate_image(prompt, model, params, timeout=timeout)
+    key = store.key_for(prompt, model, params)
+    path = store.put(key, image_bytes, prompt=prompt, model=model, params=params)
+    return RenderedImage(key=key, path=path, prompt=prompt, cached=False)
+
+
+def variant_specs(prompt: str, variants: int = 1, prompts: Optional[List[str]] = None,
+                  seed: Optional[int] = None) -> List[Dict]:
+    """
+    Expand a request into (prompt, params) specs: either one entry per given
+    prompt, or `variants` copies of one prompt with different seeds.
+    """
+    if prompts:
+        chosen = [p for p in prompts if p and p.strip()][:MAX_VARIANTS]
+        return [{"prompt": p, "params": None} for p in chosen]
+    count = max(1, min(int(variants), MAX_VARIANTS))
+    if count == 1:
+        return [{"prompt": prompt, "params": None}]
+    base = seed if seed is not None else random.randint(0, 2**31 - count)
+    return [{"prompt": prompt, "params": {"seed": base + i}} for i in range(count)]
+
+
+def render_variants(specs: List[Dict], model: str = MODEL_ID, store: ImageStore = None,
+                    concurrency: int = VARIANT_CONCURRENCY, timeout: float = VARIANT_TIMEOUT,
+                    progress: Optional[Callable] = None) -> List[RenderedImage]:
+    """
+    Render several specs concurrently (at most `concurrency` HF calls at once).
+    Each request gets `timeout` seconds; variants that fail or time out are
+    skipped, and an error is raised only if none of them worked.
+    """
+    store = store or get_store()
+    results: List[Optional[RenderedImage]] = [None] * len(specs)
+    errors = []
+    pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(specs))), thread_name_prefix="img-variant")
+    try:
+        futures = [
+            pool.submit(render_image, spec["prompt"], model, spec["params"], store, timeout)
+            for spec in specs
+        ]
+        # queued variants also wait for a free slot, so the overall deadline
+        # covers every "wave" of `concurrency` requests
+        waves = math.ceil(len(specs) / max(1, concurrency))
+        deadline = time.monotonic() + timeout * waves
+        done = 0
+        for i, future in enumerate(futures):
+            try:
+                results[i] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                errors.append(f"variant {i + 1}: timed out")
+            except Exception as e:
+                errors.append(f"variant {i + 1}: {e}")
+            done += 1
+            if progress:
+                progress(f"{done}/{len(specs)} variants done", 0.1 + 0.8 * done / len(specs))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    images = [r for r in results if r is not None]
+    if errors:
+        print(f"⚠ {len(errors)} variant(s) failed: {'; '.join(errors)}")
+    if not images:
+        raise Exception(f"All variants failed: {'; '.join(errors)}")
+    return images
+
+
+def make_contact_sheet(images: List[RenderedImage], model: str = MODEL_ID,
+                       store: ImageStore = None) -> RenderedImage:
+    """Tile variants into one numbered grid image and store it like any other image."""
+    store = store or get_store()
+    params = {"contact_sheet": [img.key for img in images]}
+    title = " | ".join(dict.fromkeys(img.prompt for img in images))
+    cached = find_cached(title, model, params, store)
+    if cached:
+        return cached
+    if not PIL_Image:
+        raise Exception("Pillow is not installed, cannot build a contact sheet")
+
+    cols = math.ceil(math.sqrt(len(images)))
+    rows = math.ceil(len(images) / cols)
+    sheet = PIL_Image.new("RGB", (cols * SHEET_TILE, rows * SHEET_TILE), (10, 20, 35))
+    draw = PIL_ImageDraw.Draw(sheet)
+    for i, img in enumerate(images):
+        with PIL_Image.open(img.path) as tile:
+            tile = tile.convert("RGB")
+            tile.thumbnail((SHEET_TILE, SHEET_TILE))
+            x = (i % cols) * SHEET_TILE + (SHEET_TILE - tile.width) // 2
+            y = (i // cols) * SHEET_TILE + (SHEET_TILE - tile.height) // 2
+            sheet.paste(tile, (x, y))
+        draw.text(((i % cols) * SHEET_TILE + 10, (i // cols) * SHEET_TILE + 8), str(i + 1), fill=(0, 255, 255))
+
+    buf = io.BytesIO()
+    sheet.save(buf, "PNG")
+    key = store.key_for(title, model, params)
+    path = store.put(key, buf.getvalue(), prompt=title, model=model, params=params)
+    return RenderedImage(key=key, path=path, prompt=title, cached=False)
+
+
 def upload_to_imgbb(image_bytes: bytes) -> str:
-    """Upload image bytes directly to imgbb and return public URL."""
+    """Upload image bytes to imgbb and return a public URL (only for sharing)."""
     print("☁️ Uploading image to imgbb...")
     encoded = base64.b64encode(image_bytes)
-    url = "https://api.imgbb.com/1/upload"
+    url = IMGBB_URL
     payload = {"key": IMGBB_KEY, "image": encoded}
 
-    res = requests.post(url, data=payload)
+    res = imgbb_endpoint.call_sync(requests.post, url, data=payload, timeout=imgbb_endpoint.timeout)
     if res.status_code != 200:
         raise Exception(f"imgbb upload failed: {res.text}")
 
@@ -42,17 +211,26 @@ def upload_to_imgbb(image_bytes: bytes) -> str:
     print("🌐 Image hosted at:", image_url)
     return image_url
 
+
 def show_in_browser(url: str):
     """Open the image in the default browser."""
+    if not IMAGE_AUTO_OPEN:
+        return
     print("🖥️ Opening image in browser...")
     webbrowser.open_new_tab(url)
 
+
 if __name__ == "__main__":
     prompt = input("📝 Enter prompt: ")
     try:
-        image_bytes = generate_image(prompt)
-        image_url = upload_to_imgbb(image_bytes)
-        show_in_browser(image_url)
+        image = render_image(prompt)
+        if "--share" in sys.argv:
+            with open(image.path, "rb") as f:
+                show_in_browser(upload_to_imgbb(f.read()))
+        else:
+            show_in_browser(image.url)
         print("✅ Done — image opened in browser!")
+        if "--share" not in sys.argv:
+            input("↩️ Press Enter to stop the local gallery...")
     except Exception as e:
         print("❌ Error:", e)
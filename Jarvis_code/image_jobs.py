@@ -0,0 +1,180 @@
+import asyncio
+import inspect
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when too many image jobs are already waiting."""
+
+
+@dataclass
+class ImageJob:
+    id: str
+    prompt: str
+    params: Dict = field(default_factory=dict)
+    status: str = QUEUED
+    stage: str = "queued"
+    progress: float = 0.0
+    result: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def describe(self) -> str:
+        """Short, speech-friendly status line."""
+        if self.status == QUEUED:
+            return f"⏳ Image job {self.id} queue में है: '{self.prompt}'"
+        if self.status == RUNNING:
+            elapsed = time.time() - (self.started_at or self.created_at)
+            return f"🎨 Image job {self.id} चल रहा है — {self.stage} ({int(self.progress * 100)}%, {elapsed:.0f}s)"
+        if self.status == DONE:
+            return f"✅ Image job {self.id} पूरा हो गया: {self.result}"
+        return f"❌ Image job {self.id} fail हो गया: {self.error}"
+
+
+class ImageJobQueue:
+    """
+    Bounded worker pool for image generation.
+
+    `runner(job, progress)` is a blocking function that does the actual work
+    and returns a result string; it runs in a thread so the voice loop is
+    never blocked. `progress(stage, fraction)` may be called from inside the
+    runner to report intermediate steps.
+
+    Listeners registered with add_listener() are called (on the event loop)
+    every time a job changes state, which is how the agent pushes a
+    follow-up message once an image is ready.
+    """
+
+    def __init__(self, runner: Callable, workers: int = 2, max_pending: int = 8, history: int = 50):
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.history = history
+        self.jobs: "OrderedDict[str, ImageJob]" = OrderedDict()
+        self._listeners: List[Callable] = []
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._done_events: Dict[str, asyncio.Event] = {}
+
+    # --- Listeners ---
+    def add_listener(self, callback: Callable) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, job: ImageJob) -> None:
+        for callback in list(self._listeners):
+            try:
+                result = callback(job)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error(f"❌ Image job listener error: {e}")
+
+    def _notify_threadsafe(self, job: ImageJob) -> None:
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._notify, job)
+
+    # --- Workers ---
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [loop.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"🧵 Image worker pool started with {self.workers} worker(s)")
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ImageJob) -> None:
+        job.status = RUNNING
+        job.stage = "starting"
+        job.started_at = time.time()
+        self._notify(job)
+
+        def progress(stage: str, fraction: float = None):
+            job.stage = stage
+            if fraction is not None:
+                job.progress = max(0.0, min(1.0, fraction))
+            self._notify_threadsafe(job)
+
+        try:
+            job.result = await asyncio.to_thread(self.runner, job, progress)
+            job.status = DONE
+            job.stage = "done"
+            job.progress = 1.0
+        except Exception as e:
+            logger.error(f"❌ Image job {job.id} failed: {e}")
+            job.status = FAILED
+            job.stage = "failed"
+            job.error = str(e)
+        job.finished_at = time.time()
+        logger.info(f"🖼️ Image job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+        event = self._done_events.pop(job.id, None)
+        if event:
+            event.set()
+        self._notify(job)
+
+    # --- Public API ---
+    async def submit(self, prompt: str, **params) -> ImageJob:
+        self._ensure_started()
+        if self._queue.full():
+            raise QueueFullError(f"{self.max_pending} image jobs already waiting")
+
+        job = ImageJob(id=f"img-{next(self._ids)}", prompt=prompt, params=params)
+        self.jobs[job.id] = job
+        self._done_events[job.id] = asyncio.Event()
+        while len(self.jobs) > self.history:
+            old_id, _ = self.jobs.popitem(last=False)
+            self._done_events.pop(old_id, None)
+
+        self._queue.put_nowait(job)
+        self._notify(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ImageJob]:
+        return self.jobs.get(job_id.strip().lower())
+
+    def latest(self) -> Optional[ImageJob]:
+        return next(reversed(self.jobs.values()), None)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[ImageJob]:
+        """Wait until a job finishes (used by scripts and benchmarks)."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        event = self._done_events.get(job.id)
+        if event:
+            await asyncio.wait_for(event.wait(), timeout)
+        return job
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+from lazy_imports import lazy_import
+
+PIL_Image = lazy_import("PIL.Image", optional=True)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+THUMB_SIZE = 256
+
+
+def _sniff_extension(data: bytes) -> str:
+    if data.startswith(b"\x89PNG"):
+        return ".png"
+    if data.startswith(b"\xff\xd8"):
+        return ".jpg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    return ".img"
+
+
+class ImageStore:
+    """
+    Content-addressed local store for generated images.
+
+    Every image is saved under a key derived from prompt + model + params,
+    so asking for the same picture again is a file lookup instead of a new
+    Hugging Face call. Layout on disk:
+
+        <root>/<key[:2]>/<key>.png      original bytes
+        <root>/<key[:2]>/<key>.json     prompt/model/params metadata
+        <root>/thumbs/<key>.jpg         gallery thumbnail (needs Pillow)
+    """
+
+    def __init__(self, root: str = None):
+        self.root = root or os.getenv("IMAGE_STORE_DIR", "generated_images")
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(prompt: str, model: str, params: Optional[Dict] = None) -> str:
+        normalized = " ".join(prompt.split())
+        blob = json.dumps({"prompt": normalized, "model": model, "params": params or {}},
+                          sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _dir_for(self, key: str) -> str:
+        return os.path.join(self.root, key[:2])
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self._dir_for(key), f"{key}.json")
+
+    def _is_key(self, key: str) -> bool:
+        return len(key) == 64 and all(c in "0123456789abcdef" for c in key)
+
+    def meta(self, key: str) -> Optional[Dict]:
+        if not self._is_key(key):
+            return None
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the image path for `key`, or None if it was never generated."""
+        meta = self.meta(key)
+        if not meta:
+            return None
+        path = os.path.join(self._dir_for(key), meta["file"])
+        return path if os.path.exists(path) else None
+
+    def put(self, key: str, data: bytes, prompt: str, model: str, params: Optional[Dict] = None) -> str:
+        folder = self._dir_for(key)
+        os.makedirs(folder, exist_ok=True)
+        filename = f"{key}{_sniff_extension(data)}"
+        path = os.path.join(folder, filename)
+        meta = {
+            "key": key,
+            "file": filename,
+            "prompt": prompt,
+            "model": model,
+            "params": params or {},
+            "bytes": len(data),
+            "created": time.time(),
+        }
+        # write to temp files first so a crash never leaves a half image behind
+        with self._lock:
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            tmp_meta = f"{self._meta_path(key)}.tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_meta, self._meta_path(key))
+        logger.info(f"💾 Image stored: {path}")
+        return path
+
+    def thumbnail(self, key: str, size: int = THUMB_SIZE) -> Optional[str]:
+        """Return a cached JPEG thumbnail path, creating it on first request."""
+        source = self.get(key)
+        if not source:
+            return None
+        thumb_dir = os.path.join(self.root, "thumbs")
+        thumb = os.path.join(thumb_dir, f"{key}_{size}.jpg")
+        if os.path.exists(thumb):
+            return thumb
+        if not PIL_Image:
+            return source  # no Pillow: serve the original
+        os.makedirs(thumb_dir, exist_ok=True)
+        try:
+            with PIL_Image.open(source) as img:
+                img = img.convert("RGB")
+                img.thumbnail((size, size))
+                img.save(f"{thumb}.tmp", "JPEG", quality=85)
+            os.replace(f"{thumb}.tmp", thumb)
+        except Exception as e:
+            logger.error(f"❌ Thumbnail failed for {key}: {e}")
+            return source
+        return thumb
+
+    def entries(self, limit: int = 200) -> List[Dict]:
+        """Metadata of stored images, newest first."""
+        items = []
+        for sub in os.listdir(self.root):
+            folder = os.path.join(self.root, sub)
+            if sub == "thumbs" or not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith(".json"):
+                    meta = self.meta(name[:-5])
+                    if meta:
+                        items.append(meta)
+        items.sort(key=lambda m: m.get("created", 0), reverse=True)
+        return items[:limit]
+
+
+_default_store = None
+
+
+def get_store() -> ImageStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = ImageStore()
+    return _default_store
@@ -0,0 +1,150 @@
+"""
+Import-time profiler for the agent worker.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter,
+parses the per-module timings and prints the most expensive imports.
+Exits with status 1 if the startup budget is exceeded or if one of the
+"lazy only" modules got imported eagerly.
+
+Usage:
+    python import_profile.py                      # profile agent.py
+    python import_profile.py --budget-ms 1500 --top 30
+    python import_profile.py --module Jarvis_window_CTRL --forbid requests
+
+The budget can also be set with the VYAAS_IMPORT_BUDGET_MS env variable.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+DEFAULT_MODULE = "agent"
+DEFAULT_BUDGET_MS = float(os.getenv("VYAAS_IMPORT_BUDGET_MS", "2500"))
+
+# These are only needed when a desktop tool actually runs
+DEFAULT_FORBIDDEN = ["pyautogui", "pynput", "fuzzywuzzy", "win32gui", "pygetwindow"]
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse the `import time:` lines written by `-X importtime`."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_col, cum_col, name_col = parts
+        if not self_col.strip().isdigit():
+            continue  # header line
+        stripped = name_col.lstrip(" ")
+        # importtime indents nested imports by two spaces per level
+        depth = (len(name_col) - len(stripped) - 1) // 2
+        records.append(ImportRecord(
+            name=stripped.strip(),
+            self_us=int(self_col.strip()),
+            cumulative_us=int(cum_col.strip()),
+            depth=depth,
+        ))
+    return records
+
+
+def run_importtime(module: str, python: str = sys.executable, cwd: Optional[str] = None) -> str:
+    cmd = [python, "-X", "importtime", "-c", f"import {module}"]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    if proc.returncode != 0:
+        # the traceback follows the timing lines, show only the tail
+        tail = "\n".join(proc.stderr.strip().splitlines()[-15:])
+        raise RuntimeError(f"`import {module}` failed:\n{tail}")
+    return proc.stderr
+
+
+def module_cost_us(records: List[ImportRecord], module: str) -> int:
+    for rec in records:
+        if rec.name == module and rec.depth == 0:
+            return rec.cumulative_us
+    return sum(rec.cumulative_us for rec in records if rec.depth == 0)
+
+
+def find_forbidden(records: List[ImportRecord], forbidden: List[str]) -> List[ImportRecord]:
+    hits = []
+    for rec in records:
+        root = rec.name.split(".")[0]
+        if root in forbidden and rec.name == root:
+            hits.append(rec)
+    return hits
+
+
+def report(records: List[ImportRecord], module: str, top: int) -> None:
+    total_ms = module_cost_us(records, module) / 1000.0
+    print(f"📦 import {module}: {total_ms:.1f} ms total, {len(records)} modules loaded\n")
+
+    print(f"{'self ms':>9} {'cum ms':>9}  module")
+    by_self = sorted(records, key=lambda r: r.self_us, reverse=True)[:top]
+    for rec in by_self:
+        print(f"{rec.self_us / 1000.0:9.1f} {rec.cumulative_us / 1000.0:9.1f}  {rec.name}")
+
+    # Cost grouped by top-level package is usually what you act on
+    packages = {}
+    for rec in records:
+        root = rec.name.split(".")[0]
+        packages[root] = packages.get(root, 0) + rec.self_us
+    print(f"\n{'pkg ms':>9}  package")
+    for root, us in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"{us / 1000.0:9.1f}  {root}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile and budget the agent's import time.")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="module to import (default: agent)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="fail if importing the module takes longer than this")
+    parser.add_argument("--top", type=int, default=20, help="how many entries to print")
+    parser.add_argument("--forbid", action="append", default=None,
+                        help="package that must not be imported eagerly (repeatable)")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="import several times and keep the fastest run")
+    args = parser.parse_args(argv)
+
+    forbidden = args.forbid if args.forbid is not None else DEFAULT_FORBIDDEN
+    cwd = os.path.dirname(os.path.abspath(__file__))
+
+    best = None
+    for _ in range(max(1, args.runs)):
+        try:
+            records = parse_importtime(run_importtime(args.module, cwd=cwd))
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return 2
+        if best is None or module_cost_us(records, args.module) < module_cost_us(best, args.module):
+            best = records
+
+    report(best, args.module, args.top)
+
+    failed = False
+    total_ms = module_cost_us(best, args.module) / 1000.0
+    if total_ms > args.budget_ms:
+        print(f"\n❌ Startup budget exceeded: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    else:
+        print(f"\n✅ Within startup budget: {total_ms:.1f} ms <= {args.budget_ms:.1f} ms")
+
+    for rec in find_forbidden(best, forbidden):
+        print(f"❌ '{rec.name}' is imported eagerly ({rec.cumulative_us / 1000.0:.1f} ms); load it on first use")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Set
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class InputExecutor:
+    """
+    Runs blocking mouse/keyboard calls on one dedicated OS thread.
+
+    pynput and pyautogui calls block (dragTo with a duration, key presses,
+    clipboard access), so they must never run on the agent's asyncio loop.
+    Everything submitted here executes in FIFO order on a single thread,
+    which also keeps input events from different tools from interleaving.
+
+    run() returns an awaitable; cancelling it drops the action if it has not
+    started yet. cancel_pending() drops everything still queued.
+    """
+
+    def __init__(self, name: str = "input"):
+        self.name = name
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        future = self._pool.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Queue `fn` on the input thread and await its result."""
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()  # only succeeds if it has not started yet
+            raise
+
+    def cancel_pending(self) -> int:
+        """Drop all queued (not yet running) actions; returns how many were dropped."""
+        with self._lock:
+            pending = list(self._pending)
+        dropped = sum(1 for future in pending if future.cancel())
+        if dropped:
+            logger.info(f"🧹 Dropped {dropped} queued input action(s)")
+        return dropped
+
+    @property
+    def queued(self) -> int:
+        with self._lock:
+            return sum(1 for future in self._pending if not future.running())
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+input_executor = InputExecutor()
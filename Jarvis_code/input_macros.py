@@ -0,0 +1,332 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tool_metrics import metered_tool
+
+import keyboard_mouse_CTRL as kmc
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MACRO_FILE = os.getenv("MACRO_FILE", "input_macros.json")
+MAX_MACRO_STEPS = 200
+MACRO_MAX_GAP = float(os.getenv("MACRO_MAX_GAP", "1.0"))   # longest pause kept on replay (seconds)
+
+
+@dataclass
+class Macro:
+    name: str
+    # (delay before the step in ms, step string in the run_input_sequence format)
+    steps: List[Tuple[int, str]] = field(default_factory=list)
+    created: float = field(default_factory=time.time)
+
+    @property
+    def slug(self) -> str:
+        return macro_slug(self.name)
+
+
+def macro_slug(name: str) -> str:
+    """'Morning Setup!' -> 'morning_setup' (used for tool names and lookups)."""
+    return re.sub(r"[^a-z0-9]+", "_", name.strip().lower()).strip("_")
+
+
+class MacroStore:
+    """
+    Named input macros kept in one compact JSON file.
+
+    File layout: {"v": 1, "macros": {"<slug>": {"name": ..., "created": ...,
+    "steps": [[delay_ms, "step"], ...]}}}. Steps use the same strings as
+    run_input_sequence, so anything a macro does can also be dictated.
+    Listeners are called with the store after every save/delete.
+    """
+
+    def __init__(self, path: str = MACRO_FILE):
+        self.path = path
+        self._macros: Optional[Dict[str, Macro]] = None
+        self._listeners: List[Callable] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: Callable) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self) -> None:
+        for callback in list(self._listeners):
+            try:
+                result = callback(self)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error(f"❌ Macro listener error: {e}")
+
+    def _load(self) -> Dict[str, Macro]:
+        if self._macros is None:
+            macros = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for slug, item in data.get("macros", {}).items():
+                    macros[slug] = Macro(item["name"], [tuple(s) for s in item["steps"]], item.get("created", 0))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"❌ Macro file could not be read: {e}")
+            self._macros = macros
+        return self._macros
+
+    def _save(self) -> None:
+        data = {"v": 1, "macros": {
+            slug: {"name": m.name, "created": round(m.created), "steps": [list(s) for s in m.steps]}
+            for slug, m in self._load().items()
+        }}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def all(self) -> List[Macro]:
+        with self._lock:
+            return sorted(self._load().values(), key=lambda m: m.name.lower())
+
+    def get(self, name: str) -> Optional[Macro]:
+        with self._lock:
+            return self._load().get(macro_slug(name))
+
+    def put(self, macro: Macro) -> None:
+        with self._lock:
+            self._load()[macro.slug] = macro
+            self._save()
+        self._notify()
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            removed = self._load().pop(macro_slug(name), None) is not None
+            if removed:
+                self._save()
+        if removed:
+            self._notify()
+        return removed
+
+
+class MacroRecorder:
+    """Captures successful top-level SafeController actions while a recording is open."""
+
+    def __init__(self):
+        self.macro: Optional[Macro] = None
+        self._last = 0.0
+
+    @property
+    def recording(self) -> bool:
+        return self.macro is not None
+
+    def start(self, name: str) -> None:
+        self.macro = Macro(name)
+        self._last = time.monotonic()
+        if self._capture not in kmc.action_listeners:
+            kmc.action_listeners.append(self._capture)
+
+    def stop(self) -> Optional[Macro]:
+        macro, self.macro = self.macro, None
+        if self._capture in kmc.action_listeners:
+            kmc.action_listeners.remove(self._capture)
+        return macro
+
+    def _capture(self, action: str, args: tuple, kwargs: dict, result: str) -> None:
+        if self.macro is None or result.startswith(("❌", "🛑")):
+            return
+        step = kmc.format_input_step(action, args, kwargs)
+        if step is None or len(self.macro.steps) >= MAX_MACRO_STEPS:
+            return
+        now = time.monotonic()
+        delay = 0 if not self.macro.steps else round((now - self._last) * 1000)
+        self.macro.steps.append((delay, step))
+        self._last = now
+
+
+def replay_plan(macro: Macro, speed: float = 1.0, max_gap: float = MACRO_MAX_GAP) -> List[Tuple[str, tuple]]:
+    """
+    Parsed steps with the recorded pauses turned into waits.
+
+    Pauses are divided by `speed` and capped at `max_gap` seconds, which
+    squeezes out the think/round-trip time captured while dictating.
+    speed <= 0 drops the pauses entirely.
+    """
+    parsed = []
+    for delay, step in macro.steps:
+        if speed > 0 and delay > 0:
+            wait = min(delay / 1000.0 / speed, max_gap, kmc.MAX_STEP_WAIT)
+            if wait >= 0.01:
+                parsed.append(("wait", (round(wait, 3),)))
+        parsed.append(kmc.parse_input_step(step))
+    return parsed
+
+
+store = MacroStore()
+recorder = MacroRecorder()
+
+
+async def play(name: str, speed: float = 1.0) -> str:
+    if recorder.recording:
+        return "⚠ Recording chal rahi hai — pehle stop_macro_recording karo."
+    macro = store.get(name)
+    if macro is None:
+        return f"❌ Macro '{name}' नहीं मिला।"
+    try:
+        parsed = replay_plan(macro, speed)
+    except ValueError as e:
+        return f"❌ Macro '{macro.name}' is damaged: {e}"
+    start = time.perf_counter()
+    results = await kmc.run_input_steps(parsed)
+    failed = [r for r in results if r.startswith(("❌", "🛑"))]
+    elapsed = time.perf_counter() - start
+    if failed:
+        return f"⚠ Macro '{macro.name}' stopped: {failed[0]}"
+    return f"✅ Macro '{macro.name}' done — {len(macro.steps)} steps in {elapsed:.1f}s"
+
+
+# --- Tools ---
+_macro_tools: Dict[str, Tuple[int, Callable]] = {}
+
+
+def macro_tool(macro: Macro) -> Callable:
+    """A dedicated function tool (macro_<slug>) that replays one saved macro."""
+    cached = _macro_tools.get(macro.slug)
+    if cached and cached[0] == id(macro):
+        return cached[1]
+
+    async def run_macro(speed: float = 1.0) -> str:
+        return await play(macro.name, speed)
+
+    tool = metered_tool(
+        name=f"macro_{macro.slug}"[:64],
+        description=(f"Replays the saved desktop macro '{macro.name}' ({len(macro.steps)} steps) in one go. "
+                     f"Use it when the user asks for '{macro.name}'. "
+                     "Args: speed (float, optional) — 2 = twice as fast, 0 = no pauses."),
+    )(run_macro)
+    _macro_tools[macro.slug] = (id(macro), tool)
+    return tool
+
+
+def macro_tools() -> List[Callable]:
+    return [macro_tool(m) for m in store.all()]
+
+
+@metered_tool()
+async def start_macro_recording(name: str) -> str:
+
+    """
+    Starts recording the user's mouse/keyboard actions as a named macro.
+
+    Use this when the user says something like: "macro record karo 'morning setup' naam se"
+    or "ye steps yaad rakho". Every input action after this is recorded until
+    stop_macro_recording is called.
+
+    Args:
+        name (str): Name for the macro, e.g. "morning setup".
+
+    Returns:
+        str: Confirmation that recording started.
+    """
+
+
+    if not macro_slug(name):
+        return "❌ Macro ka naam chahiye."
+    if recorder.recording:
+        return f"⚠ Already recording '{recorder.macro.name}'. Pehle usko stop karo."
+    recorder.start(name.strip())
+    logger.info(f"⏺️ Macro recording started: {name}")
+    return f"⏺️ Recording macro '{name.strip()}' — ab jo actions karoge woh save honge."
+
+
+@metered_tool()
+async def stop_macro_recording() -> str:
+
+    """
+    Stops the current macro recording and saves it.
+
+    Use this when the user says: "recording band karo", "macro save karo" or "bas itna hi".
+
+    Returns:
+        str: How many steps were saved.
+    """
+
+
+    macro = recorder.stop()
+    if macro is None:
+        return "❌ Koi recording chal nahi rahi."
+    if not macro.steps:
+        return f"⚠ Macro '{macro.name}' me koi action record nahi hua, save nahi kiya."
+    store.put(macro)
+    logger.info(f"💾 Macro saved: {macro.name} ({len(macro.steps)} steps)")
+    return f"💾 Macro '{macro.name}' saved with {len(macro.steps)} steps."
+
+
+@metered_tool()
+async def play_macro(name: str, speed: float = 1.0) -> str:
+
+    """
+    Replays a saved macro by name.
+
+    Use this when the user says: "morning setup chalao" or "wo macro 2x speed me chalao".
+
+    Args:
+        name (str): The macro name.
+        speed (float, optional): Time compression: 2 = twice as fast, 0 = no pauses. Defaults to 1.
+
+    Returns:
+        str: Result of the replay.
+    """
+
+
+    return await play(name, speed)
+
+
+@metered_tool()
+async def list_macros() -> str:
+
+    """
+    Lists the saved macros.
+
+    Use this when the user asks: "kaun kaun se macros hain?"
+
+    Returns:
+        str: Macro names with step counts.
+    """
+
+
+    macros = store.all()
+    if not macros:
+        return "📭 Abhi koi macro saved nahi hai."
+    return "📼 Macros: " + ", ".join(f"{m.name} ({len(m.steps)} steps)" for m in macros)
+
+
+@metered_tool()
+async def delete_macro(name: str) -> str:
+
+    """
+    Deletes a saved macro.
+
+    Use this when the user says: "morning setup macro delete karo".
+
+    Args:
+        name (str): The macro name.
+
+    Returns:
+        str: Whether the macro was deleted.
+    """
+
+
+    if store.delete(name):
+        return f"🗑️ Macro '{name}' deleted."
+    return f"❌ Macro '{name}' नहीं मिला।"
@@ -1,8 +1,12 @@
 import os
-import requests
+import asyncio
 import logging
 from dotenv import load_dotenv
-from livekit.agents import function_tool  # ✅ Correct decorator
+from tool_metrics import metered_tool
+from lazy_imports import lazy_import
+import resilience
+
+requests = lazy_import("requests")
 
 load_dotenv()
 
@@ -10,15 +14,23 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Overridable so the tool can be pointed at a local mock server
+OPENWEATHER_URL = os.getenv("OPENWEATHER_URL", "https://api.openweathermap.org/data/2.5/weather")
+IPINFO_URL = os.getenv("IPINFO_URL", "https://ipinfo.io")
+
+# Bounded time budgets; hedged retry once a call is slower than p95
+weather_endpoint = resilience.endpoint("openweather", timeout=5.0, hedge=True)
+ipinfo_endpoint = resilience.endpoint("ipinfo", timeout=3.0, hedge=True)
+
 def detect_city_by_ip() -> str:
     try:
-        response = requests.get("https://ipinfo.io", timeout=5)
+        response = ipinfo_endpoint.call_sync(requests.get, IPINFO_URL, timeout=ipinfo_endpoint.timeout)
         data = response.json()
         return data.get("city", "Unknown")
     except Exception as e:
         return "Unknown"
 
-@function_tool()
+@metered_tool()
 async def get_weather(city: str = "") -> str:
 
     """
@@ -42,10 +54,10 @@ async def get_weather(city: str = "") -> str:
         return "Environment variables में OpenWeather API key नहीं मिली।"
 
     if not city:
-        city = detect_city_by_ip()
+        city = await asyncio.to_thread(detect_city_by_ip)
 
     logger.info(f"City के लिए weather fetch किया जा रहा है।: {city}")
-    url = "https://api.openweathermap.org/data/2.5/weather"
+    url = OPENWEATHER_URL
     params = {
         "q": city,
         "appid": api_key,
@@ -53,7 +65,7 @@ async def get_weather(city: str = "") -> str:
     }
 
     try:
-        response = requests.get(url, params=params)
+        response = await weather_endpoint.call(requests.get, url, params=params, timeout=weather_endpoint.timeout)
         if response.status_code != 200:
             logger.error(f"OpenWeather API में error आया।: {response.status_code} - {response.text}")
             return f"Error: {city} के लिए weather fetch नहीं कर पाए। कृपया city name चेक करें।"
@@ -73,6 +85,14 @@ async def get_weather(city: str = "") -> str:
         logger.info(f"Weather result: \n{result}")
         return result
 
+    except resilience.CircuitOpenError:
+        logger.warning("OpenWeather circuit open, request skip की गई।")
+        return "Weather service अभी respond नहीं कर रही है, थोड़ी देर बाद फिर से पूछें।"
+
+    except resilience.EndpointTimeout as e:
+        logger.error(f"Weather request timed out: {e}")
+        return "Weather service ने समय पर जवाब नहीं दिया।"
+
     except Exception as e:
         logger.exception(f"Weather fetch करते समय exception आया: {e}")
         return "Weather fetch करते समय एक error आया"
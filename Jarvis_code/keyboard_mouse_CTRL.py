@@ -1,11 +1,76 @@
-import pyautogui
+import os
+import sys
 import asyncio
 import time
-from datetime import datetime
-from pynput.keyboard import Key, Controller as KeyboardController
-from pynput.mouse import Button, Controller as MouseController
-from typing import List
-from livekit.agents import function_tool
+import functools
+import contextvars
+from typing import List, Tuple
+from tool_metrics import metered_tool
+from lazy_imports import lazy_import
+from input_executor import input_executor
+from action_log import action_log, timed
+import cursor_motion
+
+# Heavy input libraries are only imported when the first action runs
+pyautogui = lazy_import("pyautogui")
+pynput_keyboard = lazy_import("pynput.keyboard")
+pynput_mouse = lazy_import("pynput.mouse")
+pyperclip = lazy_import("pyperclip", optional=True)
+
+SPECIAL_KEY_NAMES = {
+    "enter": "enter", "space": "space", "tab": "tab",
+    "shift": "shift", "ctrl": "ctrl", "alt": "alt",
+    "esc": "esc", "backspace": "backspace", "delete": "delete",
+    "up": "up", "down": "down", "left": "left", "right": "right",
+    "caps_lock": "caps_lock", "cmd": "cmd", "win": "cmd",
+    "home": "home", "end": "end",
+    "page_up": "page_up", "page_down": "page_down"
+}
+
+# How long the controller stays active after the last action (seconds)
+LEASE_SECONDS = float(os.getenv("INPUT_LEASE_SECONDS", "5"))
+
+# Typing strategies: "keys" (one key at a time), "bulk" (pynput type, rate-limited),
+# "paste" (clipboard + Ctrl+V, previous clipboard restored) or "auto".
+TYPE_KEY_DELAY = float(os.getenv("TYPE_KEY_DELAY", "0.05"))
+TYPE_RATE = float(os.getenv("TYPE_RATE", "300"))          # chars/sec for bulk, 0 = unthrottled
+TYPE_CHUNK = 16
+PASTE_THRESHOLD = int(os.getenv("TYPE_PASTE_THRESHOLD", "40"))
+PASTE_SETTLE = 0.15                                        # let the target app read the clipboard
+TYPE_STRATEGIES = ("auto", "keys", "bulk", "paste")
+
+# Called as listener(action_name, args, kwargs, result) after each top-level
+# controller action (actions called from inside other actions are skipped);
+# the macro recorder hooks in here.
+action_listeners = []
+_action_depth = contextvars.ContextVar("action_depth", default=0)
+
+
+def logged_action(fn):
+    """Record every controller action with its args, result and latency (ms)."""
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        result, error = None, None
+        depth = _action_depth.set(_action_depth.get() + 1)
+        try:
+            result = await fn(self, *args, **kwargs)
+            return result
+        except Exception as e:
+            error = repr(e)
+            raise
+        finally:
+            _action_depth.reset(depth)
+            action_log.write("action", action=fn.__name__, args=list(args) or None,
+                             kwargs=kwargs or None, result=result, error=error,
+                             latency_ms=timed(start))
+            if _action_depth.get() == 0 and result is not None:
+                for listener in list(action_listeners):
+                    try:
+                        listener(fn.__name__, args, kwargs, result)
+                    except Exception as e:
+                        action_log.write("listener_error", action=fn.__name__, error=repr(e))
+    return wrapper
 
 # ---------------------
 # SafeController Class
@@ -14,125 +79,269 @@ class SafeController:
     def __init__(self):
         self.active = False
         self.activation_time = None
-        self.keyboard = KeyboardController()
-        self.mouse = MouseController()
+        self.lease_expires = 0.0
+        self._keyboard = None
+        self._mouse = None
+        self._special_keys = None
+        self.motion = cursor_motion.MotionPlayer()
         self.valid_keys = set("abcdefghijklmnopqrstuvwxyz1234567890")
-        self.special_keys = {
-            "enter": Key.enter, "space": Key.space, "tab": Key.tab,
-            "shift": Key.shift, "ctrl": Key.ctrl, "alt": Key.alt,
-            "esc": Key.esc, "backspace": Key.backspace, "delete": Key.delete,
-            "up": Key.up, "down": Key.down, "left": Key.left, "right": Key.right,
-            "caps_lock": Key.caps_lock, "cmd": Key.cmd, "win": Key.cmd,
-            "home": Key.home, "end": Key.end,
-            "page_up": Key.page_up, "page_down": Key.page_down
-        }
+
+    @property
+    def keyboard(self):
+        if self._keyboard is None:
+            self._keyboard = pynput_keyboard.Controller()
+        return self._keyboard
+
+    @property
+    def mouse(self):
+        if self._mouse is None:
+            self._mouse = pynput_mouse.Controller()
+        return self._mouse
+
+    @property
+    def special_keys(self):
+        if self._special_keys is None:
+            Key = pynput_keyboard.Key
+            self._special_keys = {name: getattr(Key, attr) for name, attr in SPECIAL_KEY_NAMES.items()}
+        return self._special_keys
 
     def resolve_key(self, key):
         return self.special_keys.get(key.lower(), key)
 
-    def log(self, action: str):
-        with open("control_log.txt", "a") as f:
-            f.write(f"{datetime.now()}: {action}\n")
+    def log(self, message: str, **fields):
+        action_log.write("controller", message=message, **fields)
 
-    def activate(self, token=None):
+    def activate(self, token=None, lease: float = LEASE_SECONDS):
+        """Start (or extend) a time-limited activation lease."""
         if token != "my_secret_token":
             self.log("Activation attempt failed.")
             return
-        self.active = True
-        self.activation_time = time.time()
-        self.log("Controller auto-activated.")
-
-    def deactivate(self):
+        now = time.time()
+        if not self.is_active():
+            self.active = True
+            self.activation_time = now
+            self.log("Controller auto-activated.")
+        self.lease_expires = max(self.lease_expires, now + lease)
+
+    def touch(self, lease: float = LEASE_SECONDS):
+        """Restart the idle timer after an action; no-op if the lease is gone."""
+        if self.active:
+            self.lease_expires = time.time() + lease
+
+    def deactivate(self, reason: str = "Controller auto-deactivated."):
         self.active = False
-        self.log("Controller auto-deactivated.")
+        self.lease_expires = 0.0
+        self.motion.cancel()
+        input_executor.cancel_pending()  # nothing queued may fire after the lease ends
+        self.log(reason)
 
     def is_active(self):
+        if self.active and time.time() >= self.lease_expires:
+            self.deactivate("Controller lease expired.")
         return self.active
 
+    async def _run(self, fn, *args):
+        # every pynput/pyautogui call goes through the single input thread
+        return await input_executor.run(fn, *args)
+
+    def _screen_size(self):
+        return tuple(pyautogui.size())
+
+    async def screen_size(self):
+        return await self._run(self._screen_size)
+
+    def _glide_sync(self, target, relative: bool, duration, easing: str):
+        # runs on the input thread: read position, plan, then play frame by frame
+        start = tuple(int(v) for v in self.mouse.position)
+        screen = self._screen_size()
+        end = (start[0] + target[0], start[1] + target[1]) if relative else target
+        end = cursor_motion.clamp((int(end[0]), int(end[1])), screen)
+        if duration is None:
+            duration = cursor_motion.motion_duration(start, end)
+        duration = min(max(duration, 0.0), cursor_motion.MOTION_MAX_SECONDS * 4)
+        if duration == 0 or start == end:
+            self.mouse.position = end
+            return end
+        hz = cursor_motion.refresh_rate()
+        points = cursor_motion.plan_path(start, end, duration, hz, easing)
+        return self.motion.play(lambda p: setattr(self.mouse, "position", p), points, hz) or start
+
+    def _relative_sync(self, direction: str, distance: int, duration, easing: str):
+        start = tuple(int(v) for v in self.mouse.position)
+        end = cursor_motion.relative_target(start, direction, distance)
+        return self._glide_sync(end, False, duration, easing)
+
+    @logged_action
     async def move_cursor(self, direction: str, distance: int = 100):
         if not self.is_active(): return "🛑 Controller is inactive."
-        x, y = self.mouse.position
-        if direction == "left": self.mouse.position = (x - distance, y)
-        elif direction == "right": self.mouse.position = (x + distance, y)
-        elif direction == "up": self.mouse.position = (x, y - distance)
-        elif direction == "down": self.mouse.position = (x, y + distance)
-        await asyncio.sleep(0.2)
-        self.log(f"Mouse moved {direction}")
+        if direction not in cursor_motion.DIRECTION_VECTORS:
+            return f"❌ Invalid direction: {direction}"
+        await self._run(self._relative_sync, direction, distance, None, "ease_out")
         return f"🖱️ Moved mouse {direction}."
 
-    async def mouse_click(self, button: str = "left"):
+    @logged_action
+    async def move_to(self, x: int, y: int, duration: float = None, easing: str = "ease_in_out"):
+        """Glide to absolute screen coordinates (clamped to the screen)."""
         if not self.is_active(): return "🛑 Controller is inactive."
+        x, y = await self._run(self._glide_sync, (x, y), False, duration, easing)
+        return f"🖱️ Mouse at ({x}, {y})."
+
+    @logged_action
+    async def move_by(self, dx: int, dy: int, duration: float = None, easing: str = "ease_in_out"):
+        """Glide by an arbitrary pixel offset (any direction)."""
+        if not self.is_active(): return "🛑 Controller is inactive."
+        x, y = await self._run(self._glide_sync, (dx, dy), True, duration, easing)
+        return f"🖱️ Mouse at ({x}, {y})."
+
+    @logged_action
+    async def move_to_anchor(self, name: str, duration: float = None):
+        """Glide to a named spot such as "center" or "top-right"."""
+        if not self.is_active(): return "🛑 Controller is inactive."
+        if name not in cursor_motion.ANCHORS:
+            return f"❌ Unknown screen position: {name}"
+        screen = await self.screen_size()
+        return await self.move_to(*cursor_motion.anchor_point(name, screen), duration=duration)
+
+    def _click_sync(self, button: str):
+        Button = pynput_mouse.Button
         if button == "left": self.mouse.click(Button.left, 1)
         elif button == "right": self.mouse.click(Button.right, 1)
         elif button == "double": self.mouse.click(Button.left, 2)
-        await asyncio.sleep(0.2)
-        self.log(f"Mouse clicked: {button}")
-        return f"🖱️ {button.capitalize()} click."
 
-    async def scroll_cursor(self, direction: str, amount: int = 10):
+    @logged_action
+    async def mouse_click(self, button: str = "left"):
         if not self.is_active(): return "🛑 Controller is inactive."
+        await self._run(self._click_sync, button)
+        return f"🖱️ {button.capitalize()} click."
+
+    def _scroll_sync(self, direction: str, amount: int):
         try:
             if direction == "up": self.mouse.scroll(0, amount)
             elif direction == "down": self.mouse.scroll(0, -amount)
         except:
             pyautogui.scroll(amount * 100)
-        await asyncio.sleep(0.2)
-        self.log(f"Mouse scrolled {direction}")
-        return f"🖱️ Scrolled {direction}"
 
-    async def type_text(self, text: str):
+    @logged_action
+    async def scroll_cursor(self, direction: str, amount: int = 10):
         if not self.is_active(): return "🛑 Controller is inactive."
+        await self._run(self._scroll_sync, direction, amount)
+        return f"🖱️ Scrolled {direction}"
+
+    def pick_type_strategy(self, text: str) -> str:
+        # long text: one paste beats hundreds of key events
+        if len(text) >= PASTE_THRESHOLD and pyperclip:
+            return "paste"
+        return "bulk"
+
+    def _tap_sync(self, key):
+        try:
+            self.keyboard.press(key)
+            self.keyboard.release(key)
+        except Exception:
+            pass
+
+    async def _type_keys(self, text: str):
+        # one queued job per key, so a cancelled tool stops between keys
         for char in text:
-            if not char.isprintable():
-                continue
+            await self._run(self._tap_sync, char)
+            await asyncio.sleep(TYPE_KEY_DELAY)
+
+    def _type_chunk_sync(self, chunk: str):
+        self.keyboard.type(chunk)
+
+    async def _type_bulk(self, text: str):
+        # pynput's type() sends the whole chunk; sleeping between chunks
+        # keeps the effective rate at TYPE_RATE so slow apps don't drop keys
+        for i in range(0, len(text), TYPE_CHUNK):
+            chunk = text[i:i + TYPE_CHUNK]
+            await self._run(self._type_chunk_sync, chunk)
+            if TYPE_RATE > 0:
+                await asyncio.sleep(len(chunk) / TYPE_RATE)
+
+    def _paste_sync(self, text: str):
+        try:
+            previous = pyperclip.paste()
+        except Exception:
+            previous = None
+        pyperclip.copy(text)
+        try:
+            modifier = self.special_keys["cmd" if sys.platform == "darwin" else "ctrl"]
+            with self.keyboard.pressed(modifier):
+                self.keyboard.press("v")
+                self.keyboard.release("v")
+            time.sleep(PASTE_SETTLE)  # on the input thread, not the event loop
+        finally:
+            if previous is not None:
+                pyperclip.copy(previous)
+
+    @logged_action
+    async def type_text(self, text: str, strategy: str = "auto"):
+        if not self.is_active(): return "🛑 Controller is inactive."
+        if strategy not in TYPE_STRATEGIES:
+            return f"❌ Unknown typing strategy: {strategy}"
+        text = "".join(char for char in text if char.isprintable())
+        if strategy == "auto":
+            strategy = self.pick_type_strategy(text)
+        if strategy == "paste" and not pyperclip:
+            strategy = "bulk"
+
+        if strategy == "paste":
             try:
-                self.keyboard.press(char)
-                self.keyboard.release(char)
-                await asyncio.sleep(0.05)
-            except Exception:
-                continue
-        self.log(f"Typed text: {text}")
+                await self._run(self._paste_sync, text)
+            except Exception as e:
+                # e.g. no clipboard backend (xclip/xsel) on Linux
+                self.log("Paste failed, typing instead.", error=str(e))
+                strategy = "bulk"
+                await self._type_bulk(text)
+        elif strategy == "bulk":
+            await self._type_bulk(text)
+        else:
+            await self._type_keys(text)
         return f"⌨️ Typed: {text}"
 
+    def _press_sync(self, key: str):
+        k = self.resolve_key(key)
+        self.keyboard.press(k)
+        self.keyboard.release(k)
+
+    @logged_action
     async def press_key(self, key: str):
         if not self.is_active(): return "🛑 Controller is inactive."
-        if key.lower() not in self.special_keys and key.lower() not in self.valid_keys:
+        if key.lower() not in SPECIAL_KEY_NAMES and key.lower() not in self.valid_keys:
             return f"❌ Invalid key: {key}"
-        k = self.resolve_key(key)
         try:
-            self.keyboard.press(k)
-            self.keyboard.release(k)
+            await self._run(self._press_sync, key)
         except Exception as e:
             return f"❌ Failed key: {key} — {e}"
-        await asyncio.sleep(0.2)
-        self.log(f"Pressed key: {key}")
         return f"⌨️ Key '{key}' pressed."
 
+    def _hotkey_sync(self, keys: List[str]):
+        resolved = [self.resolve_key(k) for k in keys]
+        for k in resolved: self.keyboard.press(k)
+        for k in reversed(resolved): self.keyboard.release(k)
+
+    @logged_action
     async def press_hotkey(self, keys: List[str]):
         if not self.is_active(): return "🛑 Controller is inactive."
-        resolved = []
         for k in keys:
-            if k.lower() not in self.special_keys and k.lower() not in self.valid_keys:
+            if k.lower() not in SPECIAL_KEY_NAMES and k.lower() not in self.valid_keys:
                 return f"❌ Invalid key in hotkey: {k}"
-            resolved.append(self.resolve_key(k))
 
-        for k in resolved: self.keyboard.press(k)
-        for k in reversed(resolved): self.keyboard.release(k)
-        await asyncio.sleep(0.3)
-        self.log(f"Pressed hotkey: {' + '.join(keys)}")
+        await self._run(self._hotkey_sync, keys)
         return f"⌨️ Hotkey {' + '.join(keys)} pressed."
 
-    async def control_volume(self, action: str):
-        if not self.is_active(): return "🛑 Controller is inactive."
+    def _volume_sync(self, action: str):
         if action == "up": pyautogui.press("volumeup")
         elif action == "down": pyautogui.press("volumedown")
         elif action == "mute": pyautogui.press("volumemute")
-        await asyncio.sleep(0.2)
-        self.log(f"Volume control: {action}")
-        return f"🔊 Volume {action}."
 
-    async def swipe_gesture(self, direction: str):
+    @logged_action
+    async def control_volume(self, action: str):
         if not self.is_active(): return "🛑 Controller is inactive."
+        await self._run(self._volume_sync, action)
+        return f"🔊 Volume {action}."
+
+    def _swipe_sync(self, direction: str):
         screen_width, screen_height = pyautogui.size()
         x, y = screen_width // 2, screen_height // 2
         try:
@@ -142,41 +351,234 @@ class SafeController:
             elif direction == "right": pyautogui.moveTo(x - 200, y); pyautogui.dragTo(x + 200, y, duration=0.5)
         except Exception:
             pass
-        await asyncio.sleep(0.5)
-        self.log(f"Swipe gesture: {direction}")
+
+    @logged_action
+    async def swipe_gesture(self, direction: str):
+        if not self.is_active(): return "🛑 Controller is inactive."
+        await self._run(self._swipe_sync, direction)
         return f"🖱️ Swipe {direction} done."
 
 controller = SafeController()
 
 async def with_temporary_activation(fn, *args, **kwargs):
+    # The lease stays open across back-to-back actions and lapses after
+    # LEASE_SECONDS of idle time, so no fixed sleep is needed here.
     print(f"🔍 TEMP ACTIVATION: {fn.__name__} | args: {args}")
     controller.activate("my_secret_token")
-    result = await fn(*args, **kwargs)
-    await asyncio.sleep(2)
-    controller.deactivate()
-    return result
+    try:
+        return await fn(*args, **kwargs)
+    finally:
+        controller.touch()
+
+# ---------------------
+# Input sequences (one tool call, many actions)
+# ---------------------
+MAX_SEQUENCE_STEPS = 25
+MAX_STEP_WAIT = 5.0
+
+DIRECTIONS = ("up", "down", "left", "right")
 
-@function_tool()
+
+def _is_valid_key(key: str) -> bool:
+    return key.lower() in SPECIAL_KEY_NAMES or key.lower() in controller.valid_keys
+
+
+def parse_input_step(step: str) -> Tuple[str, tuple]:
+    """
+    Turn one step string into (action, args). Raises ValueError if invalid.
+
+    Step format:
+        move:<direction>[:pixels]            moveto:<x>:<y> | moveto:<center|top-left|...>
+        moveby:<dx>:<dy>
+        click[:left|right|double]
+        scroll:<up|down>[:amount]            type:<text>
+        key:<name>                           hotkey:<key>+<key>[+...]
+        volume:<up|down|mute>                swipe:<up|down|left|right>
+        wait:<seconds>
+    """
+    action, _, rest = step.strip().partition(":")
+    action = action.strip().lower()
+
+    if action == "type":
+        if not rest:
+            raise ValueError("type needs text, e.g. 'type:hello'")
+        return "type", (rest,)
+
+    parts = [p.strip().lower() for p in rest.split(":")] if rest else []
+    if action == "move":
+        if not parts or parts[0] not in cursor_motion.DIRECTION_VECTORS:
+            raise ValueError(f"move needs a direction {tuple(cursor_motion.DIRECTION_VECTORS)}")
+        distance = int(parts[1]) if len(parts) > 1 else 100
+        return "move", (parts[0], distance)
+    if action == "moveto":
+        if len(parts) == 1 and parts[0] in cursor_motion.ANCHORS:
+            return "anchor", (parts[0],)
+        if len(parts) != 2:
+            raise ValueError("moveto needs x:y pixels or a position like center")
+        return "moveto", (int(parts[0]), int(parts[1]))
+    if action == "moveby":
+        if len(parts) != 2:
+            raise ValueError("moveby needs dx:dy pixels")
+        return "moveby", (int(parts[0]), int(parts[1]))
+    if action == "click":
+        button = parts[0] if parts else "left"
+        if button not in ("left", "right", "double"):
+            raise ValueError("click button must be left, right or double")
+        return "click", (button,)
+    if action == "scroll":
+        if not parts or parts[0] not in ("up", "down"):
+            raise ValueError("scroll needs up or down")
+        amount = int(parts[1]) if len(parts) > 1 else 10
+        return "scroll", (parts[0], amount)
+    if action in ("key", "press"):
+        if not parts or not _is_valid_key(parts[0]):
+            raise ValueError(f"invalid key: {rest}")
+        return "key", (parts[0],)
+    if action == "hotkey":
+        keys = [k.strip() for k in rest.split("+") if k.strip()]
+        if not keys or not all(_is_valid_key(k) for k in keys):
+            raise ValueError(f"invalid hotkey: {rest}")
+        return "hotkey", (keys,)
+    if action == "volume":
+        if not parts or parts[0] not in ("up", "down", "mute"):
+            raise ValueError("volume needs up, down or mute")
+        return "volume", (parts[0],)
+    if action == "swipe":
+        if not parts or parts[0] not in DIRECTIONS:
+            raise ValueError(f"swipe needs a direction {DIRECTIONS}")
+        return "swipe", (parts[0],)
+    if action == "wait":
+        seconds = float(parts[0]) if parts else 0.5
+        if not 0 <= seconds <= MAX_STEP_WAIT:
+            raise ValueError(f"wait must be between 0 and {MAX_STEP_WAIT} seconds")
+        return "wait", (seconds,)
+    raise ValueError(f"unknown action '{action}'")
+
+
+def format_input_step(action: str, args: tuple, kwargs: dict) -> str:
+    """Inverse of parse_input_step: a SafeController call as a step string (None if not representable)."""
+    params = list(args) + list(kwargs.values())
+    if action == "move_cursor":
+        return f"move:{params[0]}:{params[1] if len(params) > 1 else 100}"
+    if action == "move_to":
+        return f"moveto:{params[0]}:{params[1]}"
+    if action == "move_by":
+        return f"moveby:{params[0]}:{params[1]}"
+    if action == "move_to_anchor":
+        return f"moveto:{params[0]}"
+    if action == "mouse_click":
+        return f"click:{params[0] if params else 'left'}"
+    if action == "scroll_cursor":
+        return f"scroll:{params[0]}:{params[1] if len(params) > 1 else 10}"
+    if action == "type_text":
+        return f"type:{params[0]}"
+    if action == "press_key":
+        return f"key:{params[0]}"
+    if action == "press_hotkey":
+        return f"hotkey:{'+'.join(params[0])}"
+    if action == "control_volume":
+        return f"volume:{params[0]}"
+    if action == "swipe_gesture":
+        return f"swipe:{params[0]}"
+    return None
+
+
+async def _wait_step(seconds: float):
+    await asyncio.sleep(seconds)
+    return f"⏱️ Waited {seconds}s"
+
+
+def _step_handlers():
+    return {
+        "move": controller.move_cursor,
+        "moveto": controller.move_to,
+        "moveby": controller.move_by,
+        "anchor": controller.move_to_anchor,
+        "click": controller.mouse_click,
+        "scroll": controller.scroll_cursor,
+        "type": controller.type_text,
+        "key": controller.press_key,
+        "hotkey": controller.press_hotkey,
+        "volume": controller.control_volume,
+        "swipe": controller.swipe_gesture,
+        "wait": _wait_step,
+    }
+
+
+async def run_input_steps(parsed: List[Tuple[str, tuple]]) -> List[str]:
+    """Run already-validated steps in order under one activation; stops at the first failure."""
+    handlers = _step_handlers()
+    results = []
+
+    async def run_all():
+        for action, args in parsed:
+            result = await handlers[action](*args)
+            controller.touch()  # a long step must not let the lease lapse mid-sequence
+            results.append(result)
+            if result.startswith(("❌", "🛑")):
+                break
+        return results
+
+    return await with_temporary_activation(run_all)
+
+
+@metered_tool()
 async def move_cursor_tool(direction: str, distance: int = 100):
 
     """
     Temporarily activates the controller and moves the mouse cursor in a specified direction.
 
     Args:
-        direction (str): Direction to move the cursor. Must be one of ["up", "down", "left", "right"].
+        direction (str): Direction to move the cursor. One of ["up", "down", "left", "right",
+            "up-left", "up-right", "down-left", "down-right"].
         distance (int, optional): Number of pixels to move the cursor. Defaults to 100.
 
     Returns:
         str: A message describing the mouse movement action.
 
     Note:
-        The controller is automatically activated before the action and deactivated afterward.
+        The controller is automatically activated before the action and stays active for a
+        short idle lease, so back-to-back actions run without extra delay.
     """
 
 
     return await with_temporary_activation(controller.move_cursor, direction, distance)
 
-@function_tool()
+@metered_tool()
+async def move_mouse_to_tool(x: float = 0, y: float = 0, position: str = "",
+                             unit: str = "px", relative: bool = False):
+
+    """
+    Smoothly glides the mouse to any point on screen in a single call.
+
+    Use this when the user points at a place on screen — for example: "mouse ko center me le jao",
+    "cursor top-right corner pe rakho", "mouse ko 800, 450 pe le jao" or "thoda sa niche-right karo".
+
+    Args:
+        x (float): Target x (or offset when relative=True).
+        y (float): Target y (or offset when relative=True).
+        position (str, optional): Named spot instead of x/y: "center", "top", "bottom", "left",
+            "right", "top-left", "top-right", "bottom-left", "bottom-right".
+        unit (str, optional): "px" for pixels (default) or "percent" for % of the screen size.
+        relative (bool, optional): Move by x/y from the current position instead of to x/y.
+
+    Returns:
+        str: Where the mouse ended up.
+    """
+
+
+    if position:
+        return await with_temporary_activation(controller.move_to_anchor, position.strip().lower())
+    if unit not in ("px", "percent"):
+        return f"❌ Unknown unit: {unit}"
+    if unit == "percent":
+        width, height = await controller.screen_size()
+        x, y = x / 100.0 * width, y / 100.0 * height
+    if relative:
+        return await with_temporary_activation(controller.move_by, round(x), round(y))
+    return await with_temporary_activation(controller.move_to, round(x), round(y))
+
+@metered_tool()
 async def mouse_click_tool(button: str = "left"):
 
     """
@@ -199,7 +601,7 @@ async def mouse_click_tool(button: str = "left"):
 
     return await with_temporary_activation(controller.mouse_click, button)
 
-@function_tool()
+@metered_tool()
 async def scroll_cursor_tool(direction: str, amount: int = 10):
 
     """
@@ -222,11 +624,12 @@ async def scroll_cursor_tool(direction: str, amount: int = 10):
 
     return await with_temporary_activation(controller.scroll_cursor, direction, amount)
 
-@function_tool()
+@metered_tool()
 async def type_text_tool(text: str):
 
     """
-    Simulates typing the given text character by character, as if entered manually from a keyboard.
+    Types the given text into the focused window, as if entered from a keyboard.
+    Long text is pasted in one go, short text is typed quickly.
 
     Useful for commands like "type hello world" or "hello likho".
 
@@ -240,7 +643,7 @@ async def type_text_tool(text: str):
 
     return await with_temporary_activation(controller.type_text, text)
 
-@function_tool()
+@metered_tool()
 async def press_key_tool(key: str):
 
     """
@@ -258,7 +661,7 @@ async def press_key_tool(key: str):
 
     return await with_temporary_activation(controller.press_key, key)
 
-@function_tool()
+@metered_tool()
 async def press_hotkey_tool(keys: List[str]):
 
     """
@@ -277,7 +680,7 @@ async def press_hotkey_tool(keys: List[str]):
 
     return await with_temporary_activation(controller.press_hotkey, keys)
 
-@function_tool()
+@metered_tool()
 async def control_volume_tool(action: str):
 
     """
@@ -296,7 +699,7 @@ async def control_volume_tool(action: str):
 
     return await with_temporary_activation(controller.control_volume, action)
 
-@function_tool()
+@metered_tool()
 async def swipe_gesture_tool(direction: str):
 
     """
@@ -315,3 +718,45 @@ async def swipe_gesture_tool(direction: str):
 
     return await with_temporary_activation(controller.swipe_gesture, direction)
 
+@metered_tool()
+async def run_input_sequence(steps: List[str]) -> str:
+
+    """
+    Runs several mouse/keyboard actions in one go, in order. Prefer this over calling
+    the single input tools one by one whenever the user asks for more than one action.
+
+    Each step is a string:
+        "move:<direction>[:pixels]", "moveto:<x>:<y>", "moveto:center", "click[:left|right|double]",
+        "scroll:<up|down>[:amount]", "type:<text>", "key:<name>",
+        "hotkey:ctrl+s", "volume:<up|down|mute>", "swipe:<direction>", "wait:<seconds>"
+
+    Example: "search box खोलो, hello likho aur enter dabao" →
+        ["hotkey:ctrl+l", "type:hello", "key:enter"]
+
+    Args:
+        steps (List[str]): Ordered list of steps.
+
+    Returns:
+        str: Combined result of all steps, or which step was invalid.
+    """
+
+
+    if not steps:
+        return "❌ No steps given."
+    if len(steps) > MAX_SEQUENCE_STEPS:
+        return f"❌ Too many steps ({len(steps)}); max {MAX_SEQUENCE_STEPS}."
+
+    # validate everything first so a bad step never leaves a half-done sequence
+    parsed = []
+    for i, step in enumerate(steps, start=1):
+        try:
+            parsed.append(parse_input_step(step))
+        except ValueError as e:
+            return f"❌ Step {i} ('{step}') invalid: {e}"
+
+    results = await run_input_steps(parsed)
+    done = sum(1 for r in results if not r.startswith(("❌", "🛑")))
+    summary = " | ".join(results)
+    if done < len(parsed):
+        return f"⚠ Stopped after {done}/{len(parsed)} steps: {summary}"
+    return f"✅ {done} steps done: {summary}"
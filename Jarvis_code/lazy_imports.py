@@ -0,0 +1,63 @@
+import importlib
+import threading
+
+_UNSET = object()
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is only imported on first attribute access.
+
+    Heavy desktop/network libraries (pyautogui, pynput, win32gui, requests ...)
+    are wrapped in this so that importing a tool module stays cheap for
+    sessions that never use that tool.
+
+    With optional=True a missing package does not raise; the object then
+    evaluates to False, so existing `if not gw:` style checks keep working.
+    """
+
+    def __init__(self, name: str, optional: bool = False):
+        self.__dict__["_name"] = name
+        self.__dict__["_optional"] = optional
+        self.__dict__["_module"] = _UNSET
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is _UNSET:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is _UNSET:
+                    try:
+                        module = importlib.import_module(self._name)
+                    except ImportError:
+                        if not self._optional:
+                            raise
+                        module = None
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not _UNSET
+
+    def __getattr__(self, attr):
+        module = self._load()
+        if module is None:
+            raise AttributeError(f"optional module '{self._name}' is not installed")
+        return getattr(module, attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __bool__(self):
+        return self._load() is not None
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str, optional: bool = False) -> LazyModule:
+    """Return a proxy for `name` that imports the real module on first use."""
+    return LazyModule(name, optional=optional)
@@ -0,0 +1,62 @@
+import logging
+import threading
+from http.server import ThreadingHTTPServer
+from typing import Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LocalServer:
+    """
+    One lazily started ThreadingHTTPServer on a daemon thread.
+
+    Each local endpoint (tool metrics, image gallery, system metrics) keeps
+    one of these as a module singleton. start() is idempotent and returns
+    the base URL. If the configured port is taken (e.g. a second worker
+    process) it binds any free port and warns with the port it got, since
+    anything reading the default port will not find this server.
+
+    Extra keyword arguments to start() become attributes of the server, so
+    handlers can reach them as `self.server.<name>`.
+    """
+
+    def __init__(self, name: str, banner: str):
+        self.name = name        # thread name
+        self.banner = banner    # logged once on start, "{url}" is filled in
+        self._server = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    def start(self, handler, host: str, port: int, **attrs) -> str:
+        with self._lock:
+            if self._server is None:
+                try:
+                    server = ThreadingHTTPServer((host, port), handler)
+                except OSError as e:
+                    server = ThreadingHTTPServer((host, 0), handler)
+                    logger.warning(f"⚠️ {self.name}: port {port} busy ({e}), using port {server.server_address[1]} instead")
+                server.daemon_threads = True
+                for key, value in attrs.items():
+                    setattr(server, key, value)
+                threading.Thread(target=server.serve_forever, name=self.name, daemon=True).start()
+                self._server = server
+                logger.info(self.banner.format(url=self.url()))
+            return self.url()
+
+    def url(self) -> Optional[str]:
+        server = self._server
+        if server is None:
+            return None
+        host, port = server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+                self._server = None
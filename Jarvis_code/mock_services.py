@@ -0,0 +1,256 @@
+"""
+Local stand-ins for the external APIs used by the tools.
+
+One threaded HTTP server mimics:
+    GET  /customsearch/v1        Google Custom Search
+    GET  /data/2.5/weather       OpenWeather current weather
+    GET  /ipinfo                 ipinfo.io
+    POST /models/<model id>      Hugging Face inference (returns a real PNG)
+    POST /1/upload               imgbb upload
+
+Every service has a profile with latency, jitter, error rate and payload
+size, so caching / pooling / timeout changes can be measured offline.
+
+Usage:
+    python mock_services.py --port 8799 --latency search=300 --error-rate hf=0.1
+    # then point the tools at it, e.g. GOOGLE_SEARCH_URL=http://127.0.0.1:8799/customsearch/v1
+"""
+import argparse
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+SERVICES = ("search", "weather", "ipinfo", "hf", "imgbb")
+
+
+@dataclass
+class ServiceProfile:
+    latency_ms: float = 50.0      # base latency of every response
+    jitter_ms: float = 20.0       # mean of an exponential tail added on top
+    error_rate: float = 0.0       # fraction of requests answered with error_status
+    error_status: int = 503
+    payload_bytes: int = 2048     # approximate response body size
+
+
+DEFAULT_PROFILES = {
+    "search": ServiceProfile(latency_ms=250, jitter_ms=80, payload_bytes=4096),
+    "weather": ServiceProfile(latency_ms=120, jitter_ms=40, payload_bytes=600),
+    "ipinfo": ServiceProfile(latency_ms=80, jitter_ms=30, payload_bytes=300),
+    "hf": ServiceProfile(latency_ms=4000, jitter_ms=2000, payload_bytes=300_000),
+    "imgbb": ServiceProfile(latency_ms=900, jitter_ms=400, payload_bytes=400),
+}
+
+
+def make_png(size: int, seed: int = 0) -> bytes:
+    """Build a valid PNG of roughly `size` bytes using only the stdlib."""
+    rng = random.Random(seed)
+    # random pixels barely compress, so width*height*3 ≈ file size
+    side = max(8, int((max(size, 64) / 3) ** 0.5))
+    raw = bytearray()
+    for _ in range(side):
+        raw.append(0)
+        raw.extend(rng.getrandbits(8) for _ in range(side * 3))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(bytes(raw), 1)) + chunk(b"IEND", b"")
+
+
+class MockServices:
+    """Runs the mock server in a daemon thread; use as a context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, profiles: Dict[str, ServiceProfile] = None, seed: int = None):
+        self.host = host
+        self.port = port
+        self.profiles = {name: ServiceProfile(**asdict(p)) for name, p in DEFAULT_PROFILES.items()}
+        self.profiles.update(profiles or {})
+        self.rng = random.Random(seed)
+        self.counts = {name: 0 for name in SERVICES}
+        self._lock = threading.Lock()
+        self._server = None
+        self._png_cache = {}
+
+    # --- lifecycle ---
+    def start(self) -> "MockServices":
+        handler = type("MockHandler", (_MockHandler,), {"services": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="mock-services", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point every tool at this server."""
+        return {
+            "GOOGLE_SEARCH_URL": f"{self.base_url}/customsearch/v1",
+            "OPENWEATHER_URL": f"{self.base_url}/data/2.5/weather",
+            "IPINFO_URL": f"{self.base_url}/ipinfo",
+            "HF_API_URL": f"{self.base_url}/models",
+            "IMGBB_URL": f"{self.base_url}/1/upload",
+            "GOOGLE_SEARCH_API_KEY": "mock", "SEARCH_ENGINE_ID": "mock",
+            "OPENWEATHER_API_KEY": "mock", "HF_TOKEN": "mock", "IMGBB_KEY": "mock",
+        }
+
+    # --- behaviour ---
+    def delay_for(self, service: str):
+        """Return (seconds to sleep, whether to fail) for one request."""
+        p = self.profiles[service]
+        with self._lock:
+            self.counts[service] += 1
+            tail = self.rng.expovariate(1.0 / p.jitter_ms) if p.jitter_ms > 0 else 0.0
+            fail = self.rng.random() < p.error_rate
+        return (p.latency_ms + tail) / 1000.0, fail
+
+    def png(self, size: int) -> bytes:
+        # a few pre-built images per size; building them is slower than serving
+        with self._lock:
+            variants = self._png_cache.setdefault(size, [])
+            if len(variants) < 4:
+                variants.append(make_png(size, seed=len(variants)))
+            return self.rng.choice(variants)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    services: MockServices = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _reply(self, service: str, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Mock-Service", service)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, service: str, data) -> None:
+        self._reply(service, 200, json.dumps(data).encode("utf-8"))
+
+    def _handle(self, service: str, respond) -> None:
+        delay, fail = self.services.delay_for(service)
+        time.sleep(delay)
+        profile = self.services.profiles[service]
+        if fail:
+            return self._reply(service, profile.error_status, b'{"error": "mock failure"}')
+        respond(profile)
+
+    def _filler(self, size: int) -> str:
+        return ("lorem ipsum " * (size // 12 + 1))[:max(0, size)]
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/customsearch/v1":
+            def respond(p):
+                num = int(query.get("num", ["3"])[0])
+                snippet = self._filler(p.payload_bytes // max(1, num))
+                items = [{"title": f"Result {i + 1} for {query.get('q', [''])[0]}", "snippet": snippet,
+                          "link": f"https://example.com/{i}"} for i in range(num)]
+                self._json("search", {"items": items})
+            return self._handle("search", respond)
+        if url.path == "/data/2.5/weather":
+            def respond(p):
+                self._json("weather", {
+                    "name": query.get("q", ["Mock City"])[0],
+                    "weather": [{"description": "scattered clouds"}],
+                    "main": {"temp": 29.5, "humidity": 62},
+                    "wind": {"speed": 3.1},
+                    "padding": self._filler(p.payload_bytes - 200),
+                })
+            return self._handle("weather", respond)
+        if url.path.rstrip("/") in ("/ipinfo", "/ipinfo/json"):
+            return self._handle("ipinfo", lambda p: self._json("ipinfo", {"ip": "127.0.0.1", "city": "Bengaluru"}))
+        self._reply("none", 404, b'{"error": "not found"}')
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)  # drain the request body
+        if url.path.startswith("/models/"):
+            return self._handle("hf", lambda p: self._reply("hf", 200, self.services.png(p.payload_bytes), "image/png"))
+        if url.path == "/1/upload":
+            def respond(p):
+                self._json("imgbb", {"data": {"url": f"{self.services.base_url}/i/{random.getrandbits(48):x}.png"}})
+            return self._handle("imgbb", respond)
+        self._reply("none", 404, b'{"error": "not found"}')
+
+
+def parse_overrides(pairs, field: str, cast, profiles: Dict[str, ServiceProfile]) -> None:
+    """Apply `service=value` (or plain `value` for all services) CLI overrides."""
+    for pair in pairs or []:
+        name, _, value = pair.rpartition("=")
+        targets = [name] if name else list(SERVICES)
+        for target in targets:
+            if target not in SERVICES:
+                raise SystemExit(f"unknown service '{target}', pick from {', '.join(SERVICES)}")
+            profiles.setdefault(target, ServiceProfile(**asdict(DEFAULT_PROFILES[target])))
+            setattr(profiles[target], field, cast(value))
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", action="append", metavar="[SERVICE=]MS", help="base latency in ms")
+    parser.add_argument("--jitter", action="append", metavar="[SERVICE=]MS", help="mean exponential tail in ms")
+    parser.add_argument("--error-rate", action="append", metavar="[SERVICE=]RATE", help="fraction of failed requests")
+    parser.add_argument("--payload", action="append", metavar="[SERVICE=]BYTES", help="response size in bytes")
+    parser.add_argument("--profiles", help="JSON file: {service: {latency_ms, jitter_ms, error_rate, payload_bytes}}")
+
+
+def profiles_from_args(args) -> Dict[str, ServiceProfile]:
+    profiles = {}
+    if args.profiles:
+        with open(args.profiles, "r", encoding="utf-8") as f:
+            for name, values in json.load(f).items():
+                profiles[name] = ServiceProfile(**{**asdict(DEFAULT_PROFILES[name]), **values})
+    parse_overrides(args.latency, "latency_ms", float, profiles)
+    parse_overrides(args.jitter, "jitter_ms", float, profiles)
+    parse_overrides(args.error_rate, "error_rate", float, profiles)
+    parse_overrides(args.payload, "payload_bytes", int, profiles)
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local mock versions of the external tool APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    mock = MockServices(args.host, args.port, profiles_from_args(args)).start()
+    print(f"🧪 Mock services on {mock.base_url}")
+    for key, value in mock.env().items():
+        print(f"   {key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
-import sys, math, random, time
+import sys, os, json, math, time
+from array import array
 from datetime import datetime
-try:
-    # सिस्टम के आँकड़े प्राप्त करने के लिए psutil लाइब्रेरी
-    import psutil
-except Exception:
-    psutil = None
-
-from PySide6.QtCore import Qt, QTimer, QRectF, QPointF
-from PySide6.QtGui import QPainter, QColor, QPen, QFont, QLinearGradient, QRadialGradient, QFontDatabase
+# सिस्टम के आँकड़े system_metrics.py --serve सेवा के /system.json से आते हैं (sampler सिर्फ़ एक process में चलता है)
+import system_metrics
+
+from PySide6.QtCore import Qt, QTimer, QRectF, QPointF, QEvent, QObject, Signal
+from PySide6.QtGui import QPainter, QColor, QPen, QBrush, QPixmap, QPolygonF, QFont, QLinearGradient, QRadialGradient, QFontDatabase
+from PySide6.QtNetwork import QUdpSocket, QHostAddress
 from PySide6.QtWidgets import QApplication, QWidget, QMainWindow, QLabel, QVBoxLayout, QHBoxLayout, QFrame, QSizePolicy, QGridLayout
 
+# एनीमेशन की दर: सक्रिय विंडो ~60 FPS, बैकग्राउंड में ~15 FPS, छिपी/minimized पर बंद
+ANIM_ACTIVE_MS = 16
+ANIM_IDLE_MS = 66
+RING_CYCLE_SECONDS = 2.2  # phase 0 -> 1 का समय (पुराना 0.0075 प्रति 16 ms फ्रेम)
+
+# कितने सेकंड का इतिहास रखा जाए (sparklines के लिए)
+HISTORY_SECONDS = 300
+
+# एजेंट का telemetry feed (hud_telemetry.py वही host/port इस्तेमाल करता है)
+HUD_TELEMETRY_HOST = os.getenv("HUD_TELEMETRY_HOST", "127.0.0.1")
+HUD_TELEMETRY_PORT = int(os.getenv("HUD_TELEMETRY_PORT", "9465"))
+HUD_HEARTBEAT_SECONDS = float(os.getenv("HUD_HEARTBEAT_SECONDS", "2"))
+AGENT_OFFLINE_AFTER = 3 * HUD_HEARTBEAT_SECONDS  # इतनी देर कोई पैकेट नहीं = एजेंट बंद
+
 # एक मान को न्यूनतम और अधिकतम सीमा के बीच रखने के लिए हेल्पर फ़ंक्शन
 def clamp(v, lo, hi):
     return max(lo, min(hi, v))
@@ -19,6 +32,69 @@ def smoothstep(edge0, edge1, x):
     t = clamp((x - edge0) / (edge1 - edge0), 0.0, 1.0)
     return t * t * (3 - 2 * t)
 
+# स्थिर आकार का ring buffer (array module पर) - मेमोरी हमेशा capacity * 8 bytes
+class RingBuffer:
+    def __init__(self, capacity):
+        self.capacity = max(2, int(capacity))
+        self.data = array('d', [0.0]) * self.capacity
+        self.head = 0      # अगला मान कहाँ लिखा जाएगा
+        self.count = 0
+        self.version = 0   # हर append पर बढ़ता है, ताकि sparkline जान सके कब दोबारा बनाना है
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.version += 1
+
+    def values(self):
+        # सबसे पुराने से नए क्रम में
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return self.data[self.head:] + self.data[:self.head]
+
+    def last(self, default=0.0):
+        return self.data[self.head - 1] if self.count else default
+
+    def max(self, default=0.0):
+        return max(self.values()) if self.count else default
+
+# RingBuffer की polyline - QPolygonF सिर्फ़ नए मान या नए आकार पर दोबारा बनती है,
+# paint में बस drawPolyline; लागत capacity से बंधी है, HUD कितना भी चले
+class Sparkline:
+    def __init__(self, buffer, lo=0.0, hi=100.0):
+        self.buffer = buffer
+        self.lo = lo
+        self.hi = hi       # None = auto scale (buffer का max)
+        self._key = None
+        self._xs = None
+        self._poly = QPolygonF()
+
+    def polygon(self, rect, hi=None):
+        hi = hi if hi is not None else (self.hi if self.hi is not None else max(self.buffer.max(), 1e-6))
+        geometry = (rect.x(), rect.y(), rect.width(), rect.height())
+        key = (self.buffer.version, geometry, hi)
+        if key == self._key:
+            return self._poly
+        if self._key is None or self._key[1] != geometry:
+            # x स्थान आकार बदलने पर ही, दाएँ किनारे से capacity बराबर हिस्सों में
+            step = rect.width() / (self.buffer.capacity - 1)
+            self._xs = [rect.right() - i * step for i in range(self.buffer.capacity)]
+        self._key = key
+        values = self.buffer.values()
+        n = len(values)
+        span = max(hi - self.lo, 1e-6)
+        bottom, height = rect.bottom(), rect.height()
+        xs = self._xs
+        self._poly = QPolygonF([
+            QPointF(xs[n - 1 - i], bottom - clamp((v - self.lo) / span, 0.0, 1.0) * height)
+            for i, v in enumerate(values)
+        ])
+        return self._poly
+
 # खंडों के लिए एक कस्टम शीर्षक लेबल
 class SectionTitle(QLabel):
     def __init__(self, text):
@@ -28,14 +104,19 @@ class SectionTitle(QLabel):
 
 # एक नियॉन-स्टाइल प्रगति बार विजेट (अब सियान/ब्लू थीम में)
 class NeonBar(QWidget):
-    def __init__(self, title, init=0.0, style='cyan'):
+    def __init__(self, title, init=0.0, style='cyan', history=None):
         super().__init__()
         self.title = title
+        # पिछले कुछ मिनटों का इतिहास बार के पीछे हल्की रेखा के रूप में
+        self.spark = Sparkline(history) if history is not None else None
+        self.spark_pen = QPen(QColor(0, 255, 255, 90), 1.2)
         self.value = float(init)
         self.unit = ""
         self.setMinimumHeight(56)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.style = style
+        self.title_font = QFont("Segoe UI", 10, QFont.Bold)
+        self.value_font = QFont("Consolas", 11, QFont.DemiBold)
 
     def setValue(self, v):
         # मान सेट करें और विजेट को फिर से बनाने के लिए अपडेट करें
@@ -53,9 +134,14 @@ class NeonBar(QWidget):
         p.setBrush(QColor(10, 25, 45, 200)) 
         p.drawRoundedRect(self.rect(), 8, 8) # गोल कोनों को थोड़ा बढ़ाया
 
+        # इतिहास की sparkline (पृष्ठभूमि पर)
+        if self.spark and len(self.spark.buffer) > 1:
+            p.setPen(self.spark_pen)
+            p.drawPolyline(self.spark.polygon(QRectF(r)))
+
         # शीर्षक टेक्स्ट
         p.setPen(QColor(224, 255, 255)) # Light Cyan text
-        p.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        p.setFont(self.title_font)
         p.drawText(r.x(), r.y() - 2, r.width(), 16, Qt.AlignLeft | Qt.AlignTop, self.title.upper())
 
         # बार की पृष्ठभूमि
@@ -86,7 +172,7 @@ class NeonBar(QWidget):
 
         # प्रतिशत टेक्स्ट
         p.setPen(QColor(255, 255, 255))
-        p.setFont(QFont("Consolas", 11, QFont.DemiBold)) # Slightly larger font
+        p.setFont(self.value_font) # Slightly larger font
         txt = f"{int(self.value)}{self.unit if self.unit else '%'}"
         p.drawText(r, Qt.AlignRight | Qt.AlignVCenter, txt)
 
@@ -152,8 +238,36 @@ class NetworkStats(QFrame):
         net_grid.addWidget(self.down, 2, 1, Qt.AlignRight)
         
         lay.addLayout(net_grid)
+        self.graph = NetGraph()
+        lay.addWidget(self.graph, 1)
         lay.addStretch()
 
+# अपलोड/डाउनलोड दर का छोटा ग्राफ़ (दोनों एक ही स्केल पर)
+class NetGraph(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setMinimumHeight(60)
+        self.up = None
+        self.down = None
+        self.up_pen = QPen(QColor(0, 180, 255), 1.5)
+        self.down_pen = QPen(QColor(0, 255, 255), 1.5)
+
+    def setHistory(self, up, down):
+        self.up = Sparkline(up, hi=None)
+        self.down = Sparkline(down, hi=None)
+
+    def paintEvent(self, event):
+        if not self.up or len(self.up.buffer) < 2:
+            return
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing)
+        r = QRectF(self.rect().adjusted(2, 4, -2, -2))
+        hi = max(self.up.buffer.max(), self.down.buffer.max(), 0.1)
+        p.setPen(self.down_pen)
+        p.drawPolyline(self.down.polygon(r, hi))
+        p.setPen(self.up_pen)
+        p.drawPolyline(self.up.polygon(r, hi))
+
 # घड़ी के लिए कार्ड (नए सियान स्टाइल में)
 class ClockCard(QFrame):
     def __init__(self):
@@ -183,83 +297,219 @@ class ClockCard(QFrame):
         now = datetime.now()
         self.timeLbl.setText(now.strftime("%H:%M:%S"))
 
+# हर CPU core का छोटा बार (पेन/ब्रश पहले से बने हुए)
+class CorePanel(QWidget):
+    HOT = 85.0  # इससे ऊपर core लाल
+
+    def __init__(self):
+        super().__init__()
+        self.values = []
+        self.setMinimumHeight(44)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.track_brush = QBrush(QColor(20, 35, 60, 220))
+        self.cool_brush = QBrush(QColor(0, 220, 255))
+        self.hot_brush = QBrush(QColor(255, 69, 0))
+        self.label_font = QFont("Consolas", 8)
+
+    def setValues(self, values):
+        self.values = values
+        self.update()
+
+    def paintEvent(self, event):
+        n = len(self.values)
+        if not n:
+            return
+        p = QPainter(self)
+        r = QRectF(self.rect().adjusted(8, 4, -8, -14))
+        gap = 2.0 if n < 32 else 1.0
+        w = max((r.width() - gap * (n - 1)) / n, 1.0)
+        p.setPen(Qt.NoPen)
+        for i, v in enumerate(self.values):
+            x = r.x() + i * (w + gap)
+            p.setBrush(self.track_brush)
+            p.drawRect(QRectF(x, r.y(), w, r.height()))
+            h = r.height() * clamp(v, 0.0, 100.0) / 100.0
+            p.setBrush(self.hot_brush if v >= self.HOT else self.cool_brush)
+            p.drawRect(QRectF(x, r.bottom() - h, w, h))
+        p.setPen(QColor(224, 255, 255))
+        p.setFont(self.label_font)
+        p.drawText(self.rect().adjusted(8, 0, -8, 0), Qt.AlignLeft | Qt.AlignBottom, f"{n} CORES")
+        p.drawText(self.rect().adjusted(8, 0, -8, 0), Qt.AlignRight | Qt.AlignBottom, f"MAX {max(self.values):.0f}%")
+
+# प्रोसेस पैनल: एजेंट worker (+ उसके child processes), चुने हुए प्रोसेस और टॉप N
+class ProcessPanel(QFrame):
+    def __init__(self):
+        super().__init__()
+        self.setStyleSheet("""
+            QFrame { 
+                background: rgba(10, 25, 45, 200); 
+                border-radius:8px; 
+                border:1px solid rgba(0, 255, 255, 100); 
+            }
+            QLabel { color:#E0FFFF; border:none; }
+        """)
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(12, 12, 12, 12)
+        lay.setSpacing(6)
+        lay.addWidget(SectionTitle("PROCESS MONITOR"))
+        self.table = QLabel("WAITING FOR SAMPLES...")
+        self.table.setStyleSheet("font-family:Consolas, monospace; font-size:12px;")
+        lay.addWidget(self.table)
+
+    def setSnapshot(self, snap):
+        def row(tag, name, cpu, rss, extra=""):
+            return f"{tag:<6} {name[:22]:<22} CPU {cpu:>5.1f}%  RAM {rss:>7.0f} MB  {extra}"
+        lines = []
+        agent = snap.get("agent")
+        if agent:
+            lines.append(row("AGENT", f"{agent['name']} ({agent['pid']})", agent["cpu"], agent["rss_mb"],
+                             f"+{agent['children']} child: {agent['children_cpu']:.1f}% / {agent['children_rss_mb']:.0f} MB"))
+        else:
+            lines.append("AGENT  (not found - waiting for heartbeat / SYSTEM_AGENT_PID)")
+        for w in snap.get("watch", []):
+            lines.append(row("WATCH", f"{w['name']} x{w['count']}", w["cpu"], w["rss_mb"]))
+        for t in snap.get("top", []):
+            lines.append(row("TOP", f"{t['name']} ({t['pid']})", t["cpu"], t["rss_mb"]))
+        lines.append(f"{snap.get('count', 0)} processes")
+        self.table.setText("\n".join(lines))
+
 # एनिमेटेड घूमने वाली रिंग्स (अधिक जटिल, हाई-फाई लुक)
+# स्थिर परतें QPixmap में cache (resize पर ही दोबारा), pens पहले से तैयार - फ्रेम = drawPixmap + drawArc
 class AnimatedRings(QWidget):
+    ALPHA_LEVELS = 32  # सेगमेंट चमक के quantized स्तर (हर स्तर का QPen पहले से तैयार)
+    SEGMENTS = 24      # खंडों की संख्या
+    GAP_DEG = 8.0      # खंडों के बीच का अंतर
+
+    # रिंग्स की परिभाषा (त्रिज्या का अनुपात, चौड़ाई, ऑफ़सेट, रंग) - सियान/सफ़ेद
+    RING_SPECS = [
+        (1.05, 12.0, 0.00, (0, 255, 255)),   # Bright Cyan
+        (0.90, 8.0, 0.19, (0, 180, 255)),    # Bright Blue
+        (0.75, 5.0, 0.36, (240, 255, 255)),  # White
+        (0.60, 3.0, 0.54, (0, 255, 255)),
+    ]
+
     def __init__(self):
         super().__init__()
         self.phase = 0.0
         self.setMinimumSize(520, 520)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-    def paintEvent(self, event):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
+        self._cache_key = None
+        self._overlay_key = None
+        self._background = None
+        self._overlay = None
+        self.status = "STATUS: ONLINE [LIVE FEED]"
+        self._rings = []
+        self._center = QPointF()
+        self._core_radius = 0.0
+        # रंग/पेन जो size पर निर्भर नहीं करते
+        self._core_pen = QPen(QColor(0, 255, 255), 2)
+        self._core_brushes = [QBrush(QColor(0, 255, 255, 50 + int(200 * i / (self.ALPHA_LEVELS - 1))))
+                              for i in range(self.ALPHA_LEVELS)]
+        # पहले हर रिंग के लिए एक डॉट (alpha 150) बनता था; चारों का मिला-जुला रंग एक बार में
+        self._dot_brush = QBrush(QColor(255, 255, 255, int(255 * (1 - (1 - 150 / 255) ** len(self.RING_SPECS)))))
+        self._title_font = QFont("Consolas", 52, QFont.Black)
+        self._status_font = QFont("Consolas", 14, QFont.DemiBold)
+
+    def resizeEvent(self, event):
+        self._cache_key = None
+        super().resizeEvent(event)
+
+    def setStatus(self, text):
+        # स्थिति बदलने पर सिर्फ़ टेक्स्ट वाली layer दोबारा बनती है
+        if text != self.status:
+            self.status = text
+            self._overlay_key = None
+            self.update()
+
+    def _layer(self, size, dpr):
+        pix = QPixmap(int(size.width() * dpr), int(size.height() * dpr))
+        pix.setDevicePixelRatio(dpr)
+        pix.fill(Qt.transparent)
+        return pix
+
+    def _build_cache(self, dpr):
         rect = self.rect()
         cx, cy = rect.center().x(), rect.center().y()
         radius = min(rect.width(), rect.height()) * 0.42
+        self._center = QPointF(cx, cy)
+        self._core_radius = radius * 0.2
 
-        # पृष्ठभूमि ग्रेडिएंट
+        # पृष्ठभूमि ग्रेडिएंट (static layer)
+        self._background = self._layer(rect.size(), dpr)
+        p = QPainter(self._background)
         bg = QRadialGradient(QPointF(cx, cy), radius * 1.8)
         bg.setColorAt(0.0, QColor(10, 20, 35, 150))
         bg.setColorAt(1.0, QColor(6, 8, 12, 0))
         p.fillRect(rect, bg)
-        
-        # रिंग्स की परिभाषा (त्रिज्या, चौड़ाई, ऑफ़सेट, रंग) - सियान/सफ़ेद
-        rings = [
-            (radius * 1.05, 12.0, 0.00, QColor(0, 255, 255, 240)),  # Bright Cyan
-            (radius * 0.90, 8.0, 0.19, QColor(0, 180, 255, 220)),    # Bright Blue
-            (radius * 0.75, 5.0, 0.36, QColor(240, 255, 255, 200)), # White
-            (radius * 0.60, 3.0, 0.54, QColor(0, 255, 255, 180)),
-        ]
-        for r, w, off, col in rings:
-            self._draw_segmented_ring(p, QPointF(cx, cy), r, w, off, col)
-            
-        # केंद्र विज़ुअलाइज़ेशन: एक केंद्रीय गोलाकार कोर जो पल्स करता है
-        center = QPointF(cx, cy)
-        pulse_alpha = 150 + 100 * math.sin(self.phase * 2 * math.pi * 3)
-        p.setBrush(QColor(0, 255, 255, int(pulse_alpha)))
-        p.setPen(QPen(QColor(0, 255, 255), 2))
-        p.drawEllipse(center, radius * 0.2, radius * 0.2)
-        
-        # मुख्य शीर्षक
+        p.end()
+
+        # हर रिंग का rect और alpha स्तर के हिसाब से pens
+        self._rings = []
+        for scale, width, offset, (red, green, blue) in self.RING_SPECS:
+            r = radius * scale
+            pens = []
+            for i in range(self.ALPHA_LEVELS):
+                pen = QPen(QColor(red, green, blue, 100 + int(155 * i / (self.ALPHA_LEVELS - 1))), width)
+                pen.setCapStyle(Qt.FlatCap)
+                pens.append(pen)
+            self._rings.append((QRectF(cx - r, cy - r, r * 2, r * 2), offset, pens))
+
+    def _build_overlay(self, dpr):
+        # मुख्य शीर्षक + स्थिति (static overlay, रिंग्स के ऊपर)
+        rect = self.rect()
+        self._overlay = self._layer(rect.size(), dpr)
+        p = QPainter(self._overlay)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        p.setRenderHint(QPainter.TextAntialiasing, True)
         p.setPen(QColor(255, 255, 255))
-        p.setFont(QFont("Consolas", 52, QFont.Black))
+        p.setFont(self._title_font)
         p.drawText(rect, Qt.AlignCenter, "AGENT_01")
+        p.setFont(self._status_font)
+        p.setPen(QColor(0, 255, 255))  # Cyan status
+        p.drawText(rect.adjusted(0, 140, 0, 0), Qt.AlignHCenter | Qt.AlignVCenter, self.status)
+        p.end()
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if key != self._cache_key:
+            self._build_cache(dpr)
+            self._cache_key = key
+        if self._overlay_key != (key, self.status):
+            self._build_overlay(dpr)
+            self._overlay_key = (key, self.status)
 
-        # स्थिति
-        p.setFont(QFont("Consolas", 14, QFont.DemiBold))
-        p.setPen(QColor(0, 255, 255)) # Cyan status
-        online_rect = rect.adjusted(0, 140, 0, 0)
-        p.drawText(online_rect, Qt.AlignHCenter | Qt.AlignVCenter, "STATUS: ONLINE [LIVE FEED]")
+        p = QPainter(self)
+        p.drawPixmap(0, 0, self._background)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        for rect, offset, pens in self._rings:
+            self._draw_segmented_ring(p, rect, offset, pens)
 
-    def _draw_segmented_ring(self, p, center, radius, width, offset, color):
+        # केंद्र का डॉट और पल्स करता हुआ कोर
+        p.setPen(Qt.NoPen)
+        p.setBrush(self._dot_brush)
+        p.drawEllipse(self._center, 4, 4)
+        pulse = 0.5 + 0.5 * math.sin(self.phase * 2 * math.pi * 3)
+        p.setBrush(self._core_brushes[int(round(pulse * (self.ALPHA_LEVELS - 1)))])
+        p.setPen(self._core_pen)
+        p.drawEllipse(self._center, self._core_radius, self._core_radius)
+
+        p.drawPixmap(0, 0, self._overlay)
+
+    def _draw_segmented_ring(self, p, rect, offset, pens):
         # एक खंडित, कोणीय रिंग बनाने के लिए
-        base = (self.phase * 0.5 + offset) % 1.0 # धीमी रोटेशन
-        segments = 24 # खंडों की संख्या बढ़ाई
-        gap_deg = 8.0 # अंतर को थोड़ा कम किया
-
-        for i in range(segments):
-            # प्रत्येक सेगमेंट के लिए शुरू और अवधि (Start and Span) की गणना करें
-            angle_per_segment = 360.0 / segments
-            start_angle = (i * angle_per_segment + base * 360.0)
-            span_angle = angle_per_segment - gap_deg
-            
-            # चमक के लिए: फ़ेज़ पर आधारित चमक (Pulsing effect)
-            t_pulse = (i / segments + self.phase * 1.5) % 1.0
-            alpha = 100 + 155 * smoothstep(0.0, 0.5, math.sin(t_pulse * 2 * math.pi))
-            
-            pen = QPen(QColor(color.red(), color.green(), color.blue(), int(alpha)), width)
-            pen.setCapStyle(Qt.FlatCap)
-            p.setPen(pen)
-            
-            rect = QRectF(center.x() - radius, center.y() - radius, radius * 2, radius * 2)
+        base = (self.phase * 0.5 + offset) % 1.0  # धीमी रोटेशन
+        angle_per_segment = 360.0 / self.SEGMENTS
+        span = int(-(angle_per_segment - self.GAP_DEG) * 16)
+        top = self.ALPHA_LEVELS - 1
+        for i in range(self.SEGMENTS):
+            start_angle = i * angle_per_segment + base * 360.0
+            # चमक के लिए: फ़ेज़ पर आधारित चमक (Pulsing effect), पहले से बने pen से
+            t_pulse = (i / self.SEGMENTS + self.phase * 1.5) % 1.0
+            level = smoothstep(0.0, 0.5, math.sin(t_pulse * 2 * math.pi))
+            p.setPen(pens[int(level * top + 0.5)])
             # drawArc में कोण को 16 से गुणा करें
-            p.drawArc(rect, int(-start_angle * 16), int(-span_angle * 16))
-        
-        # केंद्र में एक छोटा डॉट
-        p.setPen(Qt.NoPen)
-        p.setBrush(QColor(255, 255, 255, 150))
-        p.drawEllipse(center, 4, 4)
+            p.drawArc(rect, int(-start_angle * 16), span)
 
 # विंडो के लिए शीर्षक बार (नए स्टाइल में)
 class TitleBar(QFrame):
@@ -283,6 +533,31 @@ class TitleBar(QFrame):
         lay.addWidget(lbl)
         lay.addStretch()
 
+# sampler thread से आए ताज़ा मानों को GUI thread तक पहुँचाने के लिए (queued signal)
+class StatBridge(QObject):
+    snapshot = Signal(dict)
+
+# एजेंट (agent.py) से आने वाला telemetry - UDP datagrams, readyRead पर ही पढ़े जाते हैं (कोई polling नहीं)
+class TelemetryListener(QObject):
+    message = Signal(dict)
+
+    def __init__(self, host=HUD_TELEMETRY_HOST, port=HUD_TELEMETRY_PORT):
+        super().__init__()
+        self.sock = QUdpSocket(self)
+        # दूसरा HUD पहले से port ले चुका हो तो bind fail होगा और यह HUD बस offline दिखाएगा
+        self.bound = self.sock.bind(QHostAddress(host), port)
+        self.sock.readyRead.connect(self.read)
+
+    def read(self):
+        while self.sock.hasPendingDatagrams():
+            datagram = self.sock.receiveDatagram()
+            try:
+                msg = json.loads(bytes(datagram.data()).decode("utf-8"))
+            except ValueError:
+                continue
+            if isinstance(msg, dict):
+                self.message.emit(msg)
+
 # मुख्य विंडो
 class NovaHUD(QMainWindow):
     def __init__(self):
@@ -292,6 +567,17 @@ class NovaHUD(QMainWindow):
         # गहरा नीला पृष्ठभूमि रंग
         self.setStyleSheet("background-color: #0A1423;")
 
+        # सिस्टम आँकड़े metrics सेवा के /system.json से अलग thread में पढ़े जाते हैं; GUI thread सिर्फ़ snapshot लगाता है।
+        # सेवा न चल रही हो तो local sampler, और psutil/sensor न हों तो पहले जैसे demo मान
+        system_metrics.sampler.simulate = True
+        self.sampler = system_metrics.RemoteSampler(fallback=system_metrics.sampler)
+
+        # हर metric का HISTORY_SECONDS का इतिहास (sample दर के हिसाब से capacity)
+        self.history = {
+            name: RingBuffer(HISTORY_SECONDS / self.sampler.rates[rate])
+            for name, rate in (("cpu", "cpu"), ("mem", "mem"), ("disk", "disk"), ("net_up", "net"), ("net_down", "net"))
+        }
+
         top = TitleBar("ADVANCED SYSTEM DIAGNOSTICS INTERFACE")
         central = QWidget()
         self.setCentralWidget(central)
@@ -309,6 +595,7 @@ class NovaHUD(QMainWindow):
         leftColumn.setSpacing(15)
         self.clock = ClockCard()
         self.net = NetworkStats()
+        self.net.graph.setHistory(self.history["net_up"], self.history["net_down"])
         
         # बायां कॉलम को एक रैपर में डाला ताकि ग्रिड में स्ट्रेच हो सके
         leftWrap = QWidget()
@@ -323,15 +610,16 @@ class NovaHUD(QMainWindow):
         body.addWidget(self.rings, 0, 1, 2, 1) # केंद्र कॉलम 2 पंक्तियों तक फैला हुआ
 
         # दायां ऊपरी कार्ड (सिस्टम प्रोफाइल: CPU, TEMP, BATT)
-        self.cpu_util = NeonBar("CPU CORE UTILIZATION", init=65, style='cyan') # Cyan
+        self.cpu_util = NeonBar("CPU CORE UTILIZATION", init=65, style='cyan', history=self.history["cpu"]) # Cyan
         self.cpu_temp = NeonBar("CPU TEMPERATURE", init=62, style='red') # Critical Red
         self.battery = NeonBar("POWER SUPPLY LEVEL", init=72, style='cyan') # Cyan
-        rightUpperCard = StatCard("CRITICAL SYSTEM PROFILES", [self.cpu_util, self.cpu_temp, self.battery])
+        self.cores = CorePanel()
+        rightUpperCard = StatCard("CRITICAL SYSTEM PROFILES", [self.cpu_util, self.cores, self.cpu_temp, self.battery])
         body.addWidget(rightUpperCard, 0, 2, 1, 1)
 
         # दायां निचला कार्ड (स्टोरेज आँकड़े: MEM, DISK)
-        self.mem = NeonBar("VOLATILE MEMORY USAGE", init=50, style='red') # Critical Red
-        self.disk = NeonBar("PERSISTENT DISK USAGE", init=75, style='cyan') # Cyan
+        self.mem = NeonBar("VOLATILE MEMORY USAGE", init=50, style='red', history=self.history["mem"]) # Critical Red
+        self.disk = NeonBar("PERSISTENT DISK USAGE", init=75, style='cyan', history=self.history["disk"]) # Cyan
         rightLowerCard = StatCard("STORAGE/MEMORY STATS", [self.mem, self.disk])
         body.addWidget(rightLowerCard, 1, 2, 1, 1)
 
@@ -339,24 +627,38 @@ class NovaHUD(QMainWindow):
         body.setColumnStretch(0, 1)
         body.setColumnStretch(1, 3) # केंद्र विज़ुअलाइज़ेशन को ज़्यादा जगह दी
         body.setColumnStretch(2, 1)
+        # नीचे की पंक्ति: प्रोसेस पैनल (पूरी चौड़ाई)
+        self.procs = ProcessPanel()
+        body.addWidget(self.procs, 2, 0, 1, 3)
+
         body.setRowStretch(0, 1)
         body.setRowStretch(1, 1)
+        body.setRowStretch(2, 0)
 
         # टाइमर
+        # animTimer showEvent में शुरू होता है, दर _update_anim_rate तय करता है
         self.animTimer = QTimer(self)
+        self.animTimer.setTimerType(Qt.PreciseTimer)
         self.animTimer.timeout.connect(self.animate)
-        self.animTimer.start(16) # ~60 FPS
+        self.last_frame = None
 
-        self.statTimer = QTimer(self)
-        self.statTimer.timeout.connect(self.sampleStats)
-        self.statTimer.start(1000) # हर सेकंड
+        self.statBridge = StatBridge()
+        self.statBridge.snapshot.connect(self.applyStats)
+        self.onSample = self.statBridge.snapshot.emit  # sampler thread पर कॉल होता है
+        self.sampler.subscribe(self.onSample)
 
         self.clockTimer = QTimer(self)
         self.clockTimer.timeout.connect(self.tick)
         self.clockTimer.start(1000) # हर सेकंड
 
-        self.last_bytes = None
-        self.sampleStats()
+        self.sampler.start()
+
+        # एजेंट की live स्थिति और tool calls
+        self.agent_seen = None
+        self.agent_state = "offline"
+        self.rings.setStatus("STATUS: AGENT OFFLINE")
+        self.telemetry = TelemetryListener()
+        self.telemetry.message.connect(self.onTelemetry)
         self.tick()
 
     def update_log(self, message):
@@ -364,102 +666,107 @@ class NovaHUD(QMainWindow):
         if self and hasattr(self, 'clock') and self.clock:
             self.clock.logLbl.setText(str(message).upper())
 
+    def _update_anim_rate(self):
+        # छिपी/minimized विंडो पर एनीमेशन बंद, फोकस न होने पर धीमा
+        if not self.isVisible() or self.isMinimized():
+            self.animTimer.stop()
+            self.last_frame = None
+            return
+        interval = ANIM_ACTIVE_MS if self.isActiveWindow() else ANIM_IDLE_MS
+        if not self.animTimer.isActive() or self.animTimer.interval() != interval:
+            self.animTimer.start(interval)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_anim_rate()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_anim_rate()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() in (QEvent.WindowStateChange, QEvent.ActivationChange):
+            self._update_anim_rate()
+
     def animate(self):
-        # रिंग्स एनीमेशन को अपडेट करें
-        self.rings.phase = (self.rings.phase + 0.0075) % 1.0
+        # रिंग्स एनीमेशन को अपडेट करें - phase समय से बढ़ता है, इसलिए गति फ्रेम दर पर निर्भर नहीं
+        now = time.monotonic()
+        dt = 0.0 if self.last_frame is None else min(now - self.last_frame, 0.25)
+        self.last_frame = now
+        self.rings.phase = (self.rings.phase + dt / RING_CYCLE_SECONDS) % 1.0
         self.rings.update()
 
     def tick(self):
         # घड़ी को अपडेट करें
         self.clock.tick()
-
-    def sampleStats(self):
-        # सिस्टम आँकड़े प्राप्त करें और UI को अपडेट करें
-        
-        # CPU उपयोगिता
-        try:
-            cpu = psutil.cpu_percent(interval=None) if psutil else random.uniform(8, 88)
-        except:
-            cpu = random.uniform(8, 88)
-        self.cpu_util.setValue(cpu)
-
-        # CPU तापमान
-        temp_c = None
-        if psutil:
-            try:
-                temps = psutil.sensors_temperatures()
-                if temps:
-                    for k, v in temps.items():
-                        if v:
-                            temp_c = v[0].current
-                            break
-            except:
-                temp_c = None
-        if temp_c is None:
-            temp_c = 48 + 12 * math.sin(time.time() / 6.5) + random.uniform(-2, 2)
-        # तापमान मान के साथ बार को अपडेट करें
-        self.cpu_temp.setValue(clamp((temp_c / 100.0) * 100, 0, 100))
-
-        # बैटरी स्तर
-        batt_pct = None
-        if psutil and hasattr(psutil, "sensors_battery"):
-            try:
-                b = psutil.sensors_battery()
-                if b: batt_pct = b.percent
-            except:
-                batt_pct = None
-        if batt_pct is None:
-            batt_pct = 70 + 8 * math.sin(time.time() / 10.0) + random.uniform(-4, 4)
-        self.battery.setValue(clamp(batt_pct, 0, 100))
-
-        # मेमोरी उपयोग
-        try:
-            mem_pct = psutil.virtual_memory().percent if psutil else random.uniform(22, 86)
-        except:
-            mem_pct = random.uniform(22, 86)
-        self.mem.setValue(mem_pct)
-
-        # डिस्क उपयोग
-        try:
-            disk_pct = psutil.disk_usage('/').percent if psutil else random.uniform(12, 88)
-        except:
-            disk_pct = random.uniform(12, 88)
-        self.disk.setValue(disk_pct)
-
-        # नेटवर्क आँकड़े
-        if psutil:
-            try:
-                addrs = psutil.net_if_addrs()
-                ip = "0.0.0.0"
-                for _, arr in addrs.items():
-                    for a in arr:
-                        # केवल IPv4 एड्रेस को फ़िल्टर करें जो 169.254 से शुरू नहीं होते हैं
-                        if getattr(a, 'family', None) and str(getattr(a, 'address', '')).count('.') == 3 and not a.address.startswith("169.254"):
-                            ip = a.address
-                            break
-                    if ip != "0.0.0.0":
-                        break
-                self.net.ip.setText(f"{ip}")
-            except:
-                self.net.ip.setText("0.0.0.0")
-
-            try:
-                io = psutil.net_io_counters()
-                nowb = (io.bytes_sent, io.bytes_recv)
-                if self.last_bytes:
-                    # पिछले मान से अंतर निकालकर दर (rate) की गणना करें
-                    up = (nowb[0] - self.last_bytes[0]) / 1024.0 / 1024.0
-                    down = (nowb[1] - self.last_bytes[1]) / 1024.0 / 1024.0
-                    self.net.up.setText(f"{up:.1f}")
-                    self.net.down.setText(f"{down:.1f}")
-                self.last_bytes = nowb
-            except:
-                pass
+        # heartbeat रुक गई तो एजेंट को offline दिखाएँ
+        if self.agent_seen is not None and time.monotonic() - self.agent_seen > AGENT_OFFLINE_AFTER:
+            self.agent_seen = None
+            self.setAgentState("offline")
+
+    def setAgentState(self, state):
+        self.agent_state = state
+        if state == "offline":
+            self.rings.setStatus("STATUS: AGENT OFFLINE")
         else:
-            # psutil के बिना रैंडम मान
-            self.net.ip.setText("192.168.1.101")
-            self.net.up.setText(f"{random.uniform(0.4, 3.2):.1f}")
-            self.net.down.setText(f"{random.uniform(3.3, 18.3):.1f}")
+            self.rings.setStatus(f"STATUS: {state.upper()} [LIVE FEED]")
+
+    def onTelemetry(self, msg):
+        # agent.py -> hud_telemetry.py से आया संदेश
+        event = msg.get("event")
+        self.agent_seen = time.monotonic()
+        if event == "heartbeat" and msg.get("pid"):
+            # प्रोसेस पैनल किस pid को एजेंट माने (metrics सेवा को भी यही pid भेजा जाता है)
+            self.sampler.processes.agent_pid = int(msg["pid"])
+        if event in ("state", "heartbeat"):
+            state = msg.get("agent") or "idle"
+            if state == "offline":
+                self.agent_seen = None
+            self.setAgentState(state)
+        elif event == "tool_start":
+            self.update_log(f"▶ {msg.get('tool', '?')}")
+        elif event == "tool_end":
+            mark = "✔" if msg.get("ok", True) else "✖"
+            self.update_log(f"{mark} {msg.get('tool', '?')} {msg.get('latency_ms', 0):.0f} ms")
+        elif event == "error":
+            self.update_log(f"✖ {msg.get('source', 'agent')} error")
+
+    def applyStats(self, snap):
+        # sampler thread से आया snapshot - यहाँ सिर्फ़ UI अपडेट, कोई psutil/HTTP कॉल नहीं
+        for name in ("cpu", "mem", "disk"):
+            if name in snap:
+                self.history[name].append(snap[name])
+        if "net" in snap:
+            self.history["net_up"].append(snap["net"][0])
+            self.history["net_down"].append(snap["net"][1])
+            self.net.graph.update()
+        if "cores" in snap:
+            self.cores.setValues(snap["cores"])
+        if "procs" in snap:
+            self.procs.setSnapshot(snap["procs"])
+        if "cpu" in snap:
+            self.cpu_util.setValue(snap["cpu"])
+        if "temp" in snap:
+            self.cpu_temp.setValue(clamp((snap["temp"] / 100.0) * 100, 0, 100))
+        if "battery" in snap:
+            self.battery.setValue(clamp(snap["battery"], 0, 100))
+        if "mem" in snap:
+            self.mem.setValue(snap["mem"])
+        if "disk" in snap:
+            self.disk.setValue(snap["disk"])
+        if "ip" in snap:
+            self.net.ip.setText(f"{snap['ip']}")
+        if "net" in snap:
+            up, down = snap["net"]
+            self.net.up.setText(f"{up:.1f}")
+            self.net.down.setText(f"{down:.1f}")
+
+    def closeEvent(self, event):
+        # sampler thread को रोकें ताकि ऐप साफ़ बंद हो
+        self.sampler.unsubscribe(self.onSample)
+        self.sampler.stop()
+        super().closeEvent(event)
 
 def main():
     app = QApplication(sys.argv)
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Set VYAAS_HEDGING=0 to never send hedged requests
+HEDGING_ENABLED = os.getenv("VYAAS_HEDGING", "1") != "0"
+
+# Blocking HTTP calls run here so they never sit on the voice event loop
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("VYAAS_HTTP_WORKERS", "16")),
+                           thread_name_prefix="outbound")
+
+
+# A cancelled or interrupted call is not an upstream failure
+_INTERRUPTS = (asyncio.CancelledError, KeyboardInterrupt)
+
+
+class CircuitOpenError(Exception):
+    """The endpoint failed too often recently; the call was not attempted."""
+
+
+class EndpointTimeout(TimeoutError):
+    """The endpoint did not answer within its time budget."""
+
+
+def default_is_failure(result) -> bool:
+    """Server-side errors count against the breaker; 4xx (bad input) does not."""
+    status = getattr(result, "status_code", 200)
+    return status >= 500 or status == 429
+
+
+@dataclass
+class EndpointPolicy:
+    timeout: float = 10.0           # total budget for one call, hedges included
+    failure_threshold: int = 5      # consecutive failures before the breaker opens
+    reset_after: float = 30.0       # seconds open before a single trial call is let through
+    hedge: bool = False             # send a second request once the p95 latency has passed
+    hedge_min_samples: int = 20     # p95 is only trusted after this many successes
+    hedge_floor: float = 0.05       # never hedge sooner than this (seconds)
+    window: int = 200               # successful latencies kept for percentiles
+
+
+class Endpoint:
+    """Timeout budget + circuit breaker + optional hedging for one upstream."""
+
+    def __init__(self, name: str, policy: EndpointPolicy):
+        self.name = name
+        self.policy = policy
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.latencies = deque(maxlen=policy.window)
+        self.counters = {
+            "calls": 0, "successes": 0, "failures": 0, "timeouts": 0,
+            "short_circuits": 0, "hedges": 0, "hedge_wins": 0, "opens": 0,
+        }
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self) -> float:
+        return self.policy.timeout
+
+    # --- breaker ---
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"⚡ Circuit '{self.name}': {self.state} → {state}")
+            self.state = state
+            if state == OPEN:
+                self.opened_at = time.monotonic()
+                self.counters["opens"] += 1
+
+    def _admit(self) -> None:
+        with self._lock:
+            self.counters["calls"] += 1
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.policy.reset_after:
+                    self.counters["short_circuits"] += 1
+                    raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._trial_in_flight:
+                    self.counters["short_circuits"] += 1
+                    raise CircuitOpenError(f"{self.name} is recovering (trial call in flight)")
+                self._trial_in_flight = True
+
+    def _release(self) -> None:
+        """The call was cancelled, not failed: free the half-open trial slot, leave the breaker alone."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _record(self, ok: bool, latency: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+            if ok:
+                self.counters["successes"] += 1
+                self.latencies.append(latency)
+                self.consecutive_failures = 0
+                self._set_state(CLOSED)
+                return
+            self.counters["failures"] += 1
+            if timed_out:
+                self.counters["timeouts"] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.policy.failure_threshold:
+                self._set_state(OPEN)
+
+    # --- latency ---
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            values = sorted(self.latencies)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(pct / 100.0 * len(values)))]
+
+    def _hedge_delay(self, budget: float) -> Optional[float]:
+        if not (HEDGING_ENABLED and self.policy.hedge) or len(self.latencies) < self.policy.hedge_min_samples:
+            return None
+        p95 = self.percentile(95)
+        delay = max(self.policy.hedge_floor, p95)
+        # a hedge that cannot finish inside the budget is wasted work
+        return delay if delay < budget * 0.5 else None
+
+    def _outcome(self, future, start: float, is_failure: Callable, hedged: bool, first):
+        latency = time.monotonic() - start
+        error = future.exception()
+        if error is not None:
+            self._record(False, latency)
+            raise error
+        result = future.result()
+        try:
+            ok = not is_failure(result)
+        except _INTERRUPTS:
+            self._release()
+            raise
+        except BaseException:
+            self._record(False, latency)
+            raise
+        self._record(ok, latency)
+        if hedged and future is not first:
+            with self._lock:
+                self.counters["hedge_wins"] += 1
+        return result
+
+    # --- calls ---
+    def call_sync(self, fn: Callable, *args, budget: float = None, is_failure: Callable = None, **kwargs):
+        """Run a blocking call under this endpoint's budget/breaker (for worker threads)."""
+        self._admit()
+        budget = min(budget or self.policy.timeout, self.policy.timeout)
+        is_failure = is_failure or default_is_failure
+        start = time.monotonic()
+        deadline = start + budget
+        attempt = partial(fn, *args, **kwargs)
+        try:
+            futures = [_pool.submit(attempt)]
+
+            hedge_delay = self._hedge_delay(budget)
+            done, _ = wait(futures, timeout=hedge_delay if hedge_delay else budget, return_when=FIRST_COMPLETED)
+            if not done and hedge_delay:
+                with self._lock:
+                    self.counters["hedges"] += 1
+                futures.append(_pool.submit(attempt))
+                done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            # if the first finisher failed, give a still-running hedge the rest of the budget
+            if done and len(futures) > 1 and next(iter(done)).exception() is not None:
+                pending = [f for f in futures if f not in done]
+                if pending:
+                    more, _ = wait(pending, timeout=max(0.0, deadline - time.monotonic()))
+                    done = more or done
+        except _INTERRUPTS:
+            self._release()
+            raise
+        except BaseException:
+            self._record(False, time.monotonic() - start)
+            raise
+        if not done:
+            self._record(False, budget, timed_out=True)
+            raise EndpointTimeout(f"{self.name} did not respond within {budget:.1f}s")
+        return self._outcome(next(iter(done)), start, is_failure, len(futures) > 1, futures[0])
+
+    async def call(self, fn: Callable, *args, budget: float = None, is_failure: Callable = None, **kwargs):
+        """Async version of call_sync: the blocking fn runs off the event loop."""
+        self._admit()
+        budget = min(budget or self.policy.timeout, self.policy.timeout)
+        is_failure = is_failure or default_is_failure
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        deadline = start + budget
+        attempt = partial(fn, *args, **kwargs)
+        try:
+            futures = [loop.run_in_executor(_pool, attempt)]
+
+            hedge_delay = self._hedge_delay(budget)
+            done, _ = await asyncio.wait(futures, timeout=hedge_delay if hedge_delay else budget,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done and hedge_delay:
+                with self._lock:
+                    self.counters["hedges"] += 1
+                futures.append(loop.run_in_executor(_pool, attempt))
+                done, _ = await asyncio.wait(futures, timeout=max(0.0, deadline - time.monotonic()),
+                                             return_when=asyncio.FIRST_COMPLETED)
+            if done and len(futures) > 1 and next(iter(done)).exception() is not None:
+                pending = [f for f in futures if f not in done]
+                if pending:
+                    more, _ = await asyncio.wait(pending, timeout=max(0.0, deadline - time.monotonic()))
+                    done = more or done
+        except _INTERRUPTS:
+            # cancelled (e.g. barge-in interrupted the tool): says nothing about the upstream
+            self._release()
+            raise
+        except BaseException:
+            self._record(False, time.monotonic() - start)
+            raise
+        if not done:
+            self._record(False, budget, timed_out=True)
+            raise EndpointTimeout(f"{self.name} did not respond within {budget:.1f}s")
+        return self._outcome(next(iter(done)), start, is_failure, len(futures) > 1, futures[0])
+
+    def metrics(self) -> Dict:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "timeout_s": self.policy.timeout,
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                **self.counters,
+            }
+
+
+_endpoints: Dict[str, Endpoint] = {}
+_registry_lock = threading.Lock()
+
+
+def endpoint(name: str, **policy) -> Endpoint:
+    """
+    Get (or create on first use) the endpoint called `name`.
+
+    Policy fields can be passed on first registration; the timeout can be
+    overridden with VYAAS_TIMEOUT_<NAME> (seconds), e.g. VYAAS_TIMEOUT_OPENWEATHER=3.
+    """
+    with _registry_lock:
+        ep = _endpoints.get(name)
+        if ep is None:
+            env_timeout = os.getenv(f"VYAAS_TIMEOUT_{name.upper()}")
+            if env_timeout:
+                policy["timeout"] = float(env_timeout)
+            ep = _endpoints[name] = Endpoint(name, EndpointPolicy(**policy))
+        return ep
+
+
+def metrics() -> Dict[str, Dict]:
+    """Breaker state and counters for every endpoint seen so far."""
+    with _registry_lock:
+        endpoints = list(_endpoints.values())
+    return {ep.name: ep.metrics() for ep in endpoints}
+
+
+def format_metrics() -> str:
+    lines = [f"{'endpoint':<14} {'state':<10} {'calls':>6} {'fail':>5} {'t/o':>5} {'short':>6} {'hedge':>6} {'won':>4} {'p95 ms':>8}"]
+    for name, m in metrics().items():
+        p95 = f"{m['p95_ms']:.0f}" if m["p95_ms"] is not None else "-"
+        lines.append(f"{name:<14} {m['state']:<10} {m['calls']:>6} {m['failures']:>5} {m['timeouts']:>5} "
+                     f"{m['short_circuits']:>6} {m['hedges']:>6} {m['hedge_wins']:>4} {p95:>8}")
+    return "\n".join(lines)
@@ -0,0 +1,530 @@
+"""
+Headless system metrics service (CPU, cores, memory, disk, network, processes).
+
+One SystemSampler per process reads psutil on a daemon thread, each metric
+at its own rate (SAMPLE_RATES, overridable with SYSTEM_SAMPLE_RATES="cpu=0.5,procs=5").
+Every consumer reads the same cached values, so adding readers never adds
+psutil calls:
+
+    sampler.snapshot()          latest values (dict copy, microseconds)
+    sampler.subscribe(fn)       fn(fresh) on the sampler thread after each pass
+    GET /system.json            values + per-metric age, from start_server()
+
+Only one process samples continuously: this module run with --serve, as
+its own process next to the agent and the HUD. The HUD (nova_safe.py)
+reads it through RemoteSampler and samples locally only while the service
+is not running; the agent's system_status tool uses fetch() and falls back
+to a one-off reading. The agent worker never runs a sampler thread, so
+process scans stay off the realtime audio loop's GIL.
+
+Readers may pass ?agent_pid=N so the process view can show the assistant.
+
+Usage:
+    python system_metrics.py                 # print one snapshot
+    python system_metrics.py --serve         # the shared service: sample + serve /system.json
+    python system_metrics.py --serve --rate cpu=0.5 --rate procs=5
+"""
+import argparse
+import heapq
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler
+from typing import Callable, Dict, List, Optional
+
+from lazy_imports import lazy_import
+from local_http import LocalServer
+
+psutil = lazy_import("psutil", optional=True)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds between reads per metric: temperature/IP rarely, CPU/network often
+SAMPLE_RATES = {
+    "cpu": 1.0,
+    "cores": 1.0,
+    "net": 1.0,
+    "mem": 2.0,
+    "procs": 2.0,
+    "temp": 5.0,
+    "disk": 10.0,
+    "battery": 15.0,
+    "ip": 30.0,
+}
+SAMPLER_TICK = 0.25
+
+# Process view: always-listed names (no .exe), how many top consumers, and the agent's pid
+WATCH_PROCESSES = [n.strip().lower() for n in os.getenv("SYSTEM_WATCH_PROCESSES", "chrome,msedge,firefox").split(",") if n.strip()]
+TOP_PROCESSES = int(os.getenv("SYSTEM_TOP_PROCESSES", "5"))
+AGENT_PID = int(os.getenv("SYSTEM_AGENT_PID", "0"))
+
+SYSTEM_METRICS_HOST = os.getenv("SYSTEM_METRICS_HOST", "127.0.0.1")
+SYSTEM_METRICS_PORT = int(os.getenv("SYSTEM_METRICS_PORT", "9466"))
+# Where RemoteSampler (the HUD) reads the agent's snapshot, and how often
+SYSTEM_METRICS_URL = os.getenv("SYSTEM_METRICS_URL", f"http://{SYSTEM_METRICS_HOST}:{SYSTEM_METRICS_PORT}")
+REMOTE_POLL_SECONDS = float(os.getenv("SYSTEM_METRICS_POLL", "1"))
+REMOTE_TIMEOUT = 0.5
+
+
+def parse_rates(text: str) -> Dict[str, float]:
+    """"cpu=0.5,procs=5" -> {"cpu": 0.5, "procs": 5.0}; unknown metrics are ignored."""
+    rates = {}
+    for part in text.split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if name in SAMPLE_RATES and value.strip():
+            rates[name] = float(value)
+    return rates
+
+
+class ProcessTable:
+    """
+    All processes in one psutil.process_iter pass with ATTRS.
+
+    process_iter keeps its Process objects between calls, so cpu_percent is
+    the delta since the previous sample (no interval/sleep). ppid comes from
+    the same pass, so the agent's children need no separate children() scan.
+    """
+
+    ATTRS = ["pid", "ppid", "name", "cpu_percent", "memory_info"]
+
+    def __init__(self, watch: List[str] = None, top_n: int = TOP_PROCESSES, agent_pid: int = AGENT_PID):
+        self.watch = list(WATCH_PROCESSES if watch is None else watch)
+        self.top_n = top_n
+        self.agent_pid = agent_pid  # may be updated from another thread (plain int assignment)
+        self.ncpu = None
+
+    def sample(self) -> Dict:
+        if self.ncpu is None:
+            self.ncpu = psutil.cpu_count() or 1
+        rows = {}
+        children = {}
+        for proc in psutil.process_iter(self.ATTRS, ad_value=None):
+            info = proc.info
+            pid = info["pid"]
+            if pid == 0:
+                continue  # Windows "System Idle Process" reports idle CPU
+            mem = info["memory_info"]
+            rows[pid] = {
+                "pid": pid,
+                "name": os.path.splitext(info["name"] or "?")[0].lower(),
+                # share of the whole machine, comparable with the system CPU figure
+                "cpu": (info["cpu_percent"] or 0.0) / self.ncpu,
+                "rss_mb": mem.rss / 1024.0 / 1024.0 if mem else 0.0,
+            }
+            children.setdefault(info["ppid"], []).append(pid)
+
+        agent = None
+        me = rows.get(self.agent_pid)
+        if me:
+            tree, stack, seen = [], list(children.get(self.agent_pid, ())), {self.agent_pid}
+            while stack:
+                pid = stack.pop()
+                if pid in seen or pid not in rows:
+                    continue
+                seen.add(pid)
+                tree.append(rows[pid])
+                stack.extend(children.get(pid, ()))
+            agent = dict(me, children=len(tree),
+                         children_cpu=sum(r["cpu"] for r in tree),
+                         children_rss_mb=sum(r["rss_mb"] for r in tree))
+
+        watch = []
+        for name in self.watch:
+            matched = [r for r in rows.values() if r["name"] == name]
+            if matched:
+                watch.append({"name": name, "count": len(matched),
+                              "cpu": sum(r["cpu"] for r in matched),
+                              "rss_mb": sum(r["rss_mb"] for r in matched)})
+
+        top = heapq.nlargest(self.top_n, rows.values(), key=lambda r: (r["cpu"], r["rss_mb"]))
+        return {"agent": agent, "watch": watch, "top": top, "count": len(rows)}
+
+
+class SystemSampler:
+    """
+    Reads due metrics every SAMPLER_TICK seconds on a daemon thread.
+
+    Only metrics whose interval has passed are read; subscribers get just
+    those fresh values, snapshot() gets all latest values. With
+    `simulate=True` missing sensors (or a missing psutil) produce plausible
+    demo values instead of nothing; the HUD uses that, the agent does not.
+    """
+
+    def __init__(self, rates: Dict[str, float] = None, simulate: bool = False):
+        self.rates = dict(SAMPLE_RATES)
+        self.rates.update(parse_rates(os.getenv("SYSTEM_SAMPLE_RATES", "")))
+        self.rates.update(rates or {})
+        self.simulate = simulate
+        self.processes = ProcessTable()
+        self.passes = 0
+        self._values: Dict[str, object] = {}
+        self._sampled_at: Dict[str, float] = {}
+        self._next_due: Dict[str, float] = {}
+        self._last_bytes = None
+        self._subscribers: List[Callable] = []
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- consumers ---
+    def subscribe(self, callback: Callable) -> None:
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return dict(self._values)
+
+    def ages(self) -> Dict[str, float]:
+        now = time.monotonic()
+        with self._lock:
+            return {name: round(now - at, 2) for name, at in self._sampled_at.items()}
+
+    # --- lifecycle ---
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "SystemSampler":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="system-metrics", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(SAMPLER_TICK)
+
+    def sample(self, force: bool = False) -> Dict:
+        """Read the due metrics (all of them with force=True) and notify subscribers."""
+        with self._sample_lock:
+            now = time.monotonic()
+            due = [name for name in self.rates if force or now >= self._next_due.get(name, 0.0)]
+            fresh = {}
+            for name in due:
+                self._next_due[name] = now + self.rates[name]
+                try:
+                    value = getattr(self, "read_" + name)()
+                except Exception:
+                    value = None
+                if value is not None:
+                    fresh[name] = value
+            if not fresh:
+                return fresh
+            with self._lock:
+                self._values.update(fresh)
+                self._sampled_at.update(dict.fromkeys(fresh, now))
+                self.passes += 1
+                subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(fresh)
+            except Exception as e:
+                logger.error(f"❌ System metrics subscriber error: {e}")
+        return fresh
+
+    # --- one reader per metric; None = no value this time ---
+    def read_cpu(self):
+        if not psutil:
+            return random.uniform(8, 88) if self.simulate else None
+        return psutil.cpu_percent(interval=None)
+
+    def read_cores(self):
+        if not psutil:
+            return [random.uniform(5, 90) for _ in range(4)] if self.simulate else None
+        return psutil.cpu_percent(interval=None, percpu=True)
+
+    def read_mem(self):
+        if not psutil:
+            return random.uniform(22, 86) if self.simulate else None
+        return psutil.virtual_memory().percent
+
+    def read_disk(self):
+        if not psutil:
+            return random.uniform(12, 88) if self.simulate else None
+        return psutil.disk_usage(os.path.abspath(os.sep)).percent
+
+    def read_temp(self):
+        temp_c = None
+        if psutil and hasattr(psutil, "sensors_temperatures"):
+            try:
+                for entries in (psutil.sensors_temperatures() or {}).values():
+                    if entries:
+                        temp_c = entries[0].current
+                        break
+            except Exception:
+                temp_c = None
+        if temp_c is None and self.simulate:
+            temp_c = 48 + 12 * math.sin(time.time() / 6.5) + random.uniform(-2, 2)
+        return temp_c
+
+    def read_battery(self):
+        batt_pct = None
+        if psutil and hasattr(psutil, "sensors_battery"):
+            try:
+                b = psutil.sensors_battery()
+                if b:
+                    batt_pct = b.percent
+            except Exception:
+                batt_pct = None
+        if batt_pct is None and self.simulate:
+            batt_pct = 70 + 8 * math.sin(time.time() / 10.0) + random.uniform(-4, 4)
+        return batt_pct
+
+    def read_ip(self):
+        # first IPv4 address that is not link-local (169.254.x.x)
+        if not psutil:
+            return "192.168.1.101" if self.simulate else None
+        for addrs in psutil.net_if_addrs().values():
+            for a in addrs:
+                address = str(getattr(a, "address", ""))
+                if address.count(".") == 3 and not address.startswith("169.254"):
+                    return address
+        return "0.0.0.0"
+
+    def read_net(self):
+        # (upload, download) in MB/s: byte delta / elapsed time; no value on the first read
+        if not psutil:
+            return (random.uniform(0.4, 3.2), random.uniform(3.3, 18.3)) if self.simulate else None
+        io = psutil.net_io_counters()
+        nowb = (time.monotonic(), io.bytes_sent, io.bytes_recv)
+        last, self._last_bytes = self._last_bytes, nowb
+        if not last or nowb[0] <= last[0]:
+            return None
+        dt = nowb[0] - last[0]
+        return (max(nowb[1] - last[1], 0) / dt / 1024.0 / 1024.0,
+                max(nowb[2] - last[2], 0) / dt / 1024.0 / 1024.0)
+
+    def read_procs(self):
+        return self.processes.sample() if psutil else None
+
+
+sampler = SystemSampler()
+
+
+def report(s: SystemSampler = None) -> Dict:
+    """What /system.json serves: latest values plus how old each one is."""
+    s = s or sampler
+    return {"time": round(time.time(), 3), "rates": s.rates, "age_s": s.ages(), "values": s.snapshot()}
+
+
+# --- HTTP endpoint ---
+class _SystemHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path != "/system.json":
+            self.send_error(404)
+            return
+        s = self.server.sampler
+        pid = urllib.parse.parse_qs(query).get("agent_pid", ["0"])[0]
+        if pid.isdigit() and int(pid):
+            s.processes.agent_pid = int(pid)
+        body = json.dumps(report(s)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server = LocalServer("system-metrics-http", "🖥️ System metrics at {url}/system.json")
+
+
+def start_server(host: str = SYSTEM_METRICS_HOST, port: int = SYSTEM_METRICS_PORT, s: SystemSampler = None) -> str:
+    """Serve /system.json from a daemon thread (once), starting the sampler too; returns the base URL."""
+    s = s or sampler
+    if not s.running:
+        # cpu/net/process figures are deltas: have a second reading ready for the first request
+        s.sample(force=True)
+        time.sleep(0.5)
+        s.start()
+    return _server.start(_SystemHandler, host, port, sampler=s)
+
+
+def server_url() -> Optional[str]:
+    return _server.url()
+
+
+def stop_server() -> None:
+    _server.stop()
+
+
+# --- Reading another process's sampler ---
+def fetch(url: str = SYSTEM_METRICS_URL, agent_pid: int = 0, timeout: float = REMOTE_TIMEOUT) -> Optional[Dict]:
+    """One /system.json report from the service, or None if it does not answer."""
+    url = url.rstrip("/") + "/system.json"
+    if agent_pid:
+        url += f"?agent_pid={agent_pid}"
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            data = json.load(resp)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and "values" in data else None
+
+
+class RemoteSampler:
+    """
+    Same consumer interface as SystemSampler, fed from another process's /system.json.
+
+    A daemon thread polls the endpoint every `interval` seconds and passes
+    subscribers only the metrics whose sample time moved since the last
+    read. While the endpoint does not answer (service not running) the local
+    `fallback` sampler runs instead and is stopped again once it answers,
+    so at most one process samples at a time.
+    """
+
+    def __init__(self, url: str = SYSTEM_METRICS_URL, interval: float = REMOTE_POLL_SECONDS, fallback: SystemSampler = None):
+        self.url = url
+        self.interval = interval
+        self.fallback = fallback or sampler
+        self.remote: Optional[bool] = None   # None until the first poll
+        self._values: Dict[str, object] = {}
+        self._taken: Dict[str, float] = {}
+        self._subscribers: List[Callable] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        return self.fallback.rates
+
+    @property
+    def processes(self) -> "ProcessTable":
+        return self.fallback.processes
+
+    def subscribe(self, callback: Callable) -> None:
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def snapshot(self) -> Dict:
+        if self.remote is False:
+            return self.fallback.snapshot()
+        with self._lock:
+            return dict(self._values)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "RemoteSampler":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="system-metrics-remote", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if self.remote is False:
+            self.fallback.unsubscribe(self._notify)
+            self.fallback.stop()
+        self.remote = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            fresh = self.poll()
+            self._use_remote(fresh is not None)
+            if fresh:
+                self._notify(fresh)
+            self._stop.wait(self.interval)
+
+    def poll(self) -> Optional[Dict]:
+        """One read of the endpoint: metrics sampled since the last read, or None if it did not answer."""
+        data = fetch(self.url, self.processes.agent_pid)
+        try:
+            now, ages, values = data["time"], data["age_s"], data["values"]
+        except (KeyError, TypeError):
+            return None
+        fresh = {}
+        with self._lock:
+            for name, value in values.items():
+                taken = now - ages.get(name, 0.0)
+                # ages are rounded to 10 ms, so only a clearly newer sample counts
+                if taken > self._taken.get(name, 0.0) + 0.05:
+                    self._taken[name] = taken
+                    fresh[name] = value
+            self._values.update(fresh)
+        return fresh
+
+    def _use_remote(self, remote: bool) -> None:
+        if remote == self.remote:
+            return
+        self.remote = remote
+        if remote:
+            self.fallback.unsubscribe(self._notify)
+            self.fallback.stop()
+            logger.info(f"🖥️ System metrics from {self.url}")
+        else:
+            self.fallback.subscribe(self._notify)
+            self.fallback.start()
+            logger.info(f"🖥️ No system metrics at {self.url}, sampling locally")
+
+    def _notify(self, fresh: Dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(fresh)
+            except Exception as e:
+                logger.error(f"❌ System metrics subscriber error: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless system metrics sampler.")
+    parser.add_argument("--serve", action="store_true", help="keep sampling and serve /system.json")
+    parser.add_argument("--host", default=SYSTEM_METRICS_HOST)
+    parser.add_argument("--port", type=int, default=SYSTEM_METRICS_PORT)
+    parser.add_argument("--rate", action="append", default=[], help="metric=seconds, e.g. cpu=0.5 (repeatable)")
+    args = parser.parse_args()
+    sampler.rates.update(parse_rates(",".join(args.rate)))
+    if not args.serve:
+        sampler.sample(force=True)
+        time.sleep(0.5)  # cpu/net/process figures are deltas: take a second reading
+        sampler.sample(force=True)
+        print(json.dumps(report(), indent=2))
+    else:
+        start_server(args.host, args.port)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            stop_server()
+            sampler.stop()
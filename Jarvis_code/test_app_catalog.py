@@ -0,0 +1,109 @@
+import os
+
+from app_catalog import AppCatalog, parse_desktop_file
+
+
+def write_desktop(folder, filename, body):
+    path = os.path.join(folder, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(body)
+    return path
+
+
+def write_exe(folder, name):
+    path = os.path.join(folder, name)
+    with open(path, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(path, 0o755)
+    return path
+
+
+def bump_mtime(folder):
+    # coarse filesystem clocks: make sure the directory looks changed
+    st = os.stat(folder)
+    os.utime(folder, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+CODE_DESKTOP = """[Desktop Entry]
+Type=Application
+Name=Visual Studio Code
+GenericName=Text Editor
+Keywords=vscode;editor;
+Exec=/usr/share/code/code --unity-launch %F
+
+[Desktop Action new-empty-window]
+Name=New Empty Window
+Exec=/usr/share/code/code --new-window %F
+"""
+
+
+def make_catalog(tmp_path, **kwargs):
+    apps, bin_dir = tmp_path / "applications", tmp_path / "bin"
+    apps.mkdir()
+    bin_dir.mkdir()
+    catalog = AppCatalog({"desktop": [str(apps)], "path": [str(bin_dir)]},
+                         cache_path=str(tmp_path / "catalog.json"), **kwargs)
+    return catalog, str(apps), str(bin_dir)
+
+
+def test_parse_desktop_file(tmp_path):
+    entry = parse_desktop_file(write_desktop(str(tmp_path), "code.desktop", CODE_DESKTOP))
+    assert entry.name == "Visual Studio Code"
+    assert entry.target == "/usr/share/code/code --unity-launch"  # field codes stripped, action section ignored
+    assert entry.kind == "desktop"
+    assert entry.keywords == "Text Editor vscode editor"
+
+
+def test_parse_desktop_file_skips_hidden_and_non_apps(tmp_path):
+    hidden = write_desktop(str(tmp_path), "a.desktop", "[Desktop Entry]\nName=A\nExec=a\nNoDisplay=true\n")
+    link = write_desktop(str(tmp_path), "b.desktop", "[Desktop Entry]\nType=Link\nName=B\nURL=http://x\n")
+    no_exec = write_desktop(str(tmp_path), "c.desktop", "[Desktop Entry]\nName=C\n")
+    assert parse_desktop_file(hidden) is None
+    assert parse_desktop_file(link) is None
+    assert parse_desktop_file(no_exec) is None
+    assert parse_desktop_file(str(tmp_path / "missing.desktop")) is None
+
+
+def test_scan_desktop_and_path(tmp_path):
+    catalog, apps, bin_dir = make_catalog(tmp_path)
+    write_desktop(apps, "code.desktop", CODE_DESKTOP)
+    write_desktop(apps, "uninstall.desktop", "[Desktop Entry]\nName=Uninstall Foo\nExec=foo --uninstall\n")
+    write_exe(bin_dir, "htop")
+    with open(os.path.join(bin_dir, "notes.txt"), "w") as f:
+        f.write("not executable")
+
+    names = {e.name: e.kind for e in catalog.entries()}
+    assert names == {"Visual Studio Code": "desktop", "htop": "path"}
+    # a second catalog is served from the cache without re-reading the folders
+    again = AppCatalog(catalog.dirs, cache_path=catalog.cache_path)
+    again._load_cache()
+    assert again.refresh() == 0
+    assert {e.name for e in again.entries()} == set(names)
+
+
+def test_resolve(tmp_path):
+    catalog, apps, bin_dir = make_catalog(tmp_path)
+    write_desktop(apps, "code.desktop", CODE_DESKTOP)
+    write_exe(bin_dir, "htop")
+    assert catalog.resolve("visual studio code").name == "Visual Studio Code"
+    assert catalog.resolve("vs code").name == "Visual Studio Code"
+    assert catalog.resolve("htop").kind == "path"
+    assert catalog.resolve("photoshop") is None
+
+
+def test_resolve_miss_rescans_for_new_installs(tmp_path):
+    catalog, apps, bin_dir = make_catalog(tmp_path, rescan_interval=0)
+    assert catalog.resolve("spotify") is None
+    write_desktop(apps, "spotify.desktop", "[Desktop Entry]\nName=Spotify\nExec=spotify %U\n")
+    bump_mtime(apps)
+    assert catalog.resolve("spotify").target == "spotify"
+
+
+def test_resolve_miss_rescan_is_rate_limited(tmp_path):
+    catalog, apps, bin_dir = make_catalog(tmp_path, rescan_interval=3600)
+    assert catalog.resolve("spotify") is None
+    write_desktop(apps, "spotify.desktop", "[Desktop Entry]\nName=Spotify\nExec=spotify %U\n")
+    bump_mtime(apps)
+    assert catalog.resolve("spotify") is None
+    catalog.refreshed_at -= 3600
+    assert catalog.resolve("spotify").name == "Spotify"
@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import pytest
+
+from resilience import CLOSED, HALF_OPEN, OPEN, Endpoint, EndpointPolicy
+
+
+def make_endpoint(**policy):
+    return Endpoint("test", EndpointPolicy(timeout=5, **policy))
+
+
+async def cancel_call(ep, after=0.02):
+    task = asyncio.ensure_future(ep.call(time.sleep, 0.2))
+    await asyncio.sleep(after)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+def test_cancelled_calls_do_not_open_breaker():
+    ep = make_endpoint(failure_threshold=3)
+
+    async def main():
+        for _ in range(5):
+            await cancel_call(ep)
+
+    asyncio.run(main())
+    assert ep.state == CLOSED
+    assert ep.consecutive_failures == 0
+    assert ep.counters["failures"] == 0
+
+
+def test_cancelled_trial_keeps_half_open_and_frees_slot():
+    ep = make_endpoint(failure_threshold=1, reset_after=0.01)
+    with pytest.raises(ZeroDivisionError):
+        ep.call_sync(lambda: 1 / 0)
+    assert ep.state == OPEN
+    time.sleep(0.02)
+
+    async def main():
+        await cancel_call(ep)
+        assert ep.state == HALF_OPEN
+        # the slot was released, so the next call is the new trial
+        return await ep.call(lambda: 42)
+
+    assert asyncio.run(main()) == 42
+    assert ep.state == CLOSED
+
+
+def test_real_failures_still_open_breaker():
+    ep = make_endpoint(failure_threshold=3)
+    for _ in range(3):
+        with pytest.raises(ZeroDivisionError):
+            ep.call_sync(lambda: 1 / 0)
+    assert ep.state == OPEN
@@ -0,0 +1,49 @@
+from window_registry import WindowRegistry
+
+
+def make_registry(rows, processes):
+    """rows: [(handle, title)] top-most first; processes: {handle: process name}."""
+    registry = WindowRegistry(enumerate_windows=lambda: [(h, t, None) for h, t in rows],
+                              pid_of=lambda handle: handle, ttl=60)
+    registry._process_name = lambda pid: processes.get(pid, "")
+    return registry
+
+
+def test_process_match_beats_title_substring():
+    # Notepad is top-most and its title contains "chrome"; the browser must still win
+    registry = make_registry([(1, "chrome tips.txt - Notepad"), (2, "YouTube - Google Chrome")],
+                             {1: "notepad", 2: "chrome"})
+    assert registry.best("chrome").handle == 2
+    scores = {w.handle: s for s, w in registry.ranked("chrome")}
+    assert scores[2] > scores[1]
+
+
+def test_title_substring_beats_fuzzy_match():
+    registry = make_registry([(1, "Calculator Pro"), (2, "Report.docx - Word")],
+                             {1: "calcpro", 2: "winword"})
+    assert registry.best("report").handle == 2
+
+
+def test_no_match_below_threshold():
+    registry = make_registry([(1, "Untitled - Notepad")], {1: "notepad"})
+    assert registry.best("spotify") is None
+
+
+def test_exact_skips_fuzzy_lookalikes():
+    registry = make_registry([(1, "Steam"), (2, "Spotlight"), (3, "Untitled - Notepad"), (4, "Password Manager")],
+                             {1: "steam", 2: "spotlight", 3: "notepad", 4: "keepass"})
+    for query in ("teams", "spotify", "notes", "word"):
+        assert registry.exact(query) == [], query
+
+
+def test_exact_prefers_process_and_whole_words():
+    registry = make_registry([(1, "chrome tips.txt - Notepad"), (2, "YouTube - Google Chrome")],
+                             {1: "notepad", 2: "chrome"})
+    assert [w.handle for w in registry.exact("chrome")] == [2]
+    assert [w.handle for w in registry.exact("tips")] == [1]
+
+
+def test_exact_returns_all_ties():
+    registry = make_registry([(1, "Inbox - Outlook"), (2, "Docs - Google Chrome"), (3, "Mail - Google Chrome")],
+                             {1: "outlook", 2: "chrome", 3: "chrome"})
+    assert [w.handle for w in registry.exact("chrome")] == [2, 3]
@@ -0,0 +1,318 @@
+"""
+Per-tool metrics for the agent's function tools.
+
+Decorate tools with @metered_tool() instead of @function_tool(): every call
+records latency (histogram), errors, argument/result sizes and how many
+calls of that tool were running at once. Metrics are served on a local
+HTTP endpoint and written to a JSON file on shutdown.
+
+    GET /metrics        Prometheus text format (tools + outbound endpoints)
+    GET /metrics.json   the same as JSON
+
+Usage:
+    python tool_metrics.py --dump tool_metrics.json   # print a saved dump as a table
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Callable, Dict, List, Optional
+
+import resilience
+from local_http import LocalServer
+
+try:
+    from livekit.agents import function_tool
+except ImportError:
+    function_tool = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+METRICS_DUMP = os.getenv("TOOL_METRICS_DUMP", "tool_metrics.json")
+
+# Histogram bucket upper bounds in milliseconds (+Inf is implicit)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+def _size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value.encode("utf-8") if isinstance(value, str) else value)
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(value).encode("utf-8"))
+
+
+def is_error_result(result) -> bool:
+    """Tools report most failures as a "❌ ..." string instead of raising."""
+    return isinstance(result, str) and result.startswith("❌")
+
+
+class ToolStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.latency_sum_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.errors = 0          # raised exceptions
+        self.failures = 0        # "❌ ..." results
+        self.arg_bytes = 0
+        self.result_bytes = 0
+        self.result_bytes_max = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.last_called = 0.0
+
+    def start(self, arg_bytes: int) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.arg_bytes += arg_bytes
+        self.last_called = time.time()
+
+    def finish(self, latency_ms: float, result_bytes: int, error: bool, failure: bool) -> None:
+        self.in_flight -= 1
+        self.count += 1
+        self.latency_sum_ms += latency_ms
+        self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.errors += int(error)
+        self.failures += int(failure)
+        self.result_bytes += result_bytes
+        self.result_bytes_max = max(self.result_bytes_max, result_bytes)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound holding the q-quantile (what Prometheus would estimate)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.latency_max_ms
+        return self.latency_max_ms
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "latency_ms": {
+                "mean": round(self.latency_sum_ms / self.count, 2) if self.count else None,
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "max": round(self.latency_max_ms, 2),
+                "sum": round(self.latency_sum_ms, 2),
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS_MS] + ["+Inf"], self.buckets)),
+            },
+            "arg_bytes_total": self.arg_bytes,
+            "result_bytes_total": self.result_bytes,
+            "result_bytes_max": self.result_bytes_max,
+            "last_called": self.last_called or None,
+        }
+
+
+class ToolMetrics:
+    def __init__(self):
+        self.started = time.time()
+        self._tools: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable] = []
+
+    # Listeners get (event, fields) for every "tool_start" / "tool_end"; they run
+    # inline in the tool call, so they must be cheap and non-blocking.
+    def add_listener(self, callback: Callable) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event: str, fields: Dict) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(event, fields)
+            except Exception as e:
+                logger.error(f"❌ Tool metrics listener error: {e}")
+
+    def begin(self, name: str, arg_bytes: int) -> None:
+        with self._lock:
+            stats = self._tools.get(name)
+            if stats is None:
+                stats = self._tools[name] = ToolStats(name)
+            stats.start(arg_bytes)
+        if self._listeners:
+            self._notify("tool_start", {"tool": name})
+
+    def end(self, name: str, latency_ms: float, result_bytes: int, error: bool, failure: bool) -> None:
+        with self._lock:
+            self._tools[name].finish(latency_ms, result_bytes, error, failure)
+        if self._listeners:
+            self._notify("tool_end", {"tool": name, "latency_ms": round(latency_ms, 1),
+                                      "ok": not (error or failure)})
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            tools = {name: stats.snapshot() for name, stats in sorted(self._tools.items())}
+        return {"uptime_s": round(time.time() - self.started, 1), "tools": tools,
+                "endpoints": resilience.metrics()}
+
+    def prometheus(self) -> str:
+        with self._lock:
+            tools = sorted(self._tools.items())
+            lines = [
+                "# HELP vyaas_tool_latency_ms Tool call latency in milliseconds.",
+                "# TYPE vyaas_tool_latency_ms histogram",
+            ]
+            for name, s in tools:
+                cumulative = 0
+                for bound, n in zip(list(LATENCY_BUCKETS_MS) + ["+Inf"], s.buckets):
+                    cumulative += n
+                    lines.append(f'vyaas_tool_latency_ms_bucket{{tool="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'vyaas_tool_latency_ms_sum{{tool="{name}"}} {s.latency_sum_ms:.3f}')
+                lines.append(f'vyaas_tool_latency_ms_count{{tool="{name}"}} {s.count}')
+            for metric, kind, help_text, attr in (
+                ("vyaas_tool_errors_total", "counter", "Tool calls that raised.", "errors"),
+                ("vyaas_tool_failures_total", "counter", "Tool calls that returned an error message.", "failures"),
+                ("vyaas_tool_arg_bytes_total", "counter", "Serialized argument bytes.", "arg_bytes"),
+                ("vyaas_tool_result_bytes_total", "counter", "Result bytes returned to the model.", "result_bytes"),
+                ("vyaas_tool_in_flight", "gauge", "Calls currently running.", "in_flight"),
+                ("vyaas_tool_max_in_flight", "gauge", "Highest concurrency seen.", "max_in_flight"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+                lines.extend(f'{metric}{{tool="{name}"}} {getattr(s, attr)}' for name, s in tools)
+
+        endpoints = resilience.metrics()
+        if endpoints:
+            lines.append("# HELP vyaas_endpoint_calls_total Outbound calls per endpoint and outcome.")
+            lines.append("# TYPE vyaas_endpoint_calls_total counter")
+            for name, m in endpoints.items():
+                for outcome in ("calls", "successes", "failures", "timeouts", "short_circuits", "hedges"):
+                    lines.append(f'vyaas_endpoint_calls_total{{endpoint="{name}",outcome="{outcome}"}} {m[outcome]}')
+            lines.append("# HELP vyaas_endpoint_open Whether the circuit breaker is open (1) or not (0).")
+            lines.append("# TYPE vyaas_endpoint_open gauge")
+            lines.extend(f'vyaas_endpoint_open{{endpoint="{name}"}} {int(m["state"] != resilience.CLOSED)}'
+                         for name, m in endpoints.items())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str = METRICS_DUMP) -> Optional[str]:
+        if not self._tools:
+            return None
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+        logger.info(f"📊 Tool metrics saved to {path}")
+        return path
+
+
+registry = ToolMetrics()
+
+
+def metered_tool(name: str = None, description: str = None) -> Callable:
+    """
+    Drop-in replacement for @function_tool() that also records metrics.
+
+    The wrapper keeps the tool's signature and docstring (functools.wraps),
+    so the schema the model sees is unchanged.
+    """
+    def decorate(fn: Callable) -> Callable:
+        tool_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            registry.begin(tool_name, _size([args, kwargs]) if (args or kwargs) else 0)
+            start = time.perf_counter()
+            result, error = None, False
+            try:
+                result = await fn(*args, **kwargs)
+                return result
+            except BaseException:
+                error = True
+                raise
+            finally:
+                registry.end(tool_name, (time.perf_counter() - start) * 1000.0, _size(result),
+                             error, is_error_result(result))
+
+        if function_tool is None:
+            return wrapper
+        return function_tool(wrapper, name=name, description=description)
+    return decorate
+
+
+# --- HTTP endpoint ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body, content_type = registry.prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body, content_type = json.dumps(registry.snapshot()).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server = LocalServer("tool-metrics", "📊 Tool metrics at {url}/metrics")
+
+
+def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> str:
+    """Serve /metrics and /metrics.json from a daemon thread (once) and return the base URL."""
+    return _server.start(_MetricsHandler, host, port)
+
+
+def metrics_url() -> Optional[str]:
+    return _server.url()
+
+
+def stop_metrics_server() -> None:
+    _server.stop()
+
+
+def format_table(snapshot: Dict) -> str:
+    rows: List[str] = [f"{'tool':<26} {'calls':>6} {'err':>4} {'fail':>5} {'mean':>8} {'p95':>8} {'max':>8} {'conc':>5}"]
+    by_time = sorted(snapshot["tools"].items(), key=lambda kv: -kv[1]["latency_ms"]["sum"])
+    for name, t in by_time:
+        lat = t["latency_ms"]
+        rows.append(f"{name:<26} {t['count']:>6} {t['errors']:>4} {t['failures']:>5} "
+                    f"{lat['mean'] or 0:>8.1f} {lat['p95'] or 0:>8.0f} {lat['max']:>8.1f} {t['max_in_flight']:>5}")
+    return "\n".join(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show a saved tool metrics dump.")
+    parser.add_argument("--dump", default=METRICS_DUMP, help="JSON file written on agent shutdown")
+    args = parser.parse_args()
+    try:
+        with open(args.dump, "r", encoding="utf-8") as f:
+            print(format_table(json.load(f)))
+    except FileNotFoundError:
+        print(f"❌ No metrics dump at {args.dump}")
+        sys.exit(1)
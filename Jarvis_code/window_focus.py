@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import os
+import time
+from window_registry import registry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Adaptive polling: check right away, then 50 ms, 70 ms, 98 ms, ... up to 500 ms between checks
+WINDOW_WAIT_TIMEOUT = float(os.getenv("WINDOW_WAIT_TIMEOUT", "8"))             # app launches (slow cold starts)
+FILE_WINDOW_WAIT_TIMEOUT = float(os.getenv("FILE_WINDOW_WAIT_TIMEOUT", "1.5"))  # files/folders: the old fixed wait
+WINDOW_POLL_FIRST = 0.05
+WINDOW_POLL_MAX = 0.5
+WINDOW_POLL_BACKOFF = 1.4
+
+
+def find_window(title_keyword: str, max_age: float = None):
+    """Best-matching window for the keyword (see WindowRegistry.best), or None."""
+    return registry.best(title_keyword, max_age)
+
+
+async def wait_for_window(title_keyword: str, timeout: float = WINDOW_WAIT_TIMEOUT):
+    """
+    Poll until a matching window exists or `timeout` runs out.
+
+    The first check is immediate and the interval grows geometrically, so a
+    window that is already open (or opens fast) is found in milliseconds
+    while a slow app still gets the full deadline.
+    """
+    if not registry.available:
+        return None
+    deadline = time.monotonic() + timeout
+    interval = WINDOW_POLL_FIRST
+    max_age = None  # first look may use the cached window list
+    while True:
+        window = await asyncio.to_thread(find_window, title_keyword, max_age)
+        max_age = 0    # afterwards we are waiting for a new window: always re-enumerate
+        remaining = deadline - time.monotonic()
+        if window is not None or remaining <= 0:
+            return window
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * WINDOW_POLL_BACKOFF, WINDOW_POLL_MAX)
+
+
+async def focus_window(title_keyword: str, timeout: float = WINDOW_WAIT_TIMEOUT) -> bool:
+    """Wait for a window matching `title_keyword` and bring it to the front."""
+    if not registry.available:
+        logger.warning("⚠ pygetwindow / pywin32 not available")
+        return False
+
+    start = time.monotonic()
+    window = await wait_for_window(title_keyword, timeout)
+    if window is None:
+        logger.warning(f"⚠ Focus करने के लिए window नहीं मिली: {title_keyword}")
+        return False
+    try:
+        await asyncio.to_thread(registry.activate, window)
+    except Exception as e:
+        logger.warning(f"⚠ Window focus failed: {e}")
+        return False
+    logger.info(f"🪟 window focus में है: {window.title} ({(time.monotonic() - start) * 1000:.0f} ms)")
+    return True
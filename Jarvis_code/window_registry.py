@@ -0,0 +1,217 @@
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from lazy_imports import lazy_import
+
+fuzz = lazy_import("fuzzywuzzy.fuzz")
+psutil = lazy_import("psutil", optional=True)
+win32gui = lazy_import("win32gui", optional=True)
+win32con = lazy_import("win32con", optional=True)
+win32process = lazy_import("win32process", optional=True)
+gw = lazy_import("pygetwindow", optional=True)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds a snapshot is trusted: longer than the gap between voice commands, a miss re-scans anyway
+WINDOW_CACHE_TTL = float(os.getenv("WINDOW_CACHE_TTL", "10"))
+WINDOW_MATCH_MIN = int(os.getenv("WINDOW_MATCH_MIN", "70"))        # lowest score that counts as a match
+
+
+@dataclass
+class WindowInfo:
+    handle: int
+    title: str
+    pid: int = 0
+    process: str = ""     # executable name without extension, e.g. "chrome"
+    z: int = 0            # enumeration order; 0 is the top-most window
+    ref: object = None    # backend window object (pygetwindow) when there is no win32
+
+
+# --- Backends: each returns [(handle, title, ref)] for visible, titled windows, top-most first ---
+def _enum_win32() -> List[Tuple[int, str, object]]:
+    rows = []
+
+    def handler(hwnd, _):
+        if win32gui.IsWindowVisible(hwnd):
+            title = win32gui.GetWindowText(hwnd)
+            if title:
+                rows.append((hwnd, title, None))
+    win32gui.EnumWindows(handler, None)
+    return rows
+
+
+def _enum_gw() -> List[Tuple[int, str, object]]:
+    return [(getattr(w, "_hWnd", id(w)), w.title, w) for w in gw.getAllWindows() if w.title]
+
+
+def _pid_win32(handle: int) -> int:
+    try:
+        return win32process.GetWindowThreadProcessId(handle)[1]
+    except Exception:
+        return 0
+
+
+class WindowRegistry:
+    """
+    Cached index of open windows: handle, title and owning process.
+
+    refresh() re-enumerates handles and titles only; the pid and process
+    name of a handle are looked up once, when it first appears, and entries
+    for closed windows are dropped. Lookups reuse the snapshot for
+    WINDOW_CACHE_TTL seconds, so repeated focus/close calls cost a cached
+    fuzzy match instead of a full enumeration.
+
+    `enumerate_windows` / `pid_of` can be injected (tests, other platforms).
+    """
+
+    def __init__(self, enumerate_windows: Callable = None, pid_of: Callable = None, ttl: float = WINDOW_CACHE_TTL):
+        self._enumerate = enumerate_windows
+        self._pid_of = pid_of
+        self.ttl = ttl
+        self.refreshed_at = 0.0
+        self._windows: Dict[int, WindowInfo] = {}
+        self._process_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self._backend()[0] is not None
+
+    def _backend(self):
+        if self._enumerate is not None:
+            return self._enumerate, self._pid_of
+        if win32gui and win32process:
+            return _enum_win32, _pid_win32
+        if gw:
+            return _enum_gw, None
+        return None, None
+
+    def _process_name(self, pid: int) -> str:
+        if not pid or not psutil:
+            return ""
+        name = self._process_names.get(pid)
+        if name is None:
+            try:
+                name = os.path.splitext(psutil.Process(pid).name())[0].lower()
+            except Exception:
+                name = ""
+            self._process_names[pid] = name
+        return name
+
+    def refresh(self) -> List[WindowInfo]:
+        enumerate_windows, pid_of = self._backend()
+        if enumerate_windows is None:
+            return []
+        rows = enumerate_windows()
+        with self._lock:
+            seen = {}
+            for z, (handle, title, ref) in enumerate(rows):
+                info = self._windows.get(handle)
+                if info is None:
+                    pid = pid_of(handle) if pid_of else 0
+                    info = WindowInfo(handle, title, pid, self._process_name(pid))
+                info.title, info.z, info.ref = title, z, ref
+                seen[handle] = info
+            live_pids = {info.pid for info in seen.values()}
+            self._process_names = {pid: n for pid, n in self._process_names.items() if pid in live_pids}
+            self._windows = seen
+            self.refreshed_at = time.monotonic()
+            return sorted(seen.values(), key=lambda w: w.z)
+
+    def windows(self, max_age: float = None) -> List[WindowInfo]:
+        """Current snapshot, refreshed first if older than `max_age` (default: the TTL)."""
+        max_age = self.ttl if max_age is None else max_age
+        if time.monotonic() - self.refreshed_at > max_age:
+            return self.refresh()
+        with self._lock:
+            return sorted(self._windows.values(), key=lambda w: w.z)
+
+    # --- matching ---
+    @staticmethod
+    def score(query: str, info: WindowInfo) -> int:
+        query = query.lower().strip()
+        title = info.title.lower()
+        if not query:
+            return 0
+        if query == title or query == info.process:
+            return 100
+        # partial_ratio gives 100 for any substring; cap fuzzy title hits so an
+        # exact title/process match always outranks them
+        score = min(max(fuzz.partial_ratio(query, title), fuzz.token_set_ratio(query, title)), 94)
+        if query in title:
+            score = max(score, 95)
+        if info.process and (query == info.process or query.replace(" ", "") in info.process):
+            score = max(score, 90)
+        return score
+
+    def ranked(self, query: str, max_age: float = None, min_score: int = WINDOW_MATCH_MIN) -> List[Tuple[int, WindowInfo]]:
+        """Matches with score >= min_score, best first (ties go to the top-most window)."""
+        scored = [(self.score(query, w), w) for w in self.windows(max_age)]
+        scored = [(s, w) for s, w in scored if s >= min_score]
+        scored.sort(key=lambda sw: (-sw[0], sw[1].z))
+        return scored
+
+    def best(self, query: str, max_age: float = None, min_score: int = WINDOW_MATCH_MIN) -> Optional[WindowInfo]:
+        ranked = self.ranked(query, max_age, min_score)
+        if not ranked and max_age != 0:
+            # a cached miss may just be stale: look once more at the live window list
+            ranked = self.ranked(query, 0, min_score)
+        return ranked[0][1] if ranked else None
+
+    @staticmethod
+    def exact_rank(query: str, info: WindowInfo) -> int:
+        """3 = whole title, 2 = process name, 1 = whole word(s) in the title, 0 = no exact match."""
+        query = query.lower().strip()
+        if not query:
+            return 0
+        title = info.title.lower()
+        if query == title:
+            return 3
+        if query == info.process:
+            return 2
+        if re.search(r"(?<!\w)" + re.escape(query) + r"(?!\w)", title):
+            return 1
+        return 0
+
+    def exact(self, query: str, max_age: float = None) -> List[WindowInfo]:
+        """
+        Windows in the best exact tier (see exact_rank), top-most first; no fuzzy matching.
+
+        For destructive actions: "teams" must not hit Steam, nor "word" a
+        "Password Manager". More than one result means the caller should ask.
+        """
+        for age in (max_age, 0):
+            ranked = [(self.exact_rank(query, w), w) for w in self.windows(age)]
+            top = max((r for r, _ in ranked), default=0)
+            if top:
+                return [w for r, w in ranked if r == top]
+            if max_age == 0:
+                break
+        return []
+
+    # --- actions ---
+    def activate(self, info: WindowInfo) -> None:
+        if info.ref is not None:
+            if info.ref.isMinimized:
+                info.ref.restore()
+            info.ref.activate()
+            return
+        if win32gui.IsIconic(info.handle):
+            win32gui.ShowWindow(info.handle, win32con.SW_RESTORE)
+        win32gui.SetForegroundWindow(info.handle)
+
+    def close(self, info: WindowInfo) -> None:
+        if info.ref is not None:
+            info.ref.close()
+        else:
+            win32gui.PostMessage(info.handle, win32con.WM_CLOSE, 0, 0)
+        with self._lock:
+            self._windows.pop(info.handle, None)
+
+
+registry = WindowRegistry()